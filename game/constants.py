@@ -7,6 +7,10 @@ import os
 NAME = "Druver"
 SCREEN_SIZE = (1280, 720)
 FPS_CAP = 60
+MAP_STREAMING = False  # Keep only tiles near the viewport in memory, needed for very large maps
+MAP_STREAM_RADIUS = 1  # Number of tiles around the visible ones that stay loaded when streaming
+MAP_COMPRESSED_TILES = False  # Keep ground tiles compressed in memory, decoded only near the viewport (streams map)
+HOT_RELOAD_ASSETS = False  # Development only, watches asset files and reloads them when they change
 
 DEVELOPMENT_URL = "https://github.com/15minutOdmora/Druver"
 
@@ -153,6 +153,14 @@ class Controller:
         """
         self.page_stack.back_to(to_page)
 
+    def close(self) -> None:
+        """
+        Method releases resources of time trials on the page stack, called when the game exits.
+        """
+        for page in self.page_stack:
+            if isinstance(page, TimeTrial):
+                page.close()
+
     def pause_game(self) -> None:
         """
         Method for pausing and un-pausing game.
@@ -9,7 +9,8 @@ import pygame
 from game.gui.item import Item
 from game.gui.text import Text
 from game.constants import BaseColors
-from game.helpers.file_handling import DirectoryReader, ImageLoader
+from game.helpers.file_handling import ImageLoader
+from game.helpers.asset_index import asset_index
 
 
 class Button(Item):
@@ -135,7 +136,7 @@ class AnimatedButton(Item):
         self.current_image_list = self.normal_images
         self.current_image_index = 0
         # Get all files into lists
-        all_folders = DirectoryReader.get_all_folders(folder_path)
+        all_folders = asset_index.list_folders(folder_path)
         possible_folders = {
             "normal": self.normal_images,
             "on_click": self.on_click_images,
@@ -2,8 +2,12 @@
 Module containing the music player class wich loads 'playlists' from folders, and can play its music.
 """
 
+import random
+
 import pygame
 
+from game.helpers.asset_index import asset_index
+
 
 class MusicPlayer:
     """
@@ -17,11 +21,11 @@ class MusicPlayer:
         """
         pygame.mixer.init()
 
-        self.playlists: list[tuple[str]] = DirectoryReader.get_all_folders(path_to_playlists)
+        self.playlists: list[tuple[str]] = asset_index.list_folders(path_to_playlists)
         self.current_playlist_index = random.randint(0, len(self.playlists) - 1)
 
         self.current_playlist: tuple[str] = self.playlists[self.current_playlist_index]
-        self.current_playlist_songs: list[tuple[str]] = DirectoryReader.get_all_files(self.current_playlist[1])
+        self.current_playlist_songs: list[tuple[str]] = asset_index.list_files(self.current_playlist[1])
         self.current_song_index = random.randint(0, len(self.current_playlist_songs) - 1)
 
         pygame.mixer.music.load(self.current_playlist_songs[self.current_song_index][1])
@@ -74,7 +78,7 @@ class MusicPlayer:
             # Change station (and station index)
             self.current_playlist_index = to_playlist
             self.current_playlist = self.playlists[to_playlist]
-            self.current_playlist_songs = DirectoryReader.get_all_files(self.current_playlist[1])
+            self.current_playlist_songs = asset_index.list_files(self.current_playlist[1])
             self.current_song_index = random.randint(0, len(self.current_playlist_songs) - 1)
             if not self.paused:
                 pygame.mixer.music.stop()
@@ -2,12 +2,43 @@
 Module for text classes.
 """
 
+import os
+
 import pygame
 
 from game.constants import Paths, BaseColors
 from game.gui.item import ResizableItem, StaticItem
 
 
+_fonts: dict[tuple[str, int], "Font"] = {}  # Loaded fonts shared by all text items, (font, size): Font
+
+
+def get_font(font: str, size: int) -> "Font":
+    """
+    Function returns cached font, loading it on first use.
+    :param font: str font name or path to font file(ttf)
+    :param size: int size of font
+    :return: Font
+    """
+    key = (font, size)
+    if key not in _fonts:
+        pygame.font.init()
+        if os.path.isfile(font):  # If passed font string is a path to font file, load appropriately
+            _fonts[key] = pygame.font.Font(font, size)
+        else:
+            _fonts[key] = pygame.font.SysFont(font, size)
+    return _fonts[key]
+
+
+def invalidate_font(path: str) -> None:
+    """
+    Function drops every cached size of the font on path, text items load the changed font on their next update.
+    :param path: str path to font file
+    """
+    for key in [key for key in _fonts if os.path.abspath(key[0]) == os.path.abspath(path)]:
+        del _fonts[key]
+
+
 class Text(StaticItem):
     """
     Class for holding text objects as items. Normal Text can not be re-sized, but can be movable.
@@ -28,18 +59,19 @@ class Text(StaticItem):
         :param color: tuple[int, int, int] RGB value of color of text
         """
         self.screen = pygame.display.get_surface()
-        pygame.font.init()
         self.color = color
         self.text = text
-        if "\\" in font:  # If passed font string has / it is a path to font file, load appropriately
-            self.font = pygame.font.Font(font, size)
-        else:
-            self.font = pygame.font.SysFont(font, size)
+        self.font_name = font
+        self.font_size = size
         self.surface = self.font.render(text, True, self.color)
         size = self.font.size(text)
         # Call to super method with fetched size of surface
         super().__init__(position, size)
 
+    @property
+    def font(self) -> "Font":
+        return get_font(self.font_name, self.font_size)
+
     def update(self) -> None:
         """
         Method will update self surface and position.
@@ -75,16 +107,20 @@ class CustomText(ResizableItem):
         :param color: tuple[int, int, int] representing RGB values of color
         """
         self.screen = pygame.display.get_surface()
-        pygame.font.init()
         self.color = color
         self.text = text
-        self.font = pygame.font.Font(font, size)
+        self.font_name = font
+        self.font_size = size
         self.surface = self.font.render(text, True, self.color)
         self.current_surface = self.surface
         size = self.font.size(text)
 
         super().__init__(position, size)
 
+    @property
+    def font(self) -> "Font":
+        return get_font(self.font_name, self.font_size)
+
     def resize(self, factor: float) -> None:
         """
         Method will re-size image and its position based on a factor passed as argument.
@@ -0,0 +1,259 @@
+"""
+Module containing the AssetIndex class, a persistent index of asset folders (cars, maps, animations, playlists).
+
+The index is built once, saved next to the assets and refreshed incrementally: every entry stores the modification
+times of the folders (and files) it was built from, an entry is rebuilt only when one of those changed.
+"""
+
+from __future__ import annotations
+from typing import Callable
+import hashlib
+import os
+import struct
+
+from game.constants import Paths, join_paths
+from game.helpers.config_store import config_store
+
+
+INDEX_VERSION = 1
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tga", ".gif")
+
+
+def get_mtime(path: str) -> float:
+    """
+    Function returns modification time of file or folder on path, None if it does not exist.
+    :param path: str path to file or folder
+    :return: float modification time
+    """
+    try:
+        return os.stat(path).st_mtime
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def is_same_or_inside(path: str, folder: str) -> bool:
+    """
+    Function checks if path is folder or lies somewhere inside it.
+    :param path: str absolute path
+    :param folder: str absolute path to folder
+    """
+    return path == folder or path.startswith(folder.rstrip(os.sep) + os.sep)
+
+
+def get_file_hash(path: str) -> str:
+    """
+    Function returns sha1 hash of file contents, None if file does not exist.
+    :param path: str path to file
+    :return: str hex digest
+    """
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def get_image_size(path: str) -> list[int]:
+    """
+    Function reads the size of an image. PNG sizes are read directly from the file header, other formats get loaded.
+    :param path: str path to image
+    :return: list[int, int] width and height of image
+    """
+    with open(path, "rb") as f:
+        header = f.read(24)
+    if header[:8] == b"\x89PNG\r\n\x1a\n" and header[12:16] == b"IHDR":
+        return list(struct.unpack(">II", header[16:24]))
+    import pygame  # Only needed as a fallback, keeps the index usable without a display
+    return list(pygame.image.load(path).get_size())
+
+
+class AssetIndex:
+    """
+    Persistent index of asset folders. Folder listings and car / map entries are served from the index, the file system
+    is only touched to stat the folders the entries were built from.
+    """
+    def __init__(self, index_path: str = join_paths(Paths.assets, ".asset_index.json")):
+        """
+        :param index_path: str path to json file the index gets persisted to
+        """
+        self.index_path = index_path
+        self._data: dict = None
+        self._dirty = False
+
+    @property
+    def data(self) -> dict:
+        """
+        Property loads the persisted index on first access, an empty index is created if there is none (or if it was
+        written by a different version).
+        :return: dict index data
+        """
+        if self._data is None:
+            data = config_store.load(self.index_path) if os.path.isfile(self.index_path) else None
+            if not data or data.get("version") != INDEX_VERSION:
+                data = {"version": INDEX_VERSION, "folders": {}, "cars": {}, "maps": {}}
+            self._data = data
+        return self._data
+
+    def save(self) -> None:
+        """
+        Method persists the index if it changed since it was last saved.
+        """
+        if self._dirty:
+            config_store.save(self.index_path, self.data)
+            self._dirty = False
+
+    def _get_listing(self, dir_path: str) -> dict:
+        """
+        Method returns the cached listing of folder, scanning it again only if its modification time changed.
+        :param dir_path: str path to folder
+        :return: dict with keys folders, files -> lists of [name, path] sorted by name
+        """
+        dir_path = os.path.abspath(dir_path)
+        mtime = get_mtime(dir_path)
+        listing = self.data["folders"].get(dir_path)
+        if listing is None or listing["mtime"] != mtime:
+            folders, files = [], []
+            for item in os.scandir(dir_path):
+                if item.is_dir():
+                    folders.append([item.name, os.path.abspath(item.path)])
+                elif item.is_file():
+                    files.append([item.name, os.path.abspath(item.path)])
+            listing = {"mtime": mtime, "folders": sorted(folders), "files": sorted(files)}
+            self.data["folders"][dir_path] = listing
+            self._dirty = True
+        return listing
+
+    def list_folders(self, dir_path: str) -> list[tuple]:
+        """
+        Method returns the names and paths of all folders inside folder.
+        :param dir_path: str path to folder
+        :return: list[tuple[str, str]] (name, path) sorted by name
+        """
+        listing = self._get_listing(dir_path)
+        self.save()
+        return [tuple(item) for item in listing["folders"]]
+
+    def list_files(self, dir_path: str) -> list[tuple]:
+        """
+        Method returns the names and paths of all files inside folder.
+        :param dir_path: str path to folder
+        :return: list[tuple[str, str]] (name, path) sorted by name
+        """
+        listing = self._get_listing(dir_path)
+        self.save()
+        return [tuple(item) for item in listing["files"]]
+
+    def count_images(self, dir_path: str) -> int:
+        """
+        Method returns number of image files inside folder, 0 if folder does not exist.
+        :param dir_path: str path to folder
+        """
+        if get_mtime(dir_path) is None:
+            return 0
+        return len([name for name, _ in self._get_listing(dir_path)["files"] if name.lower().endswith(IMAGE_EXTENSIONS)])
+
+    def _first_image_size(self, dir_path: str) -> list[int]:
+        if get_mtime(dir_path) is None:
+            return None
+        for name, path in self._get_listing(dir_path)["files"]:
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                return get_image_size(path)
+        return None
+
+    @staticmethod
+    def _signature(*paths: str) -> list:
+        """
+        Method returns list of modification times of passed paths, used for checking if an entry is outdated.
+        """
+        return [get_mtime(path) for path in paths]
+
+    def _build_car_entry(self, name: str, path: str) -> dict:
+        images, preview, config = join_paths(path, "images"), join_paths(path, "preview"), join_paths(path, "config.json")
+        return {
+            "name": name,
+            "path": path,
+            "preview": preview,
+            "preview_frames": self.count_images(preview),
+            "frames": self.count_images(images),
+            "image_size": self._first_image_size(images),
+            "config_hash": get_file_hash(config)
+        }
+
+    def _build_map_entry(self, name: str, path: str) -> dict:
+        image, ground, mask = join_paths(path, "preview.png"), join_paths(path, "ground"), join_paths(path, "mask")
+        return {
+            "name": name,
+            "path": path,
+            "image": image,
+            "image_size": get_image_size(image) if os.path.isfile(image) else None,
+            "ground_tiles": self.count_images(ground),
+            "mask_tiles": self.count_images(mask),
+            "tile_size": self._first_image_size(ground)
+        }
+
+    def _refresh(self, section: str, folder_path: str, build_entry: Callable) -> list[dict]:
+        """
+        Method refreshes entries of section (cars or maps) for every sub folder of folder_path, only entries whose
+        signature changed get rebuilt. Folders containing '_' in their name are skipped.
+        :param section: str key of section in index
+        :param folder_path: str path to folder containing asset folders
+        :param build_entry: Callable(name, path) -> dict entry
+        :return: list[dict] entries sorted by name
+        """
+        entries = self.data[section]
+        found = {}
+        for name, path in self._get_listing(folder_path)["folders"]:
+            if "_" in name:
+                continue
+            entry = entries.get(path)
+            signature = self._signature(*self._signature_paths(section, path))
+            if entry is None or entry["signature"] != signature:
+                entry = build_entry(name, path)
+                entry["signature"] = signature
+                entries[path] = entry
+                self._dirty = True
+            found[path] = entry
+        # Drop entries of folders that were removed
+        folder_path = os.path.abspath(folder_path)
+        for path in [path for path in entries if os.path.dirname(path) == folder_path and path not in found]:
+            del entries[path]
+            self._dirty = True
+        self.save()
+        return sorted(found.values(), key=lambda entry: entry["name"])
+
+    @staticmethod
+    def _signature_paths(section: str, path: str) -> list[str]:
+        if section == "cars":
+            return [path, join_paths(path, "images"), join_paths(path, "preview"), join_paths(path, "config.json")]
+        return [path, join_paths(path, "preview.png"), join_paths(path, "ground"), join_paths(path, "mask")]
+
+    def get_car_previews(self, car_folder_path: str = Paths.cars) -> list[dict]:
+        """
+        Method returns index entries of every car.
+        :param car_folder_path: str path to folder containing car folders
+        :return: list[dict] with keys: name, path, preview, preview_frames, frames, image_size, config_hash
+        """
+        return self._refresh("cars", car_folder_path, self._build_car_entry)
+
+    def get_map_previews(self, map_folder_path: str = Paths.maps) -> list[dict]:
+        """
+        Method returns index entries of every map.
+        :param map_folder_path: str path to folder containing map folders
+        :return: list[dict] with keys: name, path, image, image_size, ground_tiles, mask_tiles, tile_size
+        """
+        return self._refresh("maps", map_folder_path, self._build_map_entry)
+
+    def invalidate(self, path: str) -> None:
+        """
+        Method drops every index entry built from path or any folder inside it, entries get rebuilt on next query.
+        :param path: str path to file or folder
+        """
+        path = os.path.abspath(path)
+        for section in ("folders", "cars", "maps"):
+            for key in [key for key in self.data[section] if is_same_or_inside(key, path) or is_same_or_inside(path, key)]:
+                del self.data[section][key]
+                self._dirty = True
+
+
+# Game wide asset index
+asset_index = AssetIndex()
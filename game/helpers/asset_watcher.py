@@ -0,0 +1,158 @@
+"""
+Module containing the AssetWatcher class used in development for hot-reloading assets while the game is running.
+
+A background thread polls a cache of file stats at low frequency, changed paths are queued and dispatched to the
+registered callbacks on the main thread (once per frame by calling update), so callbacks can safely touch pygame.
+"""
+
+from __future__ import annotations
+from typing import Callable
+import os
+import queue
+import threading
+import weakref
+
+
+def _make_reference(callback: Callable) -> Callable:
+    """
+    Function creates a weak reference to bound methods, so watched objects (maps, cars) can be garbage collected
+    without having to be unregistered. Plain functions are referenced normally.
+    :param callback: Callable
+    :return: Callable returning the callback or None if it was collected
+    """
+    if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+        return weakref.WeakMethod(callback)
+    return lambda: callback
+
+
+class AssetWatcher:
+    """
+    Watches files and folders for changes. Paths get registered with a callback which is called with the path of the
+    changed file, a callback registered on a folder gets called for any file inside it (recursively).
+    """
+    def __init__(self, interval: float = 1.0):
+        """
+        :param interval: float seconds between two polls of the file stats
+        """
+        self.interval = interval
+        self._watches: list[tuple[str, Callable]] = []  # (watched path, reference to callback)
+        self._stats: dict[str, tuple] = {}  # path: (mtime_ns, size) of every watched file
+        self._folder_mtimes: dict[str, int] = {}  # Folder listings are re-scanned only when these change
+        self._changes = queue.Queue()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def watch(self, path: str, callback: Callable) -> None:
+        """
+        Method registers callback for changes on path (file or folder). Has no effect if the watcher is not running,
+        so registering watches costs nothing outside of development.
+        :param path: str path to file or folder
+        :param callback: Callable with one parameter, the path of the changed file
+        """
+        if not self.running:
+            return
+        path = os.path.abspath(path)
+        with self._lock:
+            self._watches.append((path, _make_reference(callback)))
+            self._scan(path)
+
+    def start(self) -> None:
+        """
+        Method starts the polling thread.
+        """
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._poll_loop, name="AssetWatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Method stops the polling thread.
+        """
+        self._stop.set()
+
+    def _scan(self, path: str) -> None:
+        """
+        Method adds every file on path to the stat cache without reporting them as changed.
+        :param path: str path to file or folder
+        """
+        if os.path.isdir(path):
+            self._folder_mtimes[path] = os.stat(path).st_mtime_ns
+            for item in os.scandir(path):
+                self._scan(os.path.abspath(item.path))
+        elif os.path.isfile(path):
+            stat = os.stat(path)
+            self._stats[path] = (stat.st_mtime_ns, stat.st_size)
+
+    def _poll_folders(self) -> list[str]:
+        """
+        Method re-scans folders whose listing changed, returns paths of files that were added.
+        """
+        added = []
+        for folder, mtime in list(self._folder_mtimes.items()):
+            try:
+                current = os.stat(folder).st_mtime_ns
+            except FileNotFoundError:
+                del self._folder_mtimes[folder]
+                continue
+            if current != mtime:
+                self._folder_mtimes[folder] = current
+                for item in os.scandir(folder):
+                    path = os.path.abspath(item.path)
+                    if path not in self._stats and path not in self._folder_mtimes:
+                        self._scan(path)
+                        added.append(path)
+        return added
+
+    def poll(self) -> None:
+        """
+        Method checks the stat of every watched file once and queues the changed ones. Called by the polling thread,
+        can also be called manually.
+        """
+        with self._lock:
+            changed = self._poll_folders()
+            for path, stat in list(self._stats.items()):
+                try:
+                    current = os.stat(path)
+                except FileNotFoundError:
+                    del self._stats[path]
+                    changed.append(path)
+                    continue
+                current = (current.st_mtime_ns, current.st_size)
+                if current != stat:
+                    self._stats[path] = current
+                    changed.append(path)
+        for path in changed:
+            if os.path.isfile(path) or path not in self._folder_mtimes:
+                self._changes.put(path)
+
+    def _poll_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def update(self) -> None:
+        """
+        Method dispatches queued changes to their callbacks, has to be called on the main thread (once per frame).
+        Watches whose callbacks were garbage collected get removed.
+        """
+        while not self._changes.empty():
+            path = self._changes.get_nowait()
+            with self._lock:
+                watches = list(self._watches)
+            for watched_path, reference in watches:
+                if path == watched_path or path.startswith(watched_path + os.sep):
+                    callback = reference()
+                    if callback is None:
+                        with self._lock:
+                            self._watches = [watch for watch in self._watches if watch[1] is not reference]
+                    else:
+                        callback(path)
+
+
+# Game wide watcher, started by the game when hot reloading is enabled in constants
+asset_watcher = AssetWatcher()
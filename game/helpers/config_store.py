@@ -0,0 +1,256 @@
+"""
+Module containing the ConfigStore class, a cached and transactional store for json configuration files.
+
+Parsed documents are cached and invalidated by the files modification time, writes are queued and flushed by a
+background write-behind thread, every write is atomic (data is written to a temporary file which then replaces the
+original one) so a crash mid-write can not corrupt a configuration file.
+"""
+
+from __future__ import annotations
+import atexit
+import copy
+import json
+import os
+import tempfile
+import threading
+
+
+class ConfigStore:
+    """
+    Store for json files containing dictionaries. Documents are read once and cached until their file changes on disk.
+    Updates are applied to the cached document immediately and written to disk by a background thread, so callers
+    never wait on file writes.
+    """
+    def __init__(self, write_delay: float = 0.5):
+        """
+        :param write_delay: float seconds the writer thread waits before flushing, so consecutive updates to the same
+                            file get batched into a single write
+        """
+        self.write_delay = write_delay
+        self._documents: dict[str, dict] = {}  # path: parsed document
+        self._mtimes: dict[str, float] = {}  # path: modification time of file when document was read / written
+        self._pending: set[str] = set()  # Paths with changes not yet written to disk
+        self._in_flight: set[str] = set()  # Paths taken from pending by a running flush, not yet on disk
+        self._lock = threading.RLock()
+        self._wake_up = threading.Event()
+        self._write_lock = threading.Lock()  # Makes sure flushes (writer thread, exit, manual) do not interleave
+        self._writer: threading.Thread = None
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return os.path.abspath(path)
+
+    @staticmethod
+    def _get_mtime(path: str) -> float:
+        try:
+            return os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _read(self, path: str) -> dict:
+        """
+        Method returns the cached document on path, re-reading the file if it changed since the last read.
+        Pending and in flight (not yet written) documents are always served from cache.
+        :param path: str normalized path to json file
+        :return: dict cached document or None if file does not exist
+        """
+        with self._lock:
+            if path in self._pending or path in self._in_flight:
+                return self._documents[path]
+            mtime = self._get_mtime(path)
+            if mtime is None:
+                self._documents.pop(path, None)
+                self._mtimes.pop(path, None)
+                return None
+            if path not in self._documents or self._mtimes.get(path) != mtime:
+                with open(path, "r") as f:
+                    self._documents[path] = json.load(f)
+                self._mtimes[path] = mtime
+            return self._documents[path]
+
+    def load(self, path: str) -> dict:
+        """
+        Method returns a copy of the document saved on path, the copy can be freely modified by the caller.
+        :param path: str path to json file
+        :return: dict content of json file or None if file does not exist
+        """
+        document = self._read(self._normalize(path))
+        if document is None:
+            print(f"ConfigStore.load: Unable to find Json file on path:\n    {path}")
+            return None
+        return copy.deepcopy(document)
+
+    def get(self, path: str, key: str, default: any = None) -> any:
+        """
+        Method returns value saved under key in document on path, without copying the whole document.
+        Nested keys can be accessed by joining them with dots, ex. "points.tyres".
+        :param path: str path to json file
+        :param key: str key (or dotted path of keys) of value
+        :param default: any value returned if the file or key does not exist
+        :return: any value under key
+        """
+        value = self._read(self._normalize(path))
+        for part in key.split("."):
+            if not isinstance(value, dict) or part not in value:
+                return default
+            value = value[part]
+        return value
+
+    def _get_typed(self, path: str, key: str, default: any, _type: type, type_name: str) -> any:
+        value = self.get(path, key, default)
+        if value is default:
+            return value
+        if _type is float and isinstance(value, int) and not isinstance(value, bool):
+            return float(value)
+        if not isinstance(value, _type) or (_type is not bool and isinstance(value, bool)):
+            raise TypeError(f"ConfigStore.get_{type_name}: Value under {key} in {path} is not of type {type_name}, "
+                            f"got {value!r}.")
+        return value
+
+    def get_int(self, path: str, key: str, default: int = None) -> int:
+        return self._get_typed(path, key, default, int, "int")
+
+    def get_float(self, path: str, key: str, default: float = None) -> float:
+        return self._get_typed(path, key, default, float, "float")
+
+    def get_bool(self, path: str, key: str, default: bool = None) -> bool:
+        return self._get_typed(path, key, default, bool, "bool")
+
+    def get_str(self, path: str, key: str, default: str = None) -> str:
+        return self._get_typed(path, key, default, str, "str")
+
+    def get_list(self, path: str, key: str, default: list = None) -> list:
+        return self._get_typed(path, key, default, list, "list")
+
+    def get_dict(self, path: str, key: str, default: dict = None) -> dict:
+        return self._get_typed(path, key, default, dict, "dict")
+
+    def update(self, path: str, data: dict) -> dict:
+        """
+        Method updates the document on path with data and schedules it to be written to disk.
+        :param path: str path to existing json file
+        :param data: dict of key-value pairs to update the document with
+        :return: dict copy of updated document or None if file does not exist
+        """
+        path = self._normalize(path)
+        with self._lock:
+            document = self._read(path)
+            if document is None:
+                print(f"ConfigStore.update: Unable to find Json file on path:\n    {path}")
+                return None
+            document.update(copy.deepcopy(data))
+            self._schedule(path)
+            return copy.deepcopy(document)
+
+    def save(self, path: str, data: dict) -> None:
+        """
+        Method replaces the document on path with data and schedules it to be written to disk, file gets created if
+        it does not exist.
+        :param path: str path to json file
+        :param data: dict to save
+        """
+        if not path.endswith(".json"):
+            path += ".json"
+        path = self._normalize(path)
+        if not os.path.isdir(os.path.dirname(path)):
+            print(f"ConfigStore.save: Unable to find directory of Json file on path:\n    {path}")
+            return
+        with self._lock:
+            self._documents[path] = copy.deepcopy(data)
+            self._schedule(path)
+
+    def invalidate(self, path: str = None) -> None:
+        """
+        Method drops cached document on path (or every cached document if no path is passed), so it is re-read on
+        next access. Documents with pending writes are kept.
+        :param path: str path to json file
+        """
+        with self._lock:
+            paths = [self._normalize(path)] if path else list(self._documents.keys())
+            for _path in paths:
+                if _path not in self._pending and _path not in self._in_flight:
+                    self._documents.pop(_path, None)
+                    self._mtimes.pop(_path, None)
+
+    def _schedule(self, path: str) -> None:
+        """
+        Method marks path as pending and wakes up the writer thread, starting it if needed.
+        :param path: str normalized path
+        """
+        self._pending.add(path)
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_behind, name="ConfigStoreWriter", daemon=True)
+            self._writer.start()
+        self._wake_up.set()
+
+    def _write_behind(self) -> None:
+        """
+        Writer thread loop, waits for scheduled writes and flushes them after write_delay seconds.
+        """
+        while True:
+            self._wake_up.wait()
+            self._wake_up.clear()
+            # Give the caller time to batch more updates before writing
+            threading.Event().wait(self.write_delay)
+            try:
+                self.flush()
+            except Exception as error:  # Keep the writer alive, failed paths stay pending
+                print(f"ConfigStore: Writer thread failed to flush:\n    {error!r}")
+
+    def flush(self) -> None:
+        """
+        Method writes every pending document to disk. Called by the writer thread, on exit and can be called
+        manually when the data has to be on disk immediately. Paths that fail to serialize or write stay pending, so
+        the next flush tries them again.
+        """
+        with self._write_lock:
+            # Serialize under lock so documents can not change mid-dump, write to disk without blocking readers
+            with self._lock:
+                pending, self._pending = self._pending, set()
+                self._in_flight = set(pending)
+                serialized = []
+                for path in pending:
+                    try:
+                        serialized.append((path, json.dumps(self._documents[path], indent=4)))
+                    except (TypeError, ValueError) as error:
+                        print(f"ConfigStore.flush: Unable to serialize Json file on path:\n    {path}\n    {error!r}")
+                        self._in_flight.discard(path)
+                        self._pending.add(path)
+            for path, text in serialized:
+                try:
+                    self._write_atomic(path, text)
+                except Exception as error:
+                    print(f"ConfigStore.flush: Unable to write Json file on path:\n    {path}\n    {error!r}")
+                    with self._lock:
+                        self._in_flight.discard(path)
+                        self._pending.add(path)
+                    continue
+                with self._lock:
+                    self._in_flight.discard(path)
+                    if path not in self._pending:
+                        self._mtimes[path] = self._get_mtime(path)
+
+    @staticmethod
+    def _write_atomic(path: str, text: str) -> None:
+        """
+        Method writes text to a temporary file in the same directory and replaces the original file with it.
+        :param path: str path to json file
+        :param text: str serialized json document
+        """
+        directory = os.path.dirname(path)
+        fd, temporary_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+
+# Game wide store, every json configuration should be read and written through this object
+config_store = ConfigStore()
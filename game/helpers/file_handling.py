@@ -6,11 +6,12 @@ from __future__ import annotations
 from typing import Callable
 import os
 import time
-import json
 
 import pygame
 
 from game.constants import Paths, join_paths
+from game.helpers.config_store import config_store
+from game.helpers.asset_index import asset_index
 
 
 def abs_path(path: str) -> str:
@@ -70,7 +71,7 @@ class ImageLoader:
             list: List containing pygame images
         """
         image_list = []
-        for image_path in os.listdir(folder_path):
+        for image_path in sorted(os.listdir(folder_path)):  # Sorted so frames keep the order of their names
             path = os.path.join(folder_path, image_path)
             image_list.append(ImageLoader.load_image(path))
         return image_list
@@ -87,28 +88,25 @@ class ImageLoader:
             list: List containing pygame images
         """
         image_list = []
-        for image_path in os.listdir(folder_path):
+        for image_path in sorted(os.listdir(folder_path)):  # Sorted so frames keep the order of their names
             path = os.path.join(folder_path, image_path)
             image_list.append(ImageLoader.load_transparent_image(path))
         return image_list
 
     @staticmethod
-    def load_tiles_from_folder(
+    def get_tile_paths_from_folder(
             folder_path: str,
             update_method: Callable = lambda _: _,
-            currently_loading: str = "") -> list[list[tuple]]:
+            currently_loading: str = "") -> list[list[str]]:
         """
-        Method loads tiles from folder, where each tile is an image with the name ij.format where i, j represent
-        position on of tile in grid.
-        Optional currently_loading parameter can be passed as a callable function with one parameter, this function
-        gets called for every tile load, tile positioning in grid, and 2 times before hand and once after, passing
-        string representing current action.
-        Another optional argument currently_loading can be passed which gets placed before the string representing
-        current action on update_method call.
-        :param folder_path: str path to folder to load from
+        Method reads tile names from folder, where each tile is an image with the name ij.format where i, j represent
+        position on of tile in grid, and places their paths into a grid. No images get loaded.
+        Optional update_method gets called 2 times before hand and once for every tile name check, passing string
+        representing current action, currently_loading gets placed before that string.
+        :param folder_path: str path to folder to read from
         :param update_method: Callable function with one parameter which gets called on different progress occasions
         :param currently_loading: str that gets placed beforehand of current action string passed to update_method
-        :return:
+        :return: list[list[str]] grid of tile image paths
         """
         update_method(currently_loading + " fetching files.")
         images = DirectoryReader.get_all_files(folder_path)
@@ -124,11 +122,36 @@ class ImageLoader:
                 raise ValueError(f"Loading tiles format error, incorrect format for image: {name} in folder: {folder_path}")
         # Create grid based on max values from rows and columns
         grid = [[None for j in range(max(columns) + 1)] for i in range(max(rows) + 1)]  # Add 1 as indexing starts at 0
-        # Add images to grid
         for name, path in images:
             indexes = get_indexes_from_string(name.split(".")[0])
-            update_method(currently_loading + f" loading tile {indexes[0]}, {indexes[1]}")
-            grid[indexes[0]][indexes[1]] = ImageLoader.load_image(path)
+            grid[indexes[0]][indexes[1]] = path
+        return grid
+
+    @staticmethod
+    def load_tiles_from_folder(
+            folder_path: str,
+            update_method: Callable = lambda _: _,
+            currently_loading: str = "") -> list[list[tuple]]:
+        """
+        Method loads tiles from folder, where each tile is an image with the name ij.format where i, j represent
+        position on of tile in grid.
+        Optional currently_loading parameter can be passed as a callable function with one parameter, this function
+        gets called for every tile load, tile positioning in grid, and 2 times before hand and once after, passing
+        string representing current action.
+        Another optional argument currently_loading can be passed which gets placed before the string representing
+        current action on update_method call.
+        :param folder_path: str path to folder to load from
+        :param update_method: Callable function with one parameter which gets called on different progress occasions
+        :param currently_loading: str that gets placed beforehand of current action string passed to update_method
+        :return:
+        """
+        grid = ImageLoader.get_tile_paths_from_folder(folder_path, update_method, currently_loading)
+        # Load images into grid
+        for i, row in enumerate(grid):
+            for j, path in enumerate(row):
+                if path is not None:
+                    update_method(currently_loading + f" loading tile {i}, {j}")
+                    grid[i][j] = ImageLoader.load_image(path)
         update_method(currently_loading + f" finished.")
         return grid
 
@@ -180,102 +203,56 @@ class DirectoryReader:
     @staticmethod
     def get_map_previews(map_folder_path: str = Paths.maps) -> list:
         """
-        Method loads a list of map previews where it loads each maps data in a dict and then returns a list of
-        dictionaries.
+        Method loads a list of map previews from the asset index, each map is represented by a dictionary.
         :param map_folder_path: str path to folder containing map folders
-        :return: list -> todo: example of dict
+        :return: list -> [{"name": str, "image": str path to preview image, "image_size": [w, h], ...}, ...]
         """
-        map_previews = []
-        all_map_folders = DirectoryReader.get_all_folders(map_folder_path)
-        for name, path in all_map_folders:
-            if "_" in name:
-                continue
-            map_dict = {"name": name,
-                        "image": join_paths(path, "preview.png")
-                        }
-            # Todo Add loading of properties json about map
-            map_previews.append(map_dict)
-        return map_previews
+        return asset_index.get_map_previews(map_folder_path)
 
     @staticmethod
     def get_car_previews(car_folder_path: str = Paths.cars) -> list:
         """
-        Method loads a list of car previews where it loads each cars data in a dict and then returns a list of
-        dictionaries.
+        Method loads a list of car previews from the asset index, each car is represented by a dictionary.
         :param car_folder_path: str path to folder containing car folders
-        :return: list -> todo: example of dict
+        :return: list -> [{"name": str, "preview": str path to preview folder, "frames": int, ...}, ...]
         """
-        car_previews = []
-        all_car_folders = DirectoryReader.get_all_folders(car_folder_path)
-        for name, path in all_car_folders:
-            if "_" in name:
-                continue
-            car_dict = {"name": name,
-                        "preview": join_paths(path, "preview")
-                        }
-            # Todo Add loading of config json
-            car_previews.append(car_dict)
-        return car_previews
+        return asset_index.get_car_previews(car_folder_path)
 
 
 class Json:
     """
     Class for loading, writing and updating data in json files.
     All json files must contain dictionaries as the main scope object.
+    Every call goes through the game wide ConfigStore, so documents are cached and writes are atomic and batched.
     """
     @staticmethod
     def load(path: str) -> dict:
         """
-        Method loads a single json file, returning its contents.
+        Method loads a single json file, returning a copy of its contents.
 
         :param path: Path to Json file
         :return: dict or list, content of the Json file
         """
-        try:
-            with open(path, "r") as f:
-                data = json.load(f)
-            return data
-        except FileNotFoundError:
-            print(f"Json.load: Unable to find Json file on path:\n    {path}")
+        return config_store.load(path)
 
     @staticmethod
     def update(path: str, data: dict) -> dict:
         """
-        Method will update the dictionary with data and return the updated dict.
+        Method will update the dictionary with data and return the updated dict. The file gets written in the
+        background.
 
         :param path: Path to Json file
         :param data: Dictionary of key-value pairs to update in the json file
         :return: Updated dictionary
         """
-        # Read data
-        try:
-            with open(path, "r") as f:
-                read_data = json.load(f)
-        except FileNotFoundError:
-            print(f"Json.update: Unable to find Json file on path:\n    {path}")
-            return
-        # Update
-        read_data.update(data)
-        # Save, at this point we know the path exists
-        with open(path, "w") as f:
-            json.dump(read_data, f, indent=4)
-        return read_data
+        return config_store.update(path, data)
 
     @staticmethod
     def save(path: str, data: dict) -> None:
         """
-        Method saves data into the path file.
+        Method saves data into the path file. The file gets written in the background.
 
         :param path: Path to Json file to save to
         :param data: Dictionary to save in the json file
         """
-        # Check if path contains .json
-        if not (".json" in path):
-            path += ".json"
-        # Write data
-        try:
-            with open(path, "w") as f:
-                json.dump(data, f, indent=4)
-        except FileNotFoundError:
-            print(f"Json.save: Unable to find Json file on path:\n    {path}")
-            return
+        config_store.save(path, data)
@@ -0,0 +1,221 @@
+"""
+Module for generating car rotation frames from a top-down source image, run offline before a car is added to the game.
+
+The source is either one top-down image of the car pointing up (forward), or several stacked slices of it (bottom slice
+first) which get rotated separately and drawn on top of each other moved up by slice_spacing px, giving a 3d look.
+Frame i shows the car rotated counter clockwise by i * 360 / number_of_frames degrees, matching Car.image_index.
+Frames are rendered in a process pool and written to a car folder (images/, preview/ and points.boundaries in
+config.json) or to a zip pack with the same layout (boundaries saved as boundaries.json).
+
+Usage, from the repository root:
+    python -m game.helpers.frame_generator car.png --output game/assets/objects/cars/NewCar --frames 72
+    python -m game.helpers.frame_generator slices/*.png --output new_car.zip --slice-spacing 2
+"""
+
+from __future__ import annotations
+import argparse
+import io
+import json
+import math
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pygame
+
+from game.helpers.config_store import config_store
+
+
+_slices: dict[tuple[str, ...], list["Surface"]] = {}  # Slices loaded by a worker process, reused for every frame
+
+
+def load_slices(paths: tuple[str, ...]) -> list["Surface"]:
+    """
+    Function loads source slices once per process.
+    :param paths: tuple[str, ...] paths to slice images, bottom slice first
+    :return: list[Surface]
+    """
+    if paths not in _slices:
+        _slices[paths] = [pygame.image.load(path) for path in paths]
+    return _slices[paths]
+
+
+def get_canvas_size(paths: tuple[str, ...], slice_spacing: int) -> tuple[int, int]:
+    """
+    Function returns size of frame every rotation fits into, the diagonal of the largest slice plus the stack height.
+    """
+    diagonal = max(math.ceil(math.hypot(*surface.get_size())) for surface in load_slices(paths))
+    return diagonal, diagonal + slice_spacing * (len(paths) - 1)
+
+
+def get_footprint(paths: tuple[str, ...]) -> pygame.Rect:
+    """
+    Function returns bounding rectangle of non transparent pixels of every slice, relative to slice centre.
+    """
+    footprint = None
+    for surface in load_slices(paths):
+        rect = surface.get_bounding_rect()
+        rect.move_ip(-(surface.get_width() // 2), -(surface.get_height() // 2))
+        footprint = rect if footprint is None else footprint.union(rect)
+    return footprint
+
+
+def render_frame(paths: tuple[str, ...],
+                 angle: float,
+                 canvas_size: tuple[int, int],
+                 slice_spacing: int,
+                 size: tuple[int, int] = None) -> bytes:
+    """
+    Function renders source rotated by angle, runs in worker processes.
+    :param paths: tuple[str, ...] paths to slice images, bottom slice first
+    :param angle: float degrees, counter clockwise
+    :param canvas_size: tuple[int, int] size of frame before scaling, same for every frame so centres line up
+    :param slice_spacing: int px every next slice is moved up by
+    :param size: tuple[int, int] size the frame gets scaled to, None to keep canvas size
+    :return: bytes PNG encoded frame
+    """
+    canvas = pygame.Surface(canvas_size, pygame.SRCALPHA)
+    # Centre of bottom slice, slices above are moved up from it
+    center_x, center_y = canvas_size[0] // 2, canvas_size[1] - canvas_size[0] // 2
+    for i, surface in enumerate(load_slices(paths)):
+        rotated = pygame.transform.rotate(surface, angle)
+        canvas.blit(rotated, rotated.get_rect(center=(center_x, center_y - i * slice_spacing)))
+    if size is not None and tuple(size) != tuple(canvas_size):
+        canvas = pygame.transform.smoothscale(canvas, size)
+    data = io.BytesIO()
+    pygame.image.save(canvas, data, "frame.png")
+    return data.getvalue()
+
+
+def get_boundaries(footprint: pygame.Rect, canvas_size: tuple[int, int], angle: float) -> list[list[int]]:
+    """
+    Function rotates corners of footprint by angle around frame centre, the same way frames get rotated.
+    :param footprint: pygame.Rect relative to slice centre
+    :param canvas_size: tuple[int, int] size of frame
+    :param angle: float degrees, counter clockwise
+    :return: list[list[int]] [top-left, top-right, bottom-left, bottom-right] corners relative to top left of frame,
+             in the format saved in points.boundaries
+    """
+    corners = [footprint.topleft, footprint.topright, footprint.bottomleft, footprint.bottomright]
+    center_x, center_y = canvas_size[0] // 2, canvas_size[1] - canvas_size[0] // 2
+    cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    # Counter clockwise on screen, where y points down
+    return [[round(center_x + x * cos + y * sin), round(center_y - x * sin + y * cos)] for x, y in corners]
+
+
+class FrameWriter:
+    """
+    Writes generated files into a car folder, or into a zip pack when output ends with .zip.
+    """
+    def __init__(self, output: str):
+        """
+        :param output: str path to car folder or zip pack
+        """
+        self.output = output
+        self.pack = zipfile.ZipFile(output, "w") if output.endswith(".zip") else None
+
+    def clear_folder(self, folder: str) -> None:
+        """
+        Method removes previously generated frames of folder, so frame counts can not get mixed.
+        """
+        path = os.path.join(self.output, folder)
+        if self.pack is not None or not os.path.isdir(path):
+            return
+        for name in os.listdir(path):
+            if name.endswith(".png"):
+                os.remove(os.path.join(path, name))
+
+    def write(self, name: str, data: bytes) -> None:
+        """
+        Method writes file with name (relative to output) and content data.
+        """
+        if self.pack is not None:
+            self.pack.writestr(name, data)
+            return
+        path = os.path.join(self.output, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def write_boundaries(self, boundaries: list[list[list[int]]]) -> None:
+        """
+        Method saves boundary table, into config.json of car folder (keeping the rest of config) or the pack.
+        """
+        if self.pack is not None:
+            self.pack.writestr("boundaries.json", json.dumps({"boundaries": boundaries}))
+            return
+        config_path = os.path.join(self.output, "config.json")
+        config = config_store.load(config_path) if os.path.isfile(config_path) else {}
+        config.setdefault("points", {})["boundaries"] = boundaries
+        config_store.save(config_path, config)
+        config_store.flush()
+
+    def close(self) -> None:
+        if self.pack is not None:
+            self.pack.close()
+
+
+def generate_frames(paths: list[str],
+                    output: str,
+                    number_of_frames: int = 36,
+                    number_of_preview_frames: int = 36,
+                    preview_width: int = 300,
+                    slice_spacing: int = 1,
+                    workers: int = None) -> None:
+    """
+    Function generates rotation frames, preview frames and the boundary table of a car.
+    :param paths: list[str] paths to source image or slices (bottom first)
+    :param output: str path to car folder or zip pack
+    :param number_of_frames: int number of rotation frames, 360 has to be divisible by it (Car.angle_per_image)
+    :param number_of_preview_frames: int number of frames shown rotating on the car selection page
+    :param preview_width: int width of preview frames in px
+    :param slice_spacing: int px every next slice gets moved up by
+    :param workers: int number of processes, defaults to number of CPUs
+    """
+    if 360 % number_of_frames != 0 or 360 % number_of_preview_frames != 0:
+        raise ValueError("generate_frames: 360 has to be divisible by the number of frames and preview frames.")
+    paths = tuple(os.path.abspath(path) for path in paths)
+    canvas_size = get_canvas_size(paths, slice_spacing)
+    preview_size = (preview_width, round(preview_width * canvas_size[1] / canvas_size[0]))
+    footprint = get_footprint(paths)
+    writer = FrameWriter(output)
+    writer.clear_folder("images")
+    writer.clear_folder("preview")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        jobs = []
+        for i in range(number_of_frames):
+            angle = i * 360 / number_of_frames
+            future = executor.submit(render_frame, paths, angle, canvas_size, slice_spacing)
+            jobs.append((f"images/{i:04d}.png", future))
+        for i in range(number_of_preview_frames):
+            angle = i * 360 / number_of_preview_frames
+            future = executor.submit(render_frame, paths, angle, canvas_size, slice_spacing, preview_size)
+            jobs.append((f"preview/{i:04d}.png", future))
+        for name, future in jobs:
+            writer.write(name, future.result())
+    writer.write_boundaries([get_boundaries(footprint, canvas_size, i * 360 / number_of_frames)
+                             for i in range(number_of_frames)])
+    writer.close()
+    print(f"Generated {number_of_frames} frames ({canvas_size[0]}x{canvas_size[1]}) and "
+          f"{number_of_preview_frames} preview frames into {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate car rotation frames from a top-down image or slices.")
+    parser.add_argument("sources", nargs="+", help="top-down image of car pointing up, or slices from bottom up")
+    parser.add_argument("--output", required=True, help="car folder (ex. game/assets/objects/cars/Name) or .zip")
+    parser.add_argument("--frames", type=int, default=36, help="number of rotation frames")
+    parser.add_argument("--preview-frames", type=int, default=36, help="number of preview frames")
+    parser.add_argument("--preview-width", type=int, default=300, help="width of preview frames in px")
+    parser.add_argument("--slice-spacing", type=int, default=1, help="px between stacked slices")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes")
+    arguments = parser.parse_args()
+    generate_frames(
+        arguments.sources,
+        arguments.output,
+        number_of_frames=arguments.frames,
+        number_of_preview_frames=arguments.preview_frames,
+        preview_width=arguments.preview_width,
+        slice_spacing=arguments.slice_spacing,
+        workers=arguments.workers
+    )
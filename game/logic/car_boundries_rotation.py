@@ -1,7 +1,20 @@
 """
 Module containing the CarBoundariesGenerator class for generating car boundaries on a shifted perspective.
+
+Tables of every car can be regenerated without the game running (ex. after its frames were generated again with a
+different number of frames), from the repository root:
+    python -m game.logic.car_boundries_rotation
 """
 
+from __future__ import annotations
+import argparse
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from game.constants import Paths, join_paths
+from game.helpers.config_store import config_store
+from game.helpers.asset_index import get_image_size
 from game.logic.linear_math import *
 
 
@@ -75,6 +88,17 @@ class CarBoundariesGenerator:
         self.center_point = Vector(center_point + [0])
         self.center_v_line = Line(self.center_point, self.v)
         self.center_point_pi_plane = self.center_v_line.plane_intersection(self.pi_plane)
+        # Parts of project_and_rotate_point before and after the rotation around z axis, see get_transform
+        self.from_sigma_transform = compose(
+            Transform.translation(-self.center_point),
+            Transform.projection(self.pi_plane, self.v),
+            Transform.rotation(self.fi, around_axis="x")
+        )
+        self.to_sigma_transform = compose(
+            Transform.rotation(-self.fi, around_axis="x"),
+            Transform.projection(self.sigma_plane, self.u),
+            Transform.translation(self.center_point)
+        )
         # For later use of saving initial vectors (for each rectangle corner) in lists
         self.sets_of_vectors = []
         self.sets_names = []
@@ -115,6 +139,39 @@ class CarBoundariesGenerator:
         final_vector = self.center_point + vector
         return round(final_vector, 0).values
 
+    def get_transform(self, angle: float) -> Transform:
+        """
+        Method returns the chain of project_and_rotate_point as a single transform, it can be applied to any number of
+        points at once.
+        :param angle: Angle to rotate points around centre point *CounterClockwise
+        :return: Transform
+        """
+        return self.to_sigma_transform @ Transform.rotation(angle, around_axis="z") @ self.from_sigma_transform
+
+    def generate_table(self, angles: np.ndarray) -> list[tuple[str, np.ndarray]]:
+        """
+        Method transforms every point of every set by every angle in one pass. The rotation around z axis is
+        cos * Zc + sin * Zs + Z0, so the composite transform of any angle is cos * M1 + sin * M2 + M0, with M0, M1 and
+        M2 computed once from the parts before and after the rotation.
+        :param angles: np.ndarray of angles to rotate points around centre point *CounterClockwise
+        :return: list[tuple[str, np.ndarray]] list of tuples(name, array of shape (angles, points, 3))
+        """
+        z_constant = np.diag([0.0, 0.0, 1.0, 1.0])
+        z_cos = np.diag([1.0, 1.0, 0.0, 0.0])
+        z_sin = np.zeros((4, 4))
+        z_sin[0, 1], z_sin[1, 0] = -1, 1
+        before, after = self.from_sigma_transform.matrix, self.to_sigma_transform.matrix
+        matrices = np.stack([after @ z @ before for z in (z_constant, z_cos, z_sin)])
+        sin, cos = sincos(np.asarray(angles, dtype=np.float64))
+        table = []
+        for name, vectors in zip(self.sets_names, self.sets_of_vectors):
+            points = np.ones((len(vectors), 4))
+            points[:, :3] = [list(vector) for vector in vectors]
+            # (3 matrices, points, 3) parts of every point, combined for every angle
+            parts = np.einsum("mij,pj->mpi", matrices[:, :3], points)
+            table.append((name, parts[0] + cos[:, None, None] * parts[1] + sin[:, None, None] * parts[2]))
+        return table
+
     def generate_points_rotated_by_angle(self, angle: float) -> tuple[str, list[list[int]]]:
         """
         Method generates every corner of set rectangles (in self.sets_of_vectors) rotated by angle. Returns
@@ -122,12 +179,108 @@ class CarBoundariesGenerator:
         :param angle: float angle to rotate point around center point *CounterClockwise
         :return: tuple[str, list[list[int]]] list of tuples[name, set_of_corner_points_of_rectangle=list]
         """
-        # Go over every set
+        # Every point of every set gets transformed at once
+        transform = self.get_transform(angle)
+        points = [list(point) for points in self.sets_of_vectors for point in points]
+        rotated = np.round(transform.apply(points), 0).tolist() if points else []
         sets_of_rotated_points = []
+        start = 0
         for i, points in enumerate(self.sets_of_vectors):
-            # Rotate every point
-            rotated_points = []
-            for point in points:
-                rotated_points.append(self.project_and_rotate_point(point, angle))
-            sets_of_rotated_points.append((self.sets_names[i], rotated_points))
+            sets_of_rotated_points.append((self.sets_names[i], rotated[start:start + len(points)]))
+            start += len(points)
         return sets_of_rotated_points
+
+
+MAX_CACHED_TABLES = 8  # One table per car and projection angle, only the latest few get generated again
+# Generated points of every frame, keyed by inputs of generate_all_points, most recently used at end
+_tables: OrderedDict[tuple, dict] = OrderedDict()
+
+
+def generate_all_points(sets: dict[str, list[list[int]]],
+                        image_height: int,
+                        number_of_frames: int,
+                        z_angle_of_projection: float = 25) -> dict:
+    """
+    Function generates points of every set for every rotation frame of a car, in the format saved under points in the
+    cars config. The last few tables are cached by their inputs, so generating the same rectangles again costs nothing.
+    The returned dict is shared with the cache, so it has to be copied before it gets modified.
+    :param sets: dict[str, list[list[int]]] name: corners of rectangle on x-y plane (see get_relative_corner_positions),
+                 the tyres set is required, its centre is the point of rotation
+    :param image_height: int height of car images, y-axis is inverted on screen
+    :param number_of_frames: int number of rotation images, frame i is rotated by i * 360 / number_of_frames degrees
+    :param z_angle_of_projection: float angle between planes. *Clockwise
+    :return: dict {name: [frames][points][x, y] for every set, "centre": [x, y], "projection_angle": float}
+    """
+    key = (
+        tuple((name, tuple(tuple(point) for point in points)) for name, points in sorted(sets.items())),
+        image_height,
+        number_of_frames,
+        z_angle_of_projection
+    )
+    if key in _tables:
+        _tables.move_to_end(key)
+    else:
+        tyres = sets["tyres"]
+        center_point = [(tyres[0][0] + tyres[1][0]) // 2, (tyres[0][1] + tyres[2][1]) // 2]
+        generator = CarBoundariesGenerator(center_point=center_point, z_angle_of_projection=z_angle_of_projection)
+        for name, points in sets.items():
+            generator.add_set_of_points([list(point) for point in points], name)
+        angles = np.arange(number_of_frames) * (360 / number_of_frames)
+        points = {"centre": [center_point[0], image_height - center_point[1]],
+                  "projection_angle": z_angle_of_projection}
+        for name, table in generator.generate_table(angles):
+            table = np.round(table[:, :, :2], 0)
+            table[:, :, 1] = image_height - table[:, :, 1]  # Relative to upper left corner of image
+            points[name] = table.tolist()
+        _tables[key] = points
+        if len(_tables) > MAX_CACHED_TABLES:
+            _tables.popitem(last=False)
+    return _tables[key]
+
+
+def regenerate_car_points(car_folder: str) -> str:
+    """
+    Function generates points of car again for its current number of frames, runs in worker processes. Rectangles
+    are taken from the first frame of saved points, where the transform is the identity.
+    :param car_folder: str path to car folder
+    :return: str status message
+    """
+    config_path = join_paths(car_folder, "config.json")
+    images_folder = join_paths(car_folder, "images")
+    points = config_store.get(config_path, "points") or {}
+    if not points.get("tyres") or not os.path.isdir(images_folder):
+        return f"{os.path.basename(car_folder)}: skipped, no tyre points or images"
+    names = sorted(name for name in os.listdir(images_folder) if name.endswith(".png"))
+    if not names:
+        return f"{os.path.basename(car_folder)}: skipped, no images"
+    image_height = get_image_size(join_paths(images_folder, names[0]))[1]
+    sets = {}
+    for name in ("tyres", "boundaries"):
+        if points.get(name):
+            sets[name] = [[int(round(x)), int(round(image_height - y))] for x, y in points[name][0]]
+    generated = generate_all_points(sets, image_height, len(names), points.get("projection_angle", 25))
+    points = dict(points, **generated)
+    config_store.update(config_path, {"points": points})
+    config_store.flush()
+    return f"{os.path.basename(car_folder)}: generated {len(names)} frames"
+
+
+def regenerate_all_points(cars_folder: str = Paths.cars, workers: int = None) -> None:
+    """
+    Function regenerates points of every car in cars_folder in parallel, without a display.
+    :param cars_folder: str path to folder containing car folders
+    :param workers: int number of processes, defaults to number of CPUs
+    """
+    folders = [join_paths(cars_folder, name) for name in sorted(os.listdir(cars_folder))
+               if os.path.isdir(join_paths(cars_folder, name))]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for message in executor.map(regenerate_car_points, folders):
+            print(message)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate tyre and boundary points of every car.")
+    parser.add_argument("--cars", default=Paths.cars, help="folder containing car folders")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes")
+    arguments = parser.parse_args()
+    regenerate_all_points(arguments.cars, arguments.workers)
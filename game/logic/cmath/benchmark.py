@@ -0,0 +1,64 @@
+"""
+Module for benchmarking the trigonometric tables against the math module and NumPy, and measuring their error.
+
+Run from the repository root:
+    python -m game.logic.cmath.benchmark
+"""
+
+import math
+import time
+
+import numpy as np
+
+from game.logic.cmath.trig import TrigTable, sincos
+
+
+def time_call(function, repeats: int) -> float:
+    """
+    Function returns average time of calling function in microseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) * 1e6 / repeats
+
+
+def measure_error(table: TrigTable, number_of_angles: int = 1_000_000) -> float:
+    """
+    Function returns the largest absolute error of looked up sine and cosine over random angles.
+    """
+    angles = np.random.default_rng(0).uniform(-720, 720, number_of_angles)
+    sin, cos = table.lookup(angles)
+    radians = np.radians(angles)
+    return float(max(np.abs(sin - np.sin(radians)).max(), np.abs(cos - np.cos(radians)).max()))
+
+
+def benchmark(table: TrigTable) -> None:
+    """
+    Function prints time of computing sine and cosine of a batch of angles exactly and through the table lookup.
+    """
+    print(f"{table.samples_per_degree} samples per degree, error bound {table.max_error:.2e}, "
+          f"measured {measure_error(table):.2e}")
+    rng = np.random.default_rng(0)
+    for n in (1, 50, 500, 5000, 50000):
+        angles = rng.uniform(0, 360, n)
+
+        def exact():
+            radians = np.radians(angles)
+            return np.sin(radians), np.cos(radians)
+
+        repeats = max(10, 200000 // n)
+        print(f"    {n} angles: numpy {time_call(exact, repeats):.2f} us, "
+              f"table {time_call(lambda: table.lookup(angles), repeats):.2f} us")
+
+    def scalar_math():
+        radians = math.radians(123.456)
+        return math.sin(radians), math.cos(radians)
+
+    print(f"    scalar: math {time_call(scalar_math, 200000):.3f} us, "
+          f"sincos {time_call(lambda: sincos(123.456), 200000):.3f} us")
+
+
+if __name__ == "__main__":
+    for samples_per_degree in (4, 16, 64):
+        benchmark(TrigTable(samples_per_degree))
@@ -0,0 +1,120 @@
+"""
+Module containing sincos and rotation helpers for angles in degrees, and the TrigTable class, sine and cosine tables.
+
+The helpers compute values exactly, they compute sine and cosine once per rotation. Tables hold exact values of sine
+and cosine at every sample of a full circle, values between samples are linearly interpolated. The error of
+interpolation is bounded by h^2 / 8, h being the sample spacing in radians, so the resolution can be chosen from the
+required precision. Looking values up only pays off for batches of several thousand angles, one NumPy ufunc call per
+function is faster for smaller ones and a single math call is faster than any Python level lookup (see benchmark.py in
+this package for the numbers). No batch in the game is that large, so tables are only used through an explicit lookup.
+"""
+
+from __future__ import annotations
+import math
+
+import numpy as np
+
+
+class TrigTable:
+    """
+    Sine and cosine of a full circle sampled samples_per_degree times per degree.
+    """
+    def __init__(self, samples_per_degree: int = 64):
+        """
+        :param samples_per_degree: int number of samples per degree, 64 bounds the error to about 1e-8
+        """
+        if samples_per_degree < 1:
+            raise ValueError(f"TrigTable: samples_per_degree has to be at least 1, got {samples_per_degree}.")
+        self.samples_per_degree = samples_per_degree
+        self.number_of_samples = 360 * samples_per_degree
+        # One extra sample at 360 degrees, so interpolating in the last interval needs no wrapping
+        radians = np.radians(np.arange(self.number_of_samples + 1) / samples_per_degree)
+        self.sin_table = np.sin(radians)
+        self.cos_table = np.cos(radians)
+
+    @classmethod
+    def for_precision(cls, precision: float) -> "TrigTable":
+        """
+        Method creates table with the lowest resolution whose interpolation error is at most precision.
+        :param precision: float maximum absolute error of sin and cos
+        :return: TrigTable
+        """
+        if precision <= 0:
+            raise ValueError(f"TrigTable.for_precision: precision has to be positive, got {precision}.")
+        spacing = math.degrees(math.sqrt(8 * precision))
+        return cls(max(1, math.ceil(1 / spacing)))
+
+    @property
+    def max_error(self) -> float:
+        """
+        Upper bound of absolute error of interpolated values, h^2 / 8 plus rounding of the table values.
+        """
+        spacing = math.radians(1 / self.samples_per_degree)
+        return spacing ** 2 / 8 + 4 * np.finfo(np.float64).eps
+
+    def lookup(self, angles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Method interpolates sine and cosine of angles from the tables, only faster than sincos for several thousand
+        angles.
+        :param angles: np.ndarray angles in degrees, any value
+        :return: tuple (sin, cos) of np.ndarray shaped as angles
+        """
+        position = np.mod(angles, 360) * self.samples_per_degree
+        index = position.astype(np.intp)
+        np.minimum(index, self.number_of_samples - 1, out=index)  # mod can round up to exactly 360
+        t = position - index
+        sin_0, cos_0 = self.sin_table[index], self.cos_table[index]
+        sin = sin_0 + (self.sin_table[index + 1] - sin_0) * t
+        cos = cos_0 + (self.cos_table[index + 1] - cos_0) * t
+        return sin, cos
+
+
+def sincos(angles) -> tuple:
+    """
+    Function returns sine and cosine of angles, computed exactly.
+    :param angles: float or np.ndarray of angles in degrees
+    :return: tuple (sin, cos) of floats or np.ndarrays shaped as angles
+    """
+    if isinstance(angles, (int, float)):
+        radians = math.radians(angles)
+        return math.sin(radians), math.cos(radians)
+    radians = np.radians(angles)
+    return np.sin(radians), np.cos(radians)
+
+
+def rotate_2d(x: float, y: float, angle: float) -> tuple[float, float]:
+    """
+    Function rotates point (x, y) around origin by angle degrees anticlockwise.
+    :return: tuple[float, float] rotated point
+    """
+    sin, cos = sincos(angle)
+    return cos * x - sin * y, sin * x + cos * y
+
+
+def rotate_3d(x: float, y: float, z: float, angle: float, around_axis: str = "x") -> tuple[float, float, float]:
+    """
+    Function rotates point (x, y, z) around one of the axes by angle degrees, right handed.
+    :param around_axis: str "x", "y" or "z"
+    :return: tuple[float, float, float] rotated point
+    """
+    sin, cos = sincos(angle)
+    if around_axis == "x":
+        return x, cos * y - sin * z, sin * y + cos * z
+    if around_axis == "y":
+        return cos * x + sin * z, y, -sin * x + cos * z
+    if around_axis == "z":
+        return cos * x - sin * y, sin * x + cos * y, z
+    raise ValueError(f"rotate_3d: Passed around_axis = {around_axis} parameter is incorrect.")
+
+
+def rotate_points(points: np.ndarray, angles) -> np.ndarray:
+    """
+    Function rotates 2d points around origin anticlockwise, every point by its own angle or all by the same one.
+    :param points: np.ndarray of shape (n, 2)
+    :param angles: float or np.ndarray of n angles in degrees
+    :return: np.ndarray of shape (n, 2)
+    """
+    points = np.asarray(points, dtype=np.float64)
+    sin, cos = sincos(angles)
+    x, y = points[..., 0], points[..., 1]
+    return np.stack((cos * x - sin * y, sin * x + cos * y), axis=-1)
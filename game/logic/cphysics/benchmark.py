@@ -0,0 +1,39 @@
+"""
+Module for benchmarking car physics without the game (or pygame) running.
+
+Run from the repository root:
+    python -m game.logic.cphysics.benchmark
+"""
+
+import time
+
+import numpy as np
+
+from game.logic.cphysics.car_model import CarModel
+from game.logic.cphysics.bodies import CarBodies
+
+
+def benchmark(number_of_cars: int, steps: int = 600, dt: float = 1 / 60) -> float:
+    """
+    Function steps number_of_cars cars with random inputs and returns the average time of one step.
+    :param number_of_cars: int number of cars stepped together
+    :param steps: int number of steps
+    :param dt: float seconds of one step
+    :return: float milliseconds per step
+    """
+    rng = np.random.default_rng(0)
+    bodies = CarBodies(capacity=number_of_cars)
+    model = CarModel()
+    for _ in range(number_of_cars):
+        bodies.add(model, rng.uniform(0, 4000, 2), rng.uniform(0, 360))
+    bodies.throttle[:] = rng.uniform(0, 1, number_of_cars)
+    bodies.steering_angle[:] = rng.uniform(-30, 30, number_of_cars)
+    start = time.perf_counter()
+    for _ in range(steps):
+        bodies.step(dt)
+    return (time.perf_counter() - start) * 1000 / steps
+
+
+if __name__ == "__main__":
+    for n in (1, 5, 50, 500):
+        print(f"{n} cars: {benchmark(n):.3f} ms per step")
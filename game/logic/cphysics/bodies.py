@@ -0,0 +1,184 @@
+"""
+Module containing the CarBodies class, rigid body car physics of many cars stepped together.
+
+State of every car is one row of NumPy arrays. Each step is split into substeps no longer than max_substep, each
+substep computes tyre forces of every car (bicycle model, front and rear axle with linear tyres saturating at grip)
+and integrates them with semi-implicit Euler. Positions are in screen coordinates (y pointing down), angles are in
+degrees, counter clockwise with 0 pointing right, as used everywhere else in the game.
+
+No pygame is needed, so physics can be benchmarked and tuned on its own, see benchmark.py.
+"""
+
+from __future__ import annotations
+import math
+
+import numpy as np
+
+from game.logic.cmath.trig import sincos
+from game.logic.cphysics.car_model import CarModel
+
+
+# Model parameters stored as per car arrays
+MODEL_PARAMETERS = ("acceleration", "braking", "drag", "rolling_resistance", "cornering_stiffness", "grip",
+                    "max_steering_angle", "cg_to_front", "cg_to_rear", "inertia")
+
+
+class CarBodies:
+    """
+    Structure of arrays holding the state, inputs and model parameters of cars. Arrays grow as cars are added, so
+    views of rows taken before adding more cars may stop being updated and should be re-fetched each frame.
+    """
+    def __init__(self, capacity: int = 8, max_substep: float = 1 / 240, low_speed: float = 20):
+        """
+        :param capacity: int number of cars arrays get allocated for, they grow when more cars are added
+        :param max_substep: float longest time in seconds integrated at once
+        :param low_speed: float px/s under which the tyre model is blended into pure rolling (kinematic) steering, as
+                          slip angles are undefined at standstill
+        """
+        self.count = 0
+        self.capacity = capacity
+        self.max_substep = max_substep
+        self.low_speed = low_speed
+        # State
+        self.position = np.zeros((capacity, 2))  # px on map
+        self.velocity_vector = np.zeros((capacity, 2))  # Movement on map in px per second
+        self.angle = np.zeros(capacity)  # Heading in degrees
+        self.angular_velocity = np.zeros(capacity)  # Radians per second, counter clockwise
+        # Inputs
+        self.throttle = np.zeros(capacity)  # Number between 0 and 1
+        self.brake_throttle = np.zeros(capacity)  # Number between 0 and 1
+        self.steering_angle = np.zeros(capacity)  # Degrees, positive turns left
+        # Model
+        for name in MODEL_PARAMETERS:
+            setattr(self, name, np.ones(capacity))
+
+    def _grow(self) -> None:
+        """
+        Method doubles capacity of every array.
+        """
+        self.capacity *= 2
+        for name, array in list(vars(self).items()):
+            if isinstance(array, np.ndarray):
+                grown = np.ones((self.capacity,) + array.shape[1:])
+                grown[:self.count] = array[:self.count]
+                setattr(self, name, grown)
+
+    def add(self, model: CarModel, position: list[float, float], angle: float = 0) -> int:
+        """
+        Method adds a car standing still with no inputs.
+        :param model: CarModel of car
+        :param position: list[float, float] position on map
+        :param angle: float heading in degrees
+        :return: int row of car in arrays
+        """
+        if self.count == self.capacity:
+            self._grow()
+        row = self.count
+        self.count += 1
+        self.position[row] = position
+        self.angle[row] = angle
+        for name in ("velocity_vector", "angular_velocity", "throttle", "brake_throttle", "steering_angle"):
+            getattr(self, name)[row] = 0
+        self.set_model(row, model)
+        return row
+
+    def set_model(self, row: int, model: CarModel) -> None:
+        """
+        Method sets model parameters of car on row, used when a car is added or its config changes.
+        """
+        for name in MODEL_PARAMETERS:
+            getattr(self, name)[row] = getattr(model, name)
+
+    def get_rows(self, rows=None) -> np.ndarray:
+        """
+        Method returns array of row indexes, for None every added car.
+        :param rows: None, int, slice or array of rows
+        :return: np.ndarray[int]
+        """
+        if rows is None:
+            return np.arange(self.count)
+        return np.atleast_1d(np.arange(self.count)[rows])
+
+    def get_forward_speed(self, rows=None) -> np.ndarray:
+        """
+        Method returns speed of cars along their heading in px/s, negative when reversing.
+        """
+        rows = self.get_rows(rows)
+        sin, cos = sincos(self.angle[rows])
+        return self.velocity_vector[rows, 0] * cos - self.velocity_vector[rows, 1] * sin
+
+    def set_forward_speed(self, rows, speed) -> None:
+        """
+        Method sets velocity of cars to speed along their heading, without any sideways movement.
+        """
+        rows = self.get_rows(rows)
+        sin, cos = sincos(self.angle[rows])
+        self.velocity_vector[rows, 0] = speed * cos
+        self.velocity_vector[rows, 1] = -speed * sin
+
+    def step(self, dt: float, rows=None) -> None:
+        """
+        Method advances cars by dt seconds, in as many substeps as needed to keep each under max_substep.
+        :param dt: float seconds since last step
+        :param rows: None, int, slice or array of rows to step, every car if None
+        """
+        if dt <= 0:
+            return
+        rows = self.get_rows(rows)
+        if len(rows) == 0:
+            return
+        self.throttle[rows] = np.clip(self.throttle[rows], 0, 1)
+        self.brake_throttle[rows] = np.clip(self.brake_throttle[rows], 0, 1)
+        substeps = max(1, math.ceil(dt / self.max_substep))
+        for _ in range(substeps):
+            self.substep(dt / substeps, rows)
+
+    def substep(self, h: float, rows: np.ndarray) -> None:
+        """
+        Method integrates forces of cars on rows over h seconds.
+        :param h: float seconds
+        :param rows: np.ndarray[int] rows of cars
+        """
+        sin, cos = sincos(self.angle[rows])
+        # Velocity in car frame, y axis flipped so lateral (left) is positive counter clockwise
+        vx, vy = self.velocity_vector[rows, 0], -self.velocity_vector[rows, 1]
+        v_long = vx * cos + vy * sin
+        v_lat = -vx * sin + vy * cos
+        omega = self.angular_velocity[rows]
+        max_steering = self.max_steering_angle[rows]
+        steering = np.clip(self.steering_angle[rows], -max_steering, max_steering)
+        delta = np.radians(steering)
+        sin_delta, cos_delta = sincos(steering)
+        front, rear = self.cg_to_front[rows], self.cg_to_rear[rows]
+        direction = np.where(v_long < 0, -1.0, 1.0)
+        speed = np.abs(v_long) + 1e-6
+        # Slip angles and lateral tyre forces of both axles
+        slip_front = np.arctan2(v_lat + omega * front, speed) - delta * direction
+        slip_rear = np.arctan2(v_lat - omega * rear, speed)
+        grip, stiffness = self.grip[rows], self.cornering_stiffness[rows]
+        # A turned front wheel slips even at standstill, its force is faded in like brakes so parked cars stay put
+        low_speed_blend = np.clip(np.abs(v_long) / self.low_speed, 0, 1)
+        force_front = np.clip(-stiffness * slip_front, -grip, grip) * low_speed_blend
+        force_rear = np.clip(-stiffness * slip_rear, -grip, grip)
+        # Engine, brakes (opposing movement, faded in near standstill so cars do not jitter) and resistances
+        traction = self.throttle[rows] * self.acceleration[rows]
+        traction -= self.brake_throttle[rows] * self.braking[rows] * np.clip(v_long / self.low_speed, -1, 1)
+        traction -= self.drag[rows] * v_long * np.abs(v_long) + self.rolling_resistance[rows] * v_long
+        a_long = traction - force_front * sin_delta
+        a_lat = force_rear + force_front * cos_delta
+        angular_acceleration = (front * force_front * cos_delta - rear * force_rear) / self.inertia[rows]
+        # Semi-implicit Euler, velocities first
+        v_long = v_long + a_long * h
+        v_lat = v_lat + a_lat * h
+        omega = omega + angular_acceleration * h
+        # Near standstill tyres roll without slipping
+        blend = np.clip(np.abs(v_long) / self.low_speed, 0, 1)
+        omega = blend * omega + (1 - blend) * v_long * sin_delta / cos_delta / (front + rear)
+        v_lat = blend * v_lat
+        vx = v_long * cos - v_lat * sin
+        vy = v_long * sin + v_lat * cos
+        self.velocity_vector[rows, 0] = vx
+        self.velocity_vector[rows, 1] = -vy
+        self.angular_velocity[rows] = omega
+        self.position[rows] += self.velocity_vector[rows] * h
+        self.angle[rows] = np.mod(self.angle[rows] + np.degrees(omega * h), 360)
@@ -0,0 +1,108 @@
+"""
+Module containing the CarModel class, physical parameters of a car model.
+
+Every force is stored per unit of mass, so parameters are accelerations in px/s^2 and do not depend on the mass of a
+car. Tyre positions are taken from the points.tyres data saved into each car's config by the boundaries generation
+page, the first frame is the car pointing up (forward) and its first two tyres are the front ones.
+
+The acceleration key of car configs predates this model, it was applied per frame as throttle * acceleration * dt * dt,
+which at the frame rate cap is an acceleration of acceleration / FPS_CAP px/s^2. It is converted when loading, the
+engine_acceleration key sets the acceleration in px/s^2 directly.
+"""
+
+import math
+
+from game.constants import FPS_CAP
+
+
+class CarModel:
+    """
+    Parameters of the rigid body car model, created from the car config (base config updated with the car config).
+    """
+    def __init__(self,
+                 acceleration: float = 200,
+                 braking: float = 500,
+                 drag: float = 0.001,
+                 rolling_resistance: float = 0.5,
+                 cornering_stiffness: float = 2000,
+                 grip: float = 600,
+                 max_steering_angle: float = 35,
+                 cg_to_front: float = 20,
+                 cg_to_rear: float = 20,
+                 track_width: float = 28):
+        """
+        :param acceleration: float px/s^2 the engine accelerates with at full throttle
+        :param braking: float px/s^2 the brakes decelerate with at full brake
+        :param drag: float air resistance, deceleration is drag * speed^2
+        :param rolling_resistance: float deceleration is rolling_resistance * speed
+        :param cornering_stiffness: float lateral px/s^2 of tyre force per radian of slip angle
+        :param grip: float maximum lateral px/s^2 a pair of tyres can hold before sliding
+        :param max_steering_angle: float degrees the front wheels can turn
+        :param cg_to_front: float px from centre of gravity to front axle
+        :param cg_to_rear: float px from centre of gravity to rear axle
+        :param track_width: float px between left and right tyres
+        """
+        self.acceleration = acceleration
+        self.braking = braking
+        self.drag = drag
+        self.rolling_resistance = rolling_resistance
+        self.cornering_stiffness = cornering_stiffness
+        self.grip = grip
+        self.max_steering_angle = max_steering_angle
+        self.cg_to_front = cg_to_front
+        self.cg_to_rear = cg_to_rear
+        self.track_width = track_width
+
+    @property
+    def wheelbase(self) -> float:
+        return self.cg_to_front + self.cg_to_rear
+
+    @property
+    def inertia(self) -> float:
+        """
+        Yaw moment of inertia per unit of mass, the car body approximated as a rectangle over its wheelbase and track.
+        """
+        return (self.wheelbase ** 2 + self.track_width ** 2) / 12
+
+    @classmethod
+    def from_config(cls, config: dict) -> "CarModel":
+        """
+        Method creates model from car config. Keys named as the init parameters override the defaults, except for
+        acceleration which is converted from its legacy per frame meaning (engine_acceleration takes precedence). Axle
+        positions are measured from points.tyres if they exist, otherwise the wheelbase is the length key split in half.
+        :param config: dict car config
+        :return: CarModel
+        """
+        names = cls.__init__.__code__.co_varnames[1:cls.__init__.__code__.co_argcount]
+        model = cls(**{name: config[name] for name in names if name in config and name != "acceleration"})
+        if "engine_acceleration" in config:
+            model.acceleration = config["engine_acceleration"]
+        elif "acceleration" in config:
+            model.acceleration = config["acceleration"] / FPS_CAP
+        tyres = config.get("points", {}).get("tyres")
+        if tyres:
+            model.set_tyres(tyres[0], config["points"].get("centre"))
+        elif "length" in config:
+            model.cg_to_front = model.cg_to_rear = config["length"] / 2
+        return model
+
+    def set_tyres(self, tyres: list[list[float]], centre: list[float] = None) -> None:
+        """
+        Method sets axle positions from tyre points of car pointing forward.
+        :param tyres: list[list[float]] [front-left, front-right, rear-left, rear-right] tyre positions
+        :param centre: list[float] position of centre of gravity, centre of tyres if None
+        """
+        front = [(tyres[0][0] + tyres[1][0]) / 2, (tyres[0][1] + tyres[1][1]) / 2]
+        rear = [(tyres[2][0] + tyres[3][0]) / 2, (tyres[2][1] + tyres[3][1]) / 2]
+        if centre is None:
+            centre = [(front[0] + rear[0]) / 2, (front[1] + rear[1]) / 2]
+        wheelbase = math.dist(front, rear)
+        if wheelbase == 0:
+            print(f"CarModel.set_tyres: Front and rear tyres are on the same position: {tyres}")
+            return
+        # Centre projected on the line between axles
+        axis = [(front[0] - rear[0]) / wheelbase, (front[1] - rear[1]) / wheelbase]
+        from_rear = (centre[0] - rear[0]) * axis[0] + (centre[1] - rear[1]) * axis[1]
+        self.cg_to_rear = min(max(from_rear, 0), wheelbase)
+        self.cg_to_front = wheelbase - self.cg_to_rear
+        self.track_width = math.dist(tyres[0], tyres[1])
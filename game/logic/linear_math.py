@@ -4,13 +4,29 @@ Module for different linear algebra math classes such as Vectors, Planes, ...
 
 import math
 
+import numpy as np
+
+from game.logic.cmath.trig import rotate_2d, rotate_3d, sincos
+
 
 class Vector:
     """
     Class representing Vector. Each vector has length, dimension properties. Calling norm property returns new
     normalized vector.
-    Possible operations between and on vectors: +, -, *, round, str
+    Possible operations between and on vectors: +, -, *, round, str and the in-place +=, -=, *= which modify the
+    vector instead of creating a new one.
+    Vectors of 2 and 3 dimensions are created as the faster Vec2 and Vec3 subclasses, Vector([x, y]) returns a Vec2.
     """
+    __slots__ = ("values",)
+
+    def __new__(cls, values: list[int] = None):
+        if cls is Vector and values is not None:
+            if len(values) == 2:
+                return Vec2(values[0], values[1])
+            if len(values) == 3:
+                return Vec3(values[0], values[1], values[2])
+        return object.__new__(cls)
+
     def __init__(self, values: list[int]):
         """
         :param values: list[int, ...] list containing values for each dimension of vector, i, j, k, ...
@@ -36,24 +52,41 @@ class Vector:
         :param other: Vector
         :return: bool
         """
-        if type(other) is Vector:
+        if isinstance(other, Vector):
             if self.dimension == other.dimension:
                 return True
         raise ValueError(f"Vector: Operation not possible between {self} and {other}, types do not match.")
 
     def __add__(self, other) -> "Vector":
         if self.check_operation_is_possible(other):
-            return Vector(values=[val + other.values[i] for i, val in enumerate(self.values)])
+            return Vector(values=[val + other_val for val, other_val in zip(self.values, other.values)])
 
     def __sub__(self, other) -> "Vector":
-        return self.__add__(other * -1)
+        if self.check_operation_is_possible(other):
+            return Vector(values=[val - other_val for val, other_val in zip(self.values, other.values)])
 
     def __mul__(self, other):
         if isinstance(other, (int, float)):
             return Vector(values=[val * other for val in self.values])
         elif isinstance(other, Vector):
             self.check_operation_is_possible(other)
-            return sum([val * other.values[i] for i, val in enumerate(self.values)])
+            return sum([val * other_val for val, other_val in zip(self.values, other.values)])
+
+    def __iadd__(self, other) -> "Vector":
+        if self.check_operation_is_possible(other):
+            self.values = [val + other_val for val, other_val in zip(self.values, other.values)]
+            return self
+
+    def __isub__(self, other) -> "Vector":
+        if self.check_operation_is_possible(other):
+            self.values = [val - other_val for val, other_val in zip(self.values, other.values)]
+            return self
+
+    def __imul__(self, other) -> "Vector":
+        if not isinstance(other, (int, float)):
+            raise ValueError(f"Vector: In-place multiplication of {self} is only possible by a number, got {other}.")
+        self.values = [val * other for val in self.values]
+        return self
 
     def __neg__(self) -> "Vector":
         values = [val * -1 for val in self.values]
@@ -74,6 +107,203 @@ class Vector:
         return str(self)
 
 
+class Vec2(Vector):
+    """
+    Fixed 2-dimensional vector with values stored in slots, supports the whole Vector API. The values property
+    returns a new list, so values have to be changed through x, y or by setting values.
+    """
+    __slots__ = ("x", "y")
+
+    def __new__(cls, x: float = 0, y: float = 0):
+        self = object.__new__(cls)
+        self.x = x
+        self.y = y
+        return self
+
+    def __init__(self, *args, **kwargs):
+        # Values are set by __new__, also when created through Vector([x, y]) or Vector(values=[x, y])
+        pass
+
+    @property
+    def values(self) -> list[float]:
+        return [self.x, self.y]
+
+    @values.setter
+    def values(self, values: list[float]) -> None:
+        self.x, self.y = values
+
+    @property
+    def length(self) -> float:
+        return math.hypot(self.x, self.y)
+
+    @property
+    def dimension(self) -> int:
+        return 2
+
+    @property
+    def norm(self) -> "Vec2":
+        length = math.hypot(self.x, self.y)
+        return Vec2(self.x / length, self.y / length)
+
+    def check_operation_is_possible(self, other) -> bool:
+        if other.__class__ is Vec2:
+            return True
+        raise ValueError(f"Vector: Operation not possible between {self} and {other}, types do not match.")
+
+    def __add__(self, other) -> "Vec2":
+        if other.__class__ is not Vec2:
+            self.check_operation_is_possible(other)
+        return Vec2(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other) -> "Vec2":
+        if other.__class__ is not Vec2:
+            self.check_operation_is_possible(other)
+        return Vec2(self.x - other.x, self.y - other.y)
+
+    def __mul__(self, other):
+        if other.__class__ is Vec2:
+            return self.x * other.x + self.y * other.y
+        if isinstance(other, (int, float)):
+            return Vec2(self.x * other, self.y * other)
+        if isinstance(other, Vector):
+            self.check_operation_is_possible(other)
+
+    def __iadd__(self, other) -> "Vec2":
+        if other.__class__ is not Vec2:
+            self.check_operation_is_possible(other)
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other) -> "Vec2":
+        if other.__class__ is not Vec2:
+            self.check_operation_is_possible(other)
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def __imul__(self, other) -> "Vec2":
+        if not isinstance(other, (int, float)):
+            raise ValueError(f"Vector: In-place multiplication of {self} is only possible by a number, got {other}.")
+        self.x *= other
+        self.y *= other
+        return self
+
+    def __neg__(self) -> "Vec2":
+        return Vec2(-self.x, -self.y)
+
+    def __round__(self, n=None) -> "Vec2":
+        return Vec2(round(self.x, n), round(self.y, n))
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+
+    def __str__(self) -> str:
+        return f"<Vec2: [{self.x}, {self.y}]>"
+
+
+class Vec3(Vector):
+    """
+    Fixed 3-dimensional vector with values stored in slots, supports the whole Vector API. The values property
+    returns a new list, so values have to be changed through x, y, z or by setting values.
+    """
+    __slots__ = ("x", "y", "z")
+
+    def __new__(cls, x: float = 0, y: float = 0, z: float = 0):
+        self = object.__new__(cls)
+        self.x = x
+        self.y = y
+        self.z = z
+        return self
+
+    def __init__(self, *args, **kwargs):
+        # Values are set by __new__, also when created through Vector([x, y, z]) or Vector(values=[x, y, z])
+        pass
+
+    @property
+    def values(self) -> list[float]:
+        return [self.x, self.y, self.z]
+
+    @values.setter
+    def values(self, values: list[float]) -> None:
+        self.x, self.y, self.z = values
+
+    @property
+    def length(self) -> float:
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    @property
+    def dimension(self) -> int:
+        return 3
+
+    @property
+    def norm(self) -> "Vec3":
+        length = self.length
+        return Vec3(self.x / length, self.y / length, self.z / length)
+
+    def check_operation_is_possible(self, other) -> bool:
+        if other.__class__ is Vec3:
+            return True
+        raise ValueError(f"Vector: Operation not possible between {self} and {other}, types do not match.")
+
+    def __add__(self, other) -> "Vec3":
+        if other.__class__ is not Vec3:
+            self.check_operation_is_possible(other)
+        return Vec3(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other) -> "Vec3":
+        if other.__class__ is not Vec3:
+            self.check_operation_is_possible(other)
+        return Vec3(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, other):
+        if other.__class__ is Vec3:
+            return self.x * other.x + self.y * other.y + self.z * other.z
+        if isinstance(other, (int, float)):
+            return Vec3(self.x * other, self.y * other, self.z * other)
+        if isinstance(other, Vector):
+            self.check_operation_is_possible(other)
+
+    def __iadd__(self, other) -> "Vec3":
+        if other.__class__ is not Vec3:
+            self.check_operation_is_possible(other)
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return self
+
+    def __isub__(self, other) -> "Vec3":
+        if other.__class__ is not Vec3:
+            self.check_operation_is_possible(other)
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return self
+
+    def __imul__(self, other) -> "Vec3":
+        if not isinstance(other, (int, float)):
+            raise ValueError(f"Vector: In-place multiplication of {self} is only possible by a number, got {other}.")
+        self.x *= other
+        self.y *= other
+        self.z *= other
+        return self
+
+    def __neg__(self) -> "Vec3":
+        return Vec3(-self.x, -self.y, -self.z)
+
+    def __round__(self, n=None) -> "Vec3":
+        return Vec3(round(self.x, n), round(self.y, n), round(self.z, n))
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+        yield self.z
+
+    def __str__(self) -> str:
+        return f"<Vec3: [{self.x}, {self.y}, {self.z}]>"
+
+
 def rotate_2d_vector(vector: Vector, angle: float) -> Vector:
     """
     Function rotates 2-dimensional vector by angle degrees anticlockwise.
@@ -83,34 +313,15 @@ def rotate_2d_vector(vector: Vector, angle: float) -> Vector:
     """
     if vector.dimension != 2:
         raise ValueError(f"rotate_2d_vector: Passed vector {vector} is not 2-dimensional.")
-    ang = math.radians(angle)
-    _x = vector.values[0]
-    _y = vector.values[1]
-    x = math.cos(ang) * _x - math.sin(ang) * _y
-    y = math.sin(ang) * _x + math.cos(ang) * _y
-    return Vector([x, y])
+    x, y = rotate_2d(*vector, angle)
+    return Vec2(x, y)
 
 
 def rotate_3d_vector(vector: Vector, angle: float, around_axis: str = "x"):
     if vector.dimension != 3:
         raise ValueError(f"rotate_3d_vector: Passed vector {vector} is not 3-dimensional.")
-    ang = math.radians(angle)
-    _x, _y, _z = vector.values[0], vector.values[1], vector.values[2]
-    if around_axis == "x":
-        x = _x
-        y = math.cos(ang) * _y - math.sin(ang) * _z
-        z = math.sin(ang) * _y + math.cos(ang) * _z
-    elif around_axis == "y":
-        x = math.cos(ang) * _x + math.sin(ang) * _z
-        y = _y
-        z = - math.sin(ang) * _x + math.cos(ang) * _z
-    elif around_axis == "z":
-        x = math.cos(ang) * _x - math.sin(ang) * _y
-        y = math.sin(ang) * _x + math.cos(ang) * _y
-        z = _z
-    else:
-        raise ValueError(f"rotate_3d_vector: Passed around_axis = {around_axis} parameter is incorrect.")
-    return Vector([x, y, z])
+    x, y, z = rotate_3d(*vector, angle, around_axis)
+    return Vec3(x, y, z)
 
 
 def make_vector(val):
@@ -211,3 +422,139 @@ class Line:
 
     def __repr__(self):
         return str(self)
+
+
+def rotation_matrix(angle: float, around_axis: str = "x") -> np.ndarray:
+    """
+    Function returns 3x3 matrix rotating points around one of the axes by angle degrees, same as rotate_3d_vector.
+    :param angle: float degrees to rotate by
+    :param around_axis: str "x", "y" or "z"
+    :return: np.ndarray of shape (3, 3)
+    """
+    sin, cos = sincos(angle)
+    if around_axis == "x":
+        return np.array([[1, 0, 0], [0, cos, -sin], [0, sin, cos]])
+    if around_axis == "y":
+        return np.array([[cos, 0, sin], [0, 1, 0], [-sin, 0, cos]])
+    if around_axis == "z":
+        return np.array([[cos, -sin, 0], [sin, cos, 0], [0, 0, 1]])
+    raise ValueError(f"rotation_matrix: Passed around_axis = {around_axis} parameter is incorrect.")
+
+
+def apply_matrix(matrix: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    Function applies 3x3 (linear) or 4x4 (affine, homogeneous) matrix to every point at once.
+    :param matrix: np.ndarray of shape (3, 3) or (4, 4)
+    :param points: np.ndarray of shape (n, 3), or anything that converts to it
+    :return: np.ndarray of shape (n, 3)
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if matrix.shape == (3, 3):
+        return points @ matrix.T
+    if matrix.shape == (4, 4):
+        return points @ matrix[:3, :3].T + matrix[:3, 3]
+    raise ValueError(f"apply_matrix: Matrix has to be 3x3 or 4x4, got shape {matrix.shape}.")
+
+
+class Transform:
+    """
+    Class representing an affine transform of 3-dimensional points, stored as a 4x4 homogeneous matrix.
+    Transforms are composed with @, (a @ b) applies b first and then a, so a chain of rotations, projections and
+    translations can be computed once and applied to many points with a single matrix multiplication.
+    """
+    def __init__(self, matrix: np.ndarray = None):
+        """
+        :param matrix: np.ndarray of shape (4, 4) or (3, 3) for linear transforms, identity if None
+        """
+        if matrix is None:
+            matrix = np.identity(4)
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.shape == (3, 3):
+            linear = matrix
+            matrix = np.identity(4)
+            matrix[:3, :3] = linear
+        elif matrix.shape != (4, 4):
+            raise ValueError(f"Transform: Matrix has to be 3x3 or 4x4, got shape {matrix.shape}.")
+        self.matrix = matrix
+
+    @classmethod
+    def rotation(cls, angle: float, around_axis: str = "x") -> "Transform":
+        """
+        Method creates transform rotating around one of the axes by angle degrees, same as rotate_3d_vector.
+        """
+        return cls(rotation_matrix(angle, around_axis))
+
+    @classmethod
+    def translation(cls, offset) -> "Transform":
+        """
+        Method creates transform moving points by offset.
+        :param offset: list, tuple or Vector of 3 values
+        """
+        matrix = np.identity(4)
+        matrix[:3, 3] = list(offset)
+        return cls(matrix)
+
+    @classmethod
+    def projection(cls, plane: Plane, direction) -> "Transform":
+        """
+        Method creates transform projecting points onto plane along direction, same as intersecting the line through
+        a point in direction with plane.
+        :param plane: Plane to project onto
+        :param direction: list, tuple or Vector direction of projection, can not be parallel to plane
+        """
+        d = np.array(list(make_vector(direction)), dtype=np.float64)
+        n = np.array(list(plane.n), dtype=np.float64)
+        d_n = d @ n
+        if abs(d_n) < 1e-12:
+            raise ValueError(f"Transform.projection: Direction {direction} is parallel to plane {plane}")
+        # x + d * ((p - x) * n) / (d * n)
+        matrix = np.identity(4)
+        matrix[:3, :3] -= np.outer(d, n) / d_n
+        matrix[:3, 3] = d * (np.array(list(plane.p), dtype=np.float64) @ n) / d_n
+        return cls(matrix)
+
+    @property
+    def linear(self) -> np.ndarray:
+        """
+        3x3 matrix of transform without translation.
+        """
+        return self.matrix[:3, :3]
+
+    def apply(self, points: np.ndarray) -> np.ndarray:
+        """
+        Method transforms every point at once.
+        :param points: np.ndarray of shape (n, 3), or anything that converts to it
+        :return: np.ndarray of shape (n, 3)
+        """
+        return apply_matrix(self.matrix, points)
+
+    def apply_vector(self, vector) -> Vec3:
+        """
+        Method transforms a single point.
+        :param vector: list, tuple or Vector of 3 values
+        :return: Vec3
+        """
+        x, y, z = self.apply([list(make_vector(vector))])[0]
+        return Vec3(float(x), float(y), float(z))
+
+    def __matmul__(self, other: "Transform") -> "Transform":
+        if not isinstance(other, Transform):
+            return NotImplemented
+        return Transform(self.matrix @ other.matrix)
+
+    def __str__(self) -> str:
+        return f"<Transform: {self.matrix.tolist()}>"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+def compose(*transforms: Transform) -> Transform:
+    """
+    Function composes transforms in the order they get applied, compose(a, b, c) applies a first and c last.
+    :return: Transform
+    """
+    result = Transform()
+    for transform in transforms:
+        result = transform @ result
+    return result
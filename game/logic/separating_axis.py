@@ -0,0 +1,50 @@
+"""
+Module for testing convex polygons for overlap with the separating axis theorem.
+
+Two convex polygons do not overlap if and only if there is an axis, perpendicular to one of their edges, on which their
+projections do not overlap. If there is none, the axis with the smallest overlap gives the shortest way of pushing them
+apart, used as the contact normal and depth.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def get_axes(polygon: np.ndarray) -> np.ndarray:
+    """
+    Function returns unit normals of every edge of polygon.
+    :param polygon: np.ndarray of shape (n, 2), corners in order around the polygon
+    :return: np.ndarray of shape (m, 2), edges of zero length are skipped
+    """
+    edges = np.roll(polygon, -1, axis=0) - polygon
+    normals = np.stack((-edges[:, 1], edges[:, 0]), axis=1)
+    lengths = np.hypot(normals[:, 0], normals[:, 1])
+    valid = lengths > 0
+    return normals[valid] / lengths[valid, None]
+
+
+def get_polygon_overlap(first: np.ndarray, second: np.ndarray) -> tuple[np.ndarray, float]:
+    """
+    Function tests two convex polygons for overlap.
+    :param first: np.ndarray of shape (n, 2), corners in order around the polygon
+    :param second: np.ndarray of shape (m, 2), corners in order around the polygon
+    :return: tuple (normal, depth) or None if polygons do not overlap, moving second by normal * depth (or first by
+             -normal * depth) separates them
+    """
+    first, second = np.asarray(first, dtype=np.float64), np.asarray(second, dtype=np.float64)
+    axes = np.concatenate((get_axes(first), get_axes(second)))
+    if len(axes) == 0:
+        return None
+    # Projections of every corner on every axis, (axes, corners)
+    first_projections = axes @ first.T
+    second_projections = axes @ second.T
+    # Distances second has to move along and against every axis to leave first
+    forward = first_projections.max(axis=1) - second_projections.min(axis=1)
+    backward = second_projections.max(axis=1) - first_projections.min(axis=1)
+    depths = np.minimum(forward, backward)
+    if (depths <= 0).any():
+        return None
+    i = int(np.argmin(depths))
+    normal = axes[i] if forward[i] <= backward[i] else -axes[i]
+    return normal, float(depths[i])
@@ -0,0 +1,206 @@
+"""
+Module containing the SpatialHash class, a uniform grid index of objects with bounding rectangles.
+"""
+
+from __future__ import annotations
+import math
+from typing import Callable, Hashable
+
+
+def get_rect_distance(rect: tuple[float, float, float, float], point: tuple[float, float]) -> float:
+    """
+    Function returns distance between point and the closest point of rect, 0 if point lies inside of rect.
+    :param rect: tuple[float, float, float, float] (left, top, width, height)
+    :param point: tuple[float, float] (x, y)
+    :return: float
+    """
+    left, top, width, height = rect
+    dx = max(left - point[0], 0, point[0] - (left + width))
+    dy = max(top - point[1], 0, point[1] - (top + height))
+    return math.hypot(dx, dy)
+
+
+def rects_intersect(first: tuple[float, float, float, float], second: tuple[float, float, float, float]) -> bool:
+    """
+    Function checks if two (left, top, width, height) rectangles overlap, touching edges count as overlapping.
+    """
+    return (first[0] <= second[0] + second[2] and second[0] <= first[0] + first[2] and
+            first[1] <= second[1] + second[3] and second[1] <= first[1] + first[3])
+
+
+def get_ring_cells(column: int, row: int, ring: int) -> list[tuple[int, int]]:
+    """
+    Function returns cells on the border of the square of cells ring cells away from (column, row).
+    """
+    if ring == 0:
+        return [(column, row)]
+    cells = []
+    for c in range(column - ring, column + ring + 1):
+        cells.append((c, row - ring))
+        cells.append((c, row + ring))
+    for r in range(row - ring + 1, row + ring):
+        cells.append((column - ring, r))
+        cells.append((column + ring, r))
+    return cells
+
+
+class SpatialHash:
+    """
+    Uniform grid of cells, every object is stored in each cell its rectangle covers. Queries only look at the cells
+    around the queried area, so their cost depends on the number of objects nearby and not on the whole map.
+    Objects have to be hashable, rectangles are (left, top, width, height) in px on map.
+    """
+    def __init__(self, cell_size: int = 256):
+        """
+        :param cell_size: int size of one (square) cell in px, roughly the size of the common object or query
+        """
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], set] = {}  # (column, row): objects in cell
+        self.rects: dict[Hashable, tuple[float, float, float, float]] = {}  # object: rect
+        self._ranges: dict[Hashable, tuple[int, int, int, int]] = {}  # object: range of covered cells
+        # Range of cells that were ever occupied, bounds the ring search of nearest. It only grows, so removing objects
+        # costs nothing and it stays an upper bound
+        self._bounds: tuple[int, int, int, int] = None
+
+    def __len__(self) -> int:
+        return len(self.rects)
+
+    def __contains__(self, obj: Hashable) -> bool:
+        return obj in self.rects
+
+    def get_cell_range(self, rect: tuple[float, float, float, float]) -> tuple[int, int, int, int]:
+        """
+        Method returns (first column, first row, last column, last row) of cells covered by rect.
+        """
+        left, top, width, height = rect
+        return (int(left // self.cell_size), int(top // self.cell_size),
+                int((left + width) // self.cell_size), int((top + height) // self.cell_size))
+
+    def _add_to_cells(self, obj: Hashable, cell_range: tuple[int, int, int, int]) -> None:
+        if self._bounds is None:
+            self._bounds = cell_range
+        else:
+            self._bounds = (min(self._bounds[0], cell_range[0]), min(self._bounds[1], cell_range[1]),
+                            max(self._bounds[2], cell_range[2]), max(self._bounds[3], cell_range[3]))
+        for column in range(cell_range[0], cell_range[2] + 1):
+            for row in range(cell_range[1], cell_range[3] + 1):
+                self.cells.setdefault((column, row), set()).add(obj)
+
+    def _remove_from_cells(self, obj: Hashable, cell_range: tuple[int, int, int, int]) -> None:
+        for column in range(cell_range[0], cell_range[2] + 1):
+            for row in range(cell_range[1], cell_range[3] + 1):
+                cell = self.cells[(column, row)]
+                cell.discard(obj)
+                if not cell:
+                    del self.cells[(column, row)]
+
+    def insert(self, obj: Hashable, rect: tuple[float, float, float, float]) -> None:
+        """
+        Method adds object with its bounding rectangle to the index, inserting an indexed object moves it.
+        :param obj: Hashable object
+        :param rect: tuple[float, float, float, float] (left, top, width, height) bounding rectangle of object
+        """
+        if obj in self.rects:
+            self.move(obj, rect)
+            return
+        cell_range = self.get_cell_range(rect)
+        self.rects[obj] = tuple(rect)
+        self._ranges[obj] = cell_range
+        self._add_to_cells(obj, cell_range)
+
+    def move(self, obj: Hashable, rect: tuple[float, float, float, float]) -> None:
+        """
+        Method updates the rectangle of object, cells are only changed if object moved over a cell edge.
+        :param obj: Hashable indexed object
+        :param rect: tuple[float, float, float, float] new bounding rectangle of object
+        """
+        if obj not in self.rects:
+            self.insert(obj, rect)
+            return
+        self.rects[obj] = tuple(rect)
+        cell_range = self.get_cell_range(rect)
+        if cell_range != self._ranges[obj]:
+            self._remove_from_cells(obj, self._ranges[obj])
+            self._add_to_cells(obj, cell_range)
+            self._ranges[obj] = cell_range
+
+    def remove(self, obj: Hashable) -> None:
+        """
+        Method removes object from the index, removing an object that is not indexed does nothing.
+        :param obj: Hashable object
+        """
+        if obj not in self.rects:
+            return
+        self._remove_from_cells(obj, self._ranges.pop(obj))
+        del self.rects[obj]
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.rects.clear()
+        self._ranges.clear()
+        self._bounds = None
+
+    def query_rect(self, rect: tuple[float, float, float, float]) -> list:
+        """
+        Method returns every object whose rectangle intersects rect.
+        :param rect: tuple[float, float, float, float] (left, top, width, height)
+        :return: list of objects, each object once
+        """
+        found = set()
+        first_column, first_row, last_column, last_row = self.get_cell_range(rect)
+        # Queries larger than the map would iterate mostly empty cells, only occupied ones matter
+        if (last_column - first_column + 1) * (last_row - first_row + 1) > len(self.cells):
+            cells = [objects for (column, row), objects in self.cells.items()
+                     if first_column <= column <= last_column and first_row <= row <= last_row]
+        else:
+            cells = [self.cells[(column, row)]
+                     for column in range(first_column, last_column + 1)
+                     for row in range(first_row, last_row + 1)
+                     if (column, row) in self.cells]
+        for objects in cells:
+            found.update(objects)
+        return [obj for obj in found if rects_intersect(self.rects[obj], rect)]
+
+    def query_point(self, point: tuple[float, float]) -> list:
+        """
+        Method returns every object whose rectangle contains point.
+        :param point: tuple[float, float] (x, y)
+        :return: list of objects
+        """
+        cell = self.cells.get((int(point[0] // self.cell_size), int(point[1] // self.cell_size)), ())
+        return [obj for obj in cell if get_rect_distance(self.rects[obj], point) == 0]
+
+    def nearest(self,
+                point: tuple[float, float],
+                max_distance: float = math.inf,
+                condition: Callable = None) -> Hashable:
+        """
+        Method returns the object whose rectangle is closest to point. Cells are searched in growing rings around
+        point, until the ring is further away than the closest object found.
+        :param point: tuple[float, float] (x, y)
+        :param max_distance: float objects further than this are ignored
+        :param condition: Callable(object) -> bool, only objects for which it returns True are considered
+        :return: closest object or None
+        """
+        if not self.rects:
+            return None
+        column, row = int(point[0] // self.cell_size), int(point[1] // self.cell_size)
+        # Rings outside of the occupied cells or further than max_distance can not contain anything
+        first_column, first_row, last_column, last_row = self._bounds
+        max_ring = max(column - first_column, last_column - column, row - first_row, last_row - row)
+        if max_distance != math.inf:
+            max_ring = min(max_ring, int(max_distance // self.cell_size) + 1)
+        best, best_distance = None, max_distance
+        ring = 0
+        while ring <= max_ring:
+            # Closest possible distance of an object first found in this ring
+            if (ring - 1) * self.cell_size > best_distance:
+                break
+            for cell in get_ring_cells(column, row, ring):
+                for obj in self.cells.get(cell, ()):
+                    distance = get_rect_distance(self.rects[obj], point)
+                    if distance < best_distance or (best is None and distance <= best_distance):
+                        if condition is None or condition(obj):
+                            best, best_distance = obj, distance
+            ring += 1
+        return best
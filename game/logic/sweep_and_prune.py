@@ -0,0 +1,100 @@
+"""
+Module containing the SweepAndPrune class, a broadphase finding pairs of objects whose bounding rectangles overlap.
+
+Objects are kept sorted by the left edge of their rectangle. Objects move only a little between frames, so the order
+from the last frame is nearly sorted and insertion sort brings it back in order in close to linear time. A single sweep
+along the sorted order then only compares objects whose ranges on the x-axis overlap.
+"""
+
+from __future__ import annotations
+from typing import Hashable
+
+
+def get_bounding_rect(points) -> tuple[float, float, float, float]:
+    """
+    Function returns bounding rectangle (left, top, width, height) of points.
+    :param points: np.ndarray of shape (n, 2), or anything that iterates over (x, y) pairs
+    """
+    xs = [float(point[0]) for point in points]
+    ys = [float(point[1]) for point in points]
+    left, top = min(xs), min(ys)
+    return left, top, max(xs) - left, max(ys) - top
+
+
+class SweepAndPrune:
+    """
+    Sorted list of objects with (left, top, width, height) rectangles, objects have to be hashable.
+    Pairs are found when they are requested, after every object was moved for the frame.
+    """
+    def __init__(self):
+        self.objects: list[Hashable] = []  # Sorted by left edge of their rectangles after sort
+        self.rects: dict[Hashable, tuple[float, float, float, float]] = {}  # object: rect
+        self.swaps = 0  # Number of swaps done by the last sort, small when the order is coherent between frames
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def __contains__(self, obj: Hashable) -> bool:
+        return obj in self.rects
+
+    def insert(self, obj: Hashable, rect: tuple[float, float, float, float]) -> None:
+        """
+        Method adds object with its rectangle, or moves it if it was already added.
+        """
+        if obj not in self.rects:
+            self.objects.append(obj)
+        self.rects[obj] = rect
+
+    def move(self, obj: Hashable, rect: tuple[float, float, float, float]) -> None:
+        """
+        Method sets new rectangle of object, the order gets fixed on next sort.
+        """
+        if obj not in self.rects:
+            raise ValueError(f"SweepAndPrune.move: {obj} was not inserted.")
+        self.rects[obj] = rect
+
+    def remove(self, obj: Hashable) -> None:
+        if obj in self.rects:
+            del self.rects[obj]
+            self.objects.remove(obj)
+
+    def clear(self) -> None:
+        self.objects = []
+        self.rects = {}
+
+    def sort(self) -> None:
+        """
+        Method sorts objects by left edge of their rectangles with insertion sort, cheap for nearly sorted lists.
+        """
+        objects, rects = self.objects, self.rects
+        swaps = 0
+        for i in range(1, len(objects)):
+            obj = objects[i]
+            left = rects[obj][0]
+            j = i - 1
+            while j >= 0 and rects[objects[j]][0] > left:
+                objects[j + 1] = objects[j]
+                j -= 1
+                swaps += 1
+            objects[j + 1] = obj
+        self.swaps = swaps
+
+    def get_pairs(self) -> list[tuple[Hashable, Hashable]]:
+        """
+        Method returns every pair of objects whose rectangles overlap, touching edges count as overlapping.
+        :return: list[tuple] pairs of objects, the object with the smaller left edge first
+        """
+        self.sort()
+        objects, rects = self.objects, self.rects
+        pairs = []
+        for i, obj in enumerate(objects):
+            left, top, width, height = rects[obj]
+            right, bottom = left + width, top + height
+            for j in range(i + 1, len(objects)):
+                other = objects[j]
+                other_left, other_top, _, other_height = rects[other]
+                if other_left > right:
+                    break  # Every next object starts even further right
+                if other_top <= bottom and top <= other_top + other_height:
+                    pairs.append((obj, other))
+        return pairs
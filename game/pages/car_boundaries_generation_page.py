@@ -4,7 +4,8 @@ Page for generating car boundaries and tyre positions on shifted perspective vie
 
 from game.constants import SCREEN_SIZE, Paths
 from game.helpers.helpers import create_callable
-from game.helpers.file_handling import DirectoryReader, join_paths, Json
+from game.helpers.file_handling import join_paths, Json
+from game.helpers.asset_index import asset_index
 from game.pages.page import Page
 from game.gui.canvas import Canvas, SetOfPoints, Point
 from game.gui.button import Button
@@ -14,7 +15,9 @@ from game.gui.carousel import HorizontalCarousel
 from game.gui.grid import Grid
 from game.gui.image import FolderImages, ResizableImage
 
-from game.logic.car_boundries_rotation import CarBoundariesGenerator, get_relative_corner_positions, get_image_corner_positions
+from game.logic.car_boundries_rotation import (
+    CarBoundariesGenerator, get_relative_corner_positions, get_image_corner_positions, generate_all_points
+)
 
 
 half_screen = SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2
@@ -301,23 +304,14 @@ class GenerateCarBoundariesPage(Page):
         for every angle. It then saves the points to the cars config file under points: {tyres:[], boundaries: []}
         """
         if self.boundaries_generator:
-            # Get center point relative to image
-            centre_point = self.boundaries_generator.center_point.values  # Is vector
-            centre_point = [centre_point[0], self.folder_images.height - centre_point[1]]
-            positions_dictionary = {
-                "tyres": [],
-                "boundaries": [],
-                "centre": centre_point
-            }
+            positions_dictionary = generate_all_points(
+                sets=self.point_dict,
+                image_height=self.folder_images.height,
+                number_of_frames=self.folder_images.number_of_images,
+                z_angle_of_projection=self.boundaries_generator.fi
+            )
+            positions_dictionary = dict({"boundaries": []}, **positions_dictionary)  # Generated dict is cached
             self.reset()  # Reset everything
-            for i in range(self.folder_images.number_of_images):
-                if i != 0:
-                    self.current_angle -= self.angle_increment
-                points = self.boundaries_generator.generate_points_rotated_by_angle(-self.current_angle)
-                relative_to_image = self.get_relative_to_image(points)
-                for name, points in relative_to_image:
-                    if name in positions_dictionary.keys():
-                        positions_dictionary[name].append(points)
             self.status_label.text = f"Saved {len(positions_dictionary['tyres'])} tyre points " \
                                      f"and {len(positions_dictionary['boundaries'])} boundaries."
             # Save to config file of car
@@ -353,7 +347,7 @@ class CarBoundariesPage(Page):
         )
         self.carousel.not_selected_item_resize_factor = 0.4
         self.carousel.visible = False
-        car_previews = DirectoryReader.get_car_previews()
+        car_previews = asset_index.get_car_previews()
         for car in car_previews:
             cont = Container(
                 position=[0, 0],
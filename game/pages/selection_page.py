@@ -13,7 +13,7 @@ from game.gui.image import StaticImage, ResizableImage, RotatingImages
 from game.gui.grid import Grid
 from game.gui.carousel import HorizontalCarousel
 from game.gui.container import Container
-from game.helpers.file_handling import DirectoryReader
+from game.helpers.asset_index import asset_index
 
 
 half_screen = SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2
@@ -40,7 +40,7 @@ class PlayerSelectionPage(Page):
         )
         self.carousel.not_selected_item_resize_factor = 0.4
         self.carousel.visible = False
-        car_previews = DirectoryReader.get_car_previews()
+        car_previews = asset_index.get_car_previews()
         for car in car_previews:
             cont = Container(
                 position=[0, 0],
@@ -101,7 +101,8 @@ class MapSelectionPage(Page):
             spacing=30
         )
         self.carousel.visible = False
-        for i in range(8):
+        map_previews = asset_index.get_map_previews()
+        for _map in map_previews:
             cont = Container(
                 position=[0, 0],
                 size=[400, 500],
@@ -109,16 +110,16 @@ class MapSelectionPage(Page):
                 resizable=True
             )
             cont.add_item(
-                item=CustomText(text="Map: " + str(i), size=80),
+                item=CustomText(text=_map["name"], size=80),
                 relative_position=[30, 10]
             )
             cont.add_item(
                 item=ResizableImage(
-                    image_path="game/assets/maps/Mugello Dessert/preview.png"
+                    image_path=_map["image"]
                 ),
                 relative_position=[20, 100]
             )
-            self.carousel.add_item(cont, name="Mugello Dessert")  # Todo: Make for different maps
+            self.carousel.add_item(cont, name=_map["name"])
         self.add_item(self.carousel)
 
         self.scroll_left_button = Button(
@@ -0,0 +1,110 @@
+"""
+Module containing the BackgroundCache class, a pre-drawn map background slightly larger than the screen.
+
+Moving the camera only shifts the cached surface with Surface.scroll and draws the newly exposed strips from tiles,
+so most frames cost one screen sized blit instead of re-blitting every visible tile.
+"""
+
+from __future__ import annotations
+import math
+
+import pygame
+
+
+class BackgroundCache:
+    """
+    Cache of the map ground around the viewport. The cache covers the screen plus margin px on every side, it gets
+    shifted only once the view comes closer than margin / 2 to its edge and rebuilt only on jumps larger than itself.
+    """
+    def __init__(self, screen: "Surface", margin: int = 128):
+        """
+        :param screen: Surface the background gets drawn to
+        :param margin: int px of map cached around the screen on every side
+        """
+        self.screen = screen
+        self.screen_size = screen.get_size()
+        self.margin = margin
+        self.size = (self.screen_size[0] + 2 * margin, self.screen_size[1] + 2 * margin)
+        self.surface = pygame.Surface(self.size, 0, screen)
+        self.origin: list[int, int] = None  # Map position of the top left corner of surface, None if not built
+        self.background_color = (0, 0, 0)
+        # Statistics, useful for development display
+        self.rebuilds = 0
+        self.scrolls = 0
+
+    def invalidate(self) -> None:
+        """
+        Method forces the whole cache to be redrawn on next draw (used when tile images change).
+        """
+        self.origin = None
+
+    def draw_region(self, current_map: "Map", rect: pygame.Rect) -> None:
+        """
+        Method draws the map tiles intersecting rect (in cache coordinates) onto the cache surface.
+        :param current_map: Map the tiles are taken from
+        :param rect: pygame.Rect region of cache surface to redraw
+        """
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        self.surface.fill(self.background_color, rect)
+        map_rect = (self.origin[0] + rect.x, self.origin[1] + rect.y, rect.width, rect.height)
+        self.surface.set_clip(rect)
+        for i, j in current_map.get_tiles_in_rect(map_rect):
+            tile = current_map.load_tile(i, j)
+            if tile.image is not None:
+                self.surface.blit(tile.image, (tile.position[0] - self.origin[0], tile.position[1] - self.origin[1]))
+        self.surface.set_clip(None)
+
+    def rebuild(self, current_map: "Map", view: tuple[int, int]) -> None:
+        """
+        Method centers the cache on view and redraws all of it.
+        :param current_map: Map to draw
+        :param view: tuple[int, int] map position of the top left corner of screen
+        """
+        self.origin = [view[0] - self.margin, view[1] - self.margin]
+        self.draw_region(current_map, pygame.Rect((0, 0), self.size))
+        self.rebuilds += 1
+
+    def shift(self, current_map: "Map", view: tuple[int, int]) -> None:
+        """
+        Method re-centers the cache on view by scrolling the surface and drawing only the exposed strips.
+        :param current_map: Map to draw
+        :param view: tuple[int, int] map position of the top left corner of screen
+        """
+        new_origin = [view[0] - self.margin, view[1] - self.margin]
+        dx, dy = new_origin[0] - self.origin[0], new_origin[1] - self.origin[1]
+        if abs(dx) >= self.size[0] or abs(dy) >= self.size[1]:
+            self.rebuild(current_map, view)
+            return
+        self.surface.scroll(-dx, -dy)
+        self.origin = new_origin
+        width, height = self.size
+        # Exposed vertical strip (full height) and horizontal strip (without the part of vertical one)
+        if dx > 0:
+            self.draw_region(current_map, pygame.Rect(width - dx, 0, dx, height))
+        elif dx < 0:
+            self.draw_region(current_map, pygame.Rect(0, 0, -dx, height))
+        strip_x, strip_width = (0, width - dx) if dx >= 0 else (-dx, width + dx)
+        if dy > 0:
+            self.draw_region(current_map, pygame.Rect(strip_x, height - dy, strip_width, dy))
+        elif dy < 0:
+            self.draw_region(current_map, pygame.Rect(strip_x, 0, strip_width, -dy))
+        self.scrolls += 1
+
+    def draw(self, current_map: "Map", offset: list[float, float]) -> None:
+        """
+        Method draws the background of current_map on screen, updating the cache if the view left its inner area.
+        :param current_map: Map to draw
+        :param offset: list[float, float] map position of the top left corner of screen
+        """
+        view = (int(math.floor(offset[0])), int(math.floor(offset[1])))
+        if self.origin is None:
+            self.rebuild(current_map, view)
+        else:
+            # Position of view inside cache, cache gets moved once the view is closer than margin / 2 to its edge
+            x, y = view[0] - self.origin[0], view[1] - self.origin[1]
+            limit = self.margin // 2
+            if not (limit <= x <= 2 * self.margin - limit and limit <= y <= 2 * self.margin - limit):
+                self.shift(current_map, view)
+        area = pygame.Rect(view[0] - self.origin[0], view[1] - self.origin[1], *self.screen_size)
+        self.screen.blit(self.surface, (0, 0), area)
@@ -2,25 +2,87 @@
 Module for the car class and all related functions.
 """
 
-import math
+import os
 
+import numpy as np
 import pygame
 
 from game.constants import SCREEN_SIZE, Paths, join_paths
-from game.helpers.file_handling import ImageLoader, Json
+from game.helpers.file_handling import ImageLoader
+from game.helpers.config_store import config_store
+from game.helpers.asset_watcher import asset_watcher
+from game.play.game_objects.car_states import CarStates
+from game.logic.cphysics.car_model import CarModel
+from game.play.game_objects.car_spec import CarSpec, car_specs
+from game.play.game_objects.rotation_cache import RotationCache
+
+
+def state_property(name: str) -> property:
+    """
+    Function creates property reading and writing value of car in the CarStates array with name.
+    :param name: str name of array in CarStates
+    :return: property
+    """
+    def getter(self):
+        return float(getattr(self.states, name)[self.row])
+
+    def setter(self, value):
+        getattr(self.states, name)[self.row] = value
+
+    return property(getter, setter)
+
+
+def state_vector_property(name: str) -> property:
+    """
+    Function creates property returning a view of the row of car in the (n, 2) CarStates array with name, writes to
+    the view change the state. Setting it copies values into the row.
+    :param name: str name of array in CarStates
+    :return: property
+    """
+    def getter(self):
+        return getattr(self.states, name)[self.row]
+
+    def setter(self, value):
+        getattr(self.states, name)[self.row] = value
+
+    return property(getter, setter)
 
 
 class Car:
-    """@DynamicAttrs"""
-    def __init__(self, controller, current_map, car_name: str, initial_position=[0, 0]):
+    """
+    Car driven on a map, its specs are read from the CarSpec of its model shared with every other car of that model.
+    """
+    # Physics state is kept in CarStates arrays, so many cars can be stepped together
+    position = state_vector_property("position")
+    velocity_vector = state_vector_property("velocity_vector")  # Movement on map in px per second
+    angle = state_property("angle")
+    throttle = state_property("throttle")  # Number between 0 and 1
+    brake_throttle = state_property("brake_throttle")
+    steering_angle = state_property("steering_angle")
+
+    def __init__(self,
+                 controller,
+                 current_map,
+                 car_name: str,
+                 initial_position=[0, 0],
+                 states: CarStates = None,
+                 prewarm_rotations: bool = False):
+        """
+        :param controller: Controller of game
+        :param current_map: Map the car drives on
+        :param car_name: str name of car folder in assets/objects/cars/
+        :param initial_position: list[int, int] position of car on map
+        :param states: CarStates the car gets added to, shared by cars stepped together, new one if None
+        :param prewarm_rotations: bool if every rotated pose used by draw is generated while loading
+        """
         self.screen = pygame.display.get_surface()
         self.controller = controller
-        self.position = initial_position
         self.map = current_map
         # Load car data
         self.name = car_name
         self.folder = join_paths(Paths.cars, self.name)
-        self.images = ImageLoader.load_transparent_folder(join_paths(self.folder, "images"))
+        self.images_folder = join_paths(self.folder, "images")
+        self.images = ImageLoader.load_transparent_folder(self.images_folder)
         self.number_of_images = len(self.images)
         self.angle_per_image = 360 // self.number_of_images  # This is the size of angle between each image
         self.image_index = 0
@@ -35,79 +97,133 @@ class Car:
             self.screen_position[0] + self.half_image_size[0],
             self.screen_position[1] + self.half_image_size[1]
         )
-        # Load configuration and update with base configuration so there are no attributes missing
-        config = Json.load(join_paths(self.folder, "config.json"))
-        base_config = Json.load(join_paths(Paths.cars, "base_config.json"))
-        base_config.update(config)
-        self.config = base_config
-
         self.angle_leftover = 0
+        self.rotations = RotationCache(self.images)
+        if prewarm_rotations:
+            self.rotations.prewarm(self.angle_per_image)
 
-        # Pre set car data
-        self.throttle = 0  # Number between 0 and 1
-        self.brake_throttle = 0
-        self.steering_angle = 0
-        self.velocity = 0
-        self.angle = 0
+        # Every state value starts at 0
+        self.states = states if states is not None else CarStates(capacity=1)
+        self.row = self.states.add(CarModel(), initial_position, self.half_image_size)
+        self.spec: CarSpec = None  # Set from config
+        self.contact_points = np.zeros((0, 2))  # Points of boundary that were off track on last update
 
-        # Load car specs from config file as attributes
-        for key, value in self.config.items():
-            setattr(self, key, value)
+        # Load car specs compiled from config files
+        self.load_config()
 
         self.controller.development.add(self.__draw_data)
+        # Hot reloading in development
+        asset_watcher.watch(self.images_folder, self.reload_image)
+        asset_watcher.watch(join_paths(self.folder, "config.json"), self.reload_config)
+        asset_watcher.watch(join_paths(Paths.cars, "base_config.json"), self.reload_config)
+
+    def load_config(self) -> None:
+        """
+        Method loads spec of car model, compiled from the base configuration updated with the car configuration.
+        Spec is compiled only by the first car of the model, others share it.
+        """
+        self.spec = car_specs.get(self.folder, self.number_of_images)
+        self.states.set_model(self.row, self.spec.model)
+
+    def reload_config(self, path: str) -> None:
+        """
+        Method reloads configuration after one of the config files changed, an invalid config keeps the old spec.
+        :param path: str path to changed config file
+        """
+        config_store.invalidate(path)
+        try:
+            self.load_config()
+        except (ValueError, TypeError) as error:
+            print(f"Car.reload_config: {error}")
+
+    @property
+    def model(self) -> CarModel:
+        return self.spec.model
+
+    @property
+    def boundaries(self) -> "CarBoundaries":
+        """
+        Boundary polygon of every frame, collisions are tested with the centre of car only if there are none.
+        """
+        return self.spec.boundaries
+
+    def reload_image(self, path: str) -> None:
+        """
+        Method reloads a single rotation image after its file changed, images are ordered by their file names.
+        :param path: str path to changed image
+        """
+        names = sorted(os.listdir(self.images_folder))
+        name = os.path.basename(path)
+        if name in names and len(names) == self.number_of_images:
+            self.images[names.index(name)] = ImageLoader.load_transparent_image(path)
+            self.rotations.invalidate(names.index(name))
+
+    def get_center(self) -> tuple[float, float]:
+        """
+        Method returns position of the centre of car on map.
+        """
+        return self.position[0] + self.half_image_size[0], self.position[1] + self.half_image_size[1]
+
+    def get_rect(self) -> tuple[float, float, float, float]:
+        """
+        Method returns bounding rectangle (left, top, width, height) of car on map, used for the map objects index.
+        """
+        return self.position[0], self.position[1], self.image_size[0], self.image_size[1]
+
+    def get_polygon(self) -> np.ndarray:
+        """
+        Method returns boundary polygon of current frame on map, or the image rectangle if car has no boundaries.
+        :return: np.ndarray of shape (4, 2), corners in order around the polygon
+        """
+        if self.boundaries is not None:
+            return self.boundaries.get_polygon(self.image_index, self.position)
+        left, top = self.position
+        right, bottom = left + self.image_size[0], top + self.image_size[1]
+        return np.array([[left, top], [right, top], [right, bottom], [left, bottom]])
+
+    @property
+    def velocity(self) -> float:
+        """
+        Speed of car along its heading in px/s, setting it removes any sideways movement.
+        """
+        return float(self.states.get_forward_speed(self.row)[0])
+
+    @velocity.setter
+    def velocity(self, value: float) -> None:
+        self.states.set_forward_speed(self.row, value)
 
     @property
     def dt(self):
         return self.controller.dt
 
-    def update_throttle(self):
-        self.throttle = min(1, self.throttle)
-        self.brake_throttle = min(1, self.brake_throttle)
-
-    def update_velocity(self):
-        current_acceleration = self.throttle * self.acceleration * self.dt
-        self.velocity += current_acceleration * self.dt
-
-    def update_steering(self):
-        # Ackerman steering model
-        if self.steering_angle:
-            turning_radius = self.length / math.sin(math.radians(self.steering_angle))
-            angular_velocity = self.velocity / turning_radius
-        else:
-            angular_velocity = 0
-        velocity_vector = pygame.math.Vector2(self.velocity, 0).rotate(-self.angle) * self.dt
-        self.position[0] += velocity_vector.x
-        self.position[1] += velocity_vector.y
-        self.angle += math.degrees(angular_velocity) * self.dt
-
-    def update_angle(self):
-        if self.angle < 0:
-            self.angle = 360 + self.angle
-        elif self.angle > 360:
-            self.angle = self.angle - 360
-
     def update_current_image_index(self):
         self.image_index = min(int((self.angle - 90) // self.angle_per_image), self.number_of_images - 1)
         # Calculate leftover angle to 'fake' smooth rotations
         self.angle_leftover = int((self.angle - 90) % self.angle_per_image)
 
     def update_collision(self):
-        center_pos = (self.position[0] + self.half_image_size[0], self.position[1] + self.half_image_size[1])
-        val = self.map.get_mask_value(center_pos)
-        if val[0] != 255:
-            self.angle += 180
+        """
+        Method tests boundary polygon of current frame against the track and resolves the collision.
+        """
+        self.contact_points = self.boundaries.get_contact_points(
+            self.image_index,
+            self.position,
+            self.map.collision_mask
+        )
+        self.states.resolve_contacts(self.row, self.contact_points, self.map.distance_field)
 
     def update(self):
-        self.update_throttle()
-        self.update_velocity()
-        self.update_steering()
-        self.update_angle()
-        self.update_collision()
+        # Steps only this car, cars sharing states can all be stepped at once with CarStates.step
+        self.states.step(self.dt, self.row, self.map.distance_field if self.boundaries is None else None)
         self.update_current_image_index()
+        if self.boundaries is not None:
+            self.update_collision()
 
     def draw(self):
         image = self.images[self.image_index]  # Get current image
-        rotated_image = pygame.transform.rotate(image, self.angle_leftover)  # Rotate it by leftover angle
+        rotated_image = self.rotations.get(self.image_index, self.angle_leftover)  # Rotated by leftover angle
+        if self.map.zoom != 1:
+            rotated_image = pygame.transform.rotozoom(rotated_image, 0, self.map.zoom)
         new_rect = rotated_image.get_rect(center=image.get_rect(center=self.center_of_screen).center) # Get rotated rect
         self.screen.blit(rotated_image, new_rect)
 
@@ -125,14 +241,19 @@ class Car:
         vel_surface = self.controller.development.font.render(vel, True, (255, 255, 255))
         self.screen.blit(vel_surface, (30, 340))
         # Acceleration
-        acc = f"Acceleration: {self.acceleration}"
+        acc = f"Acceleration: {self.spec.get_acceleration(self.velocity):.1f} / {self.model.acceleration:.1f}"
         acc_surface = self.controller.development.font.render(acc, True, (255, 255, 255))
         self.screen.blit(acc_surface, (30, 360))
         # Steering
-        ster = f"Steering angle: {self.steering_angle}"
+        radius = self.spec.get_turning_radius(self.steering_angle)
+        ster = f"Steering angle: {self.steering_angle}, Turning radius: {radius:.0f}"
         ster_surface = self.controller.development.font.render(ster, True, (255, 255, 255))
         self.screen.blit(ster_surface, (30, 380))
         # Position
         pos = f"Position: ({int(self.position[0])}, {int(self.position[1])})"
         pos_surface = self.controller.development.font.render(pos, True, (255, 255, 255))
         self.screen.blit(pos_surface, (30, 400))
+        # Contacts
+        contacts = f"Contact points: {len(self.contact_points)}"
+        contacts_surface = self.controller.development.font.render(contacts, True, (255, 255, 255))
+        self.screen.blit(contacts_surface, (30, 420))
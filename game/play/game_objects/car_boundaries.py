@@ -0,0 +1,74 @@
+"""
+Module containing the CarBoundaries class, boundary polygons of a car for every rotation frame.
+
+Boundaries are generated by the GenerateCarBoundariesPage and saved in the cars config under points.boundaries, as
+four corners [top-left, top-right, bottom-left, bottom-right] of the rotated rectangle for each frame, relative to the
+top left corner of the frame image. They are preloaded into arrays indexed by frame, together with points sampled along
+every edge, so testing a polygon against the track costs one batched mask lookup regardless of frame.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class CarBoundaries:
+    """
+    Boundary polygons and their edge samples for every rotation frame of a car.
+    """
+    def __init__(self, corners: np.ndarray, samples_per_edge: int = 8):
+        """
+        :param corners: np.ndarray of shape (frames, 4, 2), corners of every frame in saved order
+        :param samples_per_edge: int number of points tested along each edge of polygon
+        """
+        # Saved order is top-left, top-right, bottom-left, bottom-right, polygon order walks around the rectangle
+        self.polygons = np.asarray(corners, dtype=np.float64)[:, [0, 1, 3, 2]]
+        self.number_of_frames = len(self.polygons)
+        # Points along every edge, from its first corner (included) to the next one (excluded)
+        t = np.arange(samples_per_edge) / samples_per_edge
+        starts = self.polygons
+        ends = np.roll(self.polygons, -1, axis=1)
+        samples = starts[:, :, None] + (ends - starts)[:, :, None] * t[None, None, :, None]
+        self.samples = samples.reshape(self.number_of_frames, -1, 2)  # (frames, 4 * samples_per_edge, 2)
+
+    @classmethod
+    def from_config(cls, config: dict, number_of_frames: int, samples_per_edge: int = 8) -> "CarBoundaries":
+        """
+        Method creates boundaries from car config.
+        :param config: dict car config
+        :param number_of_frames: int number of rotation images of car, boundaries have to exist for each of them
+        :param samples_per_edge: int number of points tested along each edge of polygon
+        :return: CarBoundaries or None if config has no (or not matching) boundaries
+        """
+        boundaries = config.get("points", {}).get("boundaries")
+        if not boundaries:
+            return None
+        if len(boundaries) != number_of_frames:
+            print(f"CarBoundaries: Config has boundaries for {len(boundaries)} frames, car has {number_of_frames} "
+                  f"images. Generate the boundaries again.")
+            return None
+        return cls(np.array(boundaries), samples_per_edge)
+
+    def get_polygon(self, frame: int, position: list[float, float]) -> np.ndarray:
+        """
+        Method returns boundary polygon of frame placed on map.
+        :param frame: int index of rotation frame
+        :param position: list[float, float] position of top left corner of frame image on map
+        :return: np.ndarray of shape (4, 2)
+        """
+        return self.polygons[frame] + position
+
+    def get_contact_points(self,
+                           frame: int,
+                           position: list[float, float],
+                           collision_mask: "CollisionMask") -> np.ndarray:
+        """
+        Method tests every sampled point of polygon against the collision mask at once.
+        :param frame: int index of rotation frame
+        :param position: list[float, float] position of top left corner of frame image on map
+        :param collision_mask: CollisionMask of map
+        :return: np.ndarray of shape (n, 2), points of the polygon edges that are off track
+        """
+        points = self.samples[frame] + position
+        on_track = collision_mask.test_points(points[:, 0], points[:, 1])
+        return points[~on_track]
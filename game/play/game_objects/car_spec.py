@@ -0,0 +1,198 @@
+"""
+Module containing the CarSpec class, a car config compiled into a validated object shared by every car of a model.
+
+The base config updated with the car's config is checked once when the model is loaded: values of the wrong type raise
+errors and unknown keys (typos) print a warning instead of silently becoming unused attributes. The physics model and
+boundary polygons are built at the same time and reused by every car of the model until one of its config files changes.
+The turning radius table and acceleration curve are only read by the development display, so they are computed on first
+use.
+"""
+
+from __future__ import annotations
+import math
+import os
+
+import numpy as np
+
+from game.constants import Paths, join_paths
+from game.helpers.config_store import config_store
+from game.logic.cphysics.car_model import CarModel
+from game.play.game_objects.car_boundaries import CarBoundaries
+
+
+class CarSpec:
+    """
+    Compiled configuration of a car model. Instances are shared, so they should be treated as read only.
+    """
+    REQUIRED = ("acceleration", "length", "turning_velocity", "throttle_acceleration")
+    # name: (type, default), axle positions default to None as they are measured from points.tyres or length
+    FIELDS = {
+        "acceleration": (float, None),
+        "length": (float, None),
+        "turning_velocity": (float, None),
+        "throttle_acceleration": (float, None),
+        "engine_acceleration": (float, None),
+        "braking": (float, 500),
+        "drag": (float, 0.001),
+        "rolling_resistance": (float, 0.5),
+        "cornering_stiffness": (float, 2000),
+        "grip": (float, 600),
+        "max_steering_angle": (float, 35),
+        "cg_to_front": (float, None),
+        "cg_to_rear": (float, None),
+        "track_width": (float, None),
+        "points": (dict, {}),
+    }
+    __slots__ = tuple(FIELDS) + (
+        "name",
+        "model",
+        "boundaries",
+        "turning_radii",
+        "speeds",
+        "accelerations",
+        "top_speed",
+        "speed_step",
+    )
+
+    def __init__(self, name: str, config: dict, number_of_frames: int, speed_step: float = 5):
+        """
+        :param name: str name of car model, used in error messages
+        :param config: dict base config updated with the car config
+        :param number_of_frames: int number of rotation images of car
+        :param speed_step: float px/s between samples of the acceleration curve
+        :raises ValueError: if config misses required keys or has negative values
+        :raises TypeError: if a value is not of the type of its field
+        """
+        self.name = name
+        unknown = set(config) - set(self.FIELDS)
+        if unknown:
+            print(f"CarSpec: Ignoring unknown keys {sorted(unknown)} in config of {name}.")
+        for key, (_type, default) in self.FIELDS.items():
+            if key not in config:
+                if key in self.REQUIRED:
+                    raise ValueError(f"CarSpec: Config of {name} is missing the {key} key.")
+                setattr(self, key, default)
+                continue
+            value = config[key]
+            if _type is float and isinstance(value, int) and not isinstance(value, bool):
+                value = float(value)
+            if not isinstance(value, _type) or isinstance(value, bool):
+                raise TypeError(f"CarSpec: Value under {key} in config of {name} is not of type {_type.__name__}, "
+                                f"got {value!r}.")
+            if _type is float and value < 0:
+                raise ValueError(f"CarSpec: Value under {key} in config of {name} can not be negative, got {value}.")
+            setattr(self, key, value)
+
+        self.model = CarModel.from_config(config)
+        self.boundaries = CarBoundaries.from_config(config, number_of_frames)
+        self.speed_step = speed_step
+        # Computed on first use by get_turning_radius and get_acceleration
+        self.turning_radii = None
+        self.speeds = None
+        self.accelerations = None
+        self.top_speed = None
+
+    def get_turning_radii(self) -> np.ndarray:
+        """
+        Method returns radius of the circle driven by the rear axle at every whole degree of steering angle, up to
+        max_steering_angle. Steering straight (0 degrees) has an infinite radius.
+        :return: np.ndarray[float] indexed by steering angle in degrees
+        """
+        angles = np.radians(np.arange(int(self.model.max_steering_angle) + 1))
+        with np.errstate(divide="ignore"):
+            return self.model.wheelbase / np.tan(angles)
+
+    def get_acceleration_curve(self, speed_step: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Method samples acceleration at full throttle, engine minus rolling resistance and drag, from standing still to
+        top speed, where the resistances cancel out the engine.
+        :param speed_step: float px/s between samples
+        :return: tuple (speeds, accelerations) of np.ndarray[float]
+        """
+        model = self.model
+        if model.drag > 0:
+            top_speed = (-model.rolling_resistance + math.sqrt(
+                model.rolling_resistance ** 2 + 4 * model.drag * model.acceleration)) / (2 * model.drag)
+        elif model.rolling_resistance > 0:
+            top_speed = model.acceleration / model.rolling_resistance
+        else:
+            top_speed = 0.0  # No resistance, the car never stops accelerating, the curve is flat
+        speeds = np.append(np.arange(0, top_speed, speed_step), top_speed)
+        accelerations = model.acceleration - model.rolling_resistance * speeds - model.drag * speeds ** 2
+        return speeds, np.maximum(accelerations, 0)
+
+    def get_turning_radius(self, steering_angle: float) -> float:
+        """
+        Method returns turning radius at steering angle (degrees, either direction) read from the table.
+        """
+        if self.turning_radii is None:
+            self.turning_radii = self.get_turning_radii()
+        index = min(int(round(abs(steering_angle))), len(self.turning_radii) - 1)
+        return float(self.turning_radii[index])
+
+    def get_acceleration(self, speed: float) -> float:
+        """
+        Method returns acceleration at full throttle when driving with speed (px/s), interpolated from the curve.
+        """
+        if self.speeds is None:
+            self.speeds, self.accelerations = self.get_acceleration_curve(self.speed_step)
+            self.top_speed = float(self.speeds[-1])
+        if self.top_speed == 0:
+            return self.model.acceleration
+        return float(np.interp(abs(speed), self.speeds, self.accelerations))
+
+
+class CarSpecStore:
+    """
+    Store of compiled car specs, one per car model (and number of frames). A spec is compiled again only when one of
+    the config files it was compiled from changed on disk.
+    """
+    def __init__(self):
+        self._specs: dict[tuple[str, int], tuple[tuple, CarSpec]] = {}  # (folder, frames): (mtimes, spec)
+
+    @staticmethod
+    def get_paths(folder: str) -> tuple[str, str]:
+        return join_paths(Paths.cars, "base_config.json"), join_paths(folder, "config.json")
+
+    @staticmethod
+    def _get_mtimes(paths: tuple[str, ...]) -> tuple:
+        mtimes = []
+        for path in paths:
+            try:
+                mtimes.append(os.stat(path).st_mtime)
+            except FileNotFoundError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def get(self, folder: str, number_of_frames: int) -> CarSpec:
+        """
+        Method returns spec of car model in folder, compiling it if it is not cached or its configs changed.
+        :param folder: str path to car folder
+        :param number_of_frames: int number of rotation images of car
+        :return: CarSpec
+        """
+        key = (os.path.abspath(folder), number_of_frames)
+        paths = self.get_paths(folder)
+        mtimes = self._get_mtimes(paths)
+        cached = self._specs.get(key)
+        if cached is not None and cached[0] == mtimes:
+            return cached[1]
+        config = config_store.load(paths[0]) or {}
+        config.update(config_store.load(paths[1]) or {})
+        spec = CarSpec(os.path.basename(folder), config, number_of_frames)
+        self._specs[key] = (mtimes, spec)
+        return spec
+
+    def invalidate(self, folder: str = None) -> None:
+        """
+        Method drops specs of car model in folder, or every spec if folder is None.
+        """
+        if folder is None:
+            self._specs.clear()
+            return
+        folder = os.path.abspath(folder)
+        for key in [key for key in self._specs if key[0] == folder]:
+            del self._specs[key]
+
+
+car_specs = CarSpecStore()
@@ -0,0 +1,132 @@
+"""
+Module containing the CarStates class, the physics state of many cars kept as a structure of NumPy arrays.
+
+Every car is one row of the arrays, so all cars (player, AI, ghosts) get stepped by the same few array operations
+instead of going through Python attributes of each car. Car objects are thin views onto their row.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from game.logic.cphysics.bodies import CarBodies
+from game.logic.cphysics.car_model import CarModel
+
+
+class CarStates(CarBodies):
+    """
+    Car bodies on a map, physics is done by CarBodies, collisions with the track edge are resolved after each step.
+    Positions are top left corners of car images, half_size gives their centres.
+    """
+    def __init__(self, capacity: int = 8):
+        """
+        :param capacity: int number of cars arrays get allocated for, they grow when more cars are added
+        """
+        super().__init__(capacity)
+        self.half_size = np.zeros((capacity, 2))  # Half of car image size, used to get centres of cars
+
+    def add(self, model: CarModel, position: list[float, float], half_size: tuple[int, int] = (0, 0)) -> int:
+        """
+        Method adds a car standing still with no inputs.
+        :param model: CarModel of car
+        :param position: list[float, float] initial position on map
+        :param half_size: tuple[int, int] half of car image size
+        :return: int row of car in arrays
+        """
+        row = super().add(model, position)
+        self.half_size[row] = half_size
+        return row
+
+    def get_centers(self, rows=None) -> np.ndarray:
+        """
+        Method returns centres of cars on rows, as an array of shape (n, 2).
+        """
+        rows = self.get_rows(rows)
+        return self.position[rows] + self.half_size[rows]
+
+    def step(self, dt: float, rows=None, distance_field: "DistanceField" = None) -> None:
+        """
+        Method advances cars on rows by dt seconds and resolves their collisions with the track edge.
+        :param dt: float seconds since last step
+        :param rows: None, int, slice or array of rows to step, every car if None
+        :param distance_field: DistanceField of map, no collisions are resolved if None
+        """
+        super().step(dt, rows)
+        if distance_field is not None:
+            self.resolve_collisions(self.get_rows(rows), distance_field)
+
+    def resolve_collisions(self, rows: np.ndarray, distance_field: "DistanceField") -> None:
+        """
+        Method pushes cars whose centre is off track back onto the edge and keeps only the part of their velocity
+        along the wall. Cars deep off track, where there is no wall to slide along, get turned around.
+        :param rows: np.ndarray[int] rows of cars
+        :param distance_field: DistanceField of map
+        """
+        centers = self.position[rows] + self.half_size[rows]
+        distances = distance_field.distances_at(centers[:, 0], centers[:, 1])
+        off_track = distances < 0
+        if not off_track.any():
+            return
+        rows, centers, distances = rows[off_track], centers[off_track], distances[off_track]
+        normals = distance_field.normals_at(centers[:, 0], centers[:, 1])
+        flat = ~normals.any(axis=1)
+        self.angle[rows[flat]] = np.mod(self.angle[rows[flat]] + 180, 360)
+        self.velocity_vector[rows[flat]] *= -1
+        rows, normals, distances = rows[~flat], normals[~flat], distances[~flat]
+        self.position[rows] -= normals * distances[:, None]
+        into_wall = np.einsum("ij,ij->i", self.velocity_vector[rows], normals)
+        hitting = into_wall < 0
+        rows, normals, into_wall = rows[hitting], normals[hitting], into_wall[hitting]
+        self.velocity_vector[rows] -= normals * into_wall[:, None]
+        self.angular_velocity[rows] = 0
+
+    def resolve_contacts(self, row: int, contact_points: np.ndarray, distance_field: "DistanceField") -> None:
+        """
+        Method resolves collision of car on row from the points of its boundary that are off track. The car gets
+        pushed out by the deepest contact along the averaged edge normal of contacts and keeps only the part of its
+        velocity along the wall.
+        :param row: int row of car
+        :param contact_points: np.ndarray of shape (n, 2), off track points of car boundary
+        :param distance_field: DistanceField of map
+        """
+        if len(contact_points) == 0:
+            return
+        normal = distance_field.normals_at(contact_points[:, 0], contact_points[:, 1]).sum(axis=0)
+        length = np.hypot(normal[0], normal[1])
+        if length == 0:
+            # Deep off track where the field is flat, there is no wall to slide along
+            self.angle[row] = (self.angle[row] + 180) % 360
+            self.velocity_vector[row] *= -1
+            return
+        normal /= length
+        # Field is sampled in cells, contacts found on pixels close to the edge can still read as on track
+        depth = max(-float(distance_field.distances_at(contact_points[:, 0], contact_points[:, 1]).min()), 0)
+        self.position[row] += normal * depth
+        into_wall = float(self.velocity_vector[row] @ normal)
+        if into_wall < 0:
+            self.velocity_vector[row] -= normal * into_wall
+            self.angular_velocity[row] = 0
+
+    def resolve_car_contact(self,
+                            first: int,
+                            second: int,
+                            normal: np.ndarray,
+                            depth: float,
+                            restitution: float = 0.3) -> None:
+        """
+        Method resolves collision between two cars. Cars get pushed apart by half of depth each, and if they move
+        towards each other they exchange an impulse along the normal. Forces are per unit of mass, so both cars count
+        as equally heavy.
+        :param first: int row of first car
+        :param second: int row of second car
+        :param normal: np.ndarray unit vector second car gets pushed along to leave first (see get_polygon_overlap)
+        :param depth: float px the cars overlap along normal
+        :param restitution: float part of the closing speed kept after the hit, 0 - 1
+        """
+        self.position[first] -= normal * (depth / 2)
+        self.position[second] += normal * (depth / 2)
+        closing = float((self.velocity_vector[second] - self.velocity_vector[first]) @ normal)
+        if closing < 0:
+            impulse = -(1 + restitution) * closing / 2
+            self.velocity_vector[first] -= normal * impulse
+            self.velocity_vector[second] += normal * impulse
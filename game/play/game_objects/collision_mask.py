@@ -0,0 +1,147 @@
+"""
+Module containing the CollisionMask class, the mask layer of a map compiled into one compact array.
+
+Every pixel of the map is stored as a single bit (or byte) telling if the pixel is on track (red channel of the mask
+image is 255). Points are tested in batches through NumPy indexing, so hundreds of points cost about as much as one.
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+
+import numpy as np
+import pygame
+
+
+def get_tiles_signature(paths: list[list[str]]) -> str:
+    """
+    Function creates a hash of tile paths, sizes and modification times, used for keying compiled data on disk.
+    :param paths: list[list[str]] grid of tile paths
+    :return: str hex digest
+    """
+    sha = hashlib.sha1()
+    for row in paths:
+        for path in row:
+            if path is None:
+                sha.update(b"None")
+            else:
+                stat = os.stat(path)
+                sha.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return sha.hexdigest()
+
+
+class CollisionMask:
+    """
+    Map wide collision mask. Built once at map load from the mask tiles, can be cached on disk and memory mapped so
+    even very large maps do not have to be resident.
+    """
+    def __init__(self, data: np.ndarray, size: tuple[int, int], packed: bool):
+        """
+        :param data: np.ndarray uint8 array of shape (height, width) or (height, ceil(width / 8)) if packed
+        :param size: tuple[int, int] size of map in px (width, height)
+        :param packed: bool if every byte of data holds 8 pixels
+        """
+        self.data = data
+        self.size = size
+        self.packed = packed
+
+    @classmethod
+    def compile(cls,
+                tiles: list[list],
+                tile_size: tuple[int, int],
+                packed: bool = True,
+                cache_folder: str = None,
+                memory_map: bool = False) -> "CollisionMask":
+        """
+        Method compiles mask tiles into a collision mask. Tiles passed as paths are decoded one at a time so only one
+        tile row is resident while compiling.
+        :param tiles: list[list] grid of mask tile paths or already loaded mask surfaces
+        :param tile_size: tuple[int, int] size of one tile
+        :param packed: bool if pixels are stored as bits (8x less memory) instead of bytes
+        :param cache_folder: str folder the compiled array gets saved to and loaded from on next compile, tiles have
+                             to be passed as paths
+        :param memory_map: bool if the cached array is memory mapped instead of read into memory, needs cache_folder
+        :return: CollisionMask
+        """
+        rows, columns = len(tiles), len(tiles[0])
+        width, height = columns * tile_size[0], rows * tile_size[1]
+        shape = (height, (width + 7) // 8 if packed else width)
+        cache_path = None
+        if cache_folder is not None:
+            name = f"{get_tiles_signature(tiles)}_{'bits' if packed else 'bytes'}"
+            cache_path = os.path.join(cache_folder, f".collision_mask_{name}.npy")
+            if os.path.isfile(cache_path):
+                data = np.load(cache_path, mmap_mode="r" if memory_map else None)
+                if data.shape == shape:
+                    return cls(data, (width, height), packed)
+        if cache_path is not None and memory_map:
+            data = np.lib.format.open_memmap(cache_path, mode="w+", dtype=np.uint8, shape=shape)
+        else:
+            data = np.zeros(shape, dtype=np.uint8)
+        band = np.zeros((tile_size[1], width), dtype=bool)
+        for i, row in enumerate(tiles):
+            band[:] = False
+            for j, tile in enumerate(row):
+                if tile is None:
+                    continue
+                surface = pygame.image.load(tile) if isinstance(tile, str) else tile
+                # array_red returns (width, height) array, transpose to (row, column) order
+                red = pygame.surfarray.array_red(surface).T
+                band[:red.shape[0], j * tile_size[0]:j * tile_size[0] + red.shape[1]] = red == 255
+            top = i * tile_size[1]
+            data[top:top + tile_size[1]] = np.packbits(band, axis=1) if packed else band
+        if cache_path is not None:
+            # Compiled masks of previous versions of the tiles are no longer needed
+            for name in os.listdir(cache_folder):
+                path = os.path.join(cache_folder, name)
+                if name.startswith(".collision_mask_") and path != cache_path:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass  # Still mapped by a previous mask on some platforms
+            if memory_map:
+                data.flush()
+                data = np.load(cache_path, mmap_mode="r")
+            else:
+                np.save(cache_path, data)
+        return cls(data, (width, height), packed)
+
+    def test_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Method tests many points at once, points outside of map are never on track.
+        :param xs: np.ndarray (or list) of x coordinates in px, floats get floored
+        :param ys: np.ndarray (or list) of y coordinates in px
+        :return: np.ndarray[bool] True for every point that is on track
+        """
+        xs = np.floor(np.asarray(xs, dtype=np.float64)).astype(np.int64)
+        ys = np.floor(np.asarray(ys, dtype=np.float64)).astype(np.int64)
+        inside = (xs >= 0) & (ys >= 0) & (xs < self.size[0]) & (ys < self.size[1])
+        result = np.zeros(xs.shape, dtype=bool)
+        xs, ys = xs[inside], ys[inside]
+        if self.packed:
+            result[inside] = (self.data[ys, xs >> 3] >> (7 - (xs & 7))) & 1
+        else:
+            result[inside] = self.data[ys, xs] != 0
+        return result
+
+    def test_point(self, x: float, y: float) -> bool:
+        """
+        Method tests a single point, cheaper than test_points for one point.
+        :param x: float x coordinate in px
+        :param y: float y coordinate in px
+        :return: bool True if point is on track
+        """
+        x, y = int(x // 1), int(y // 1)
+        if not (0 <= x < self.size[0] and 0 <= y < self.size[1]):
+            return False
+        if self.packed:
+            return bool((int(self.data[y, x >> 3]) >> (7 - (x & 7))) & 1)
+        return bool(self.data[y, x])
+
+    def to_array(self) -> np.ndarray:
+        """
+        Method returns the mask as an unpacked bool array of shape (height, width).
+        """
+        if self.packed:
+            return np.unpackbits(self.data, axis=1, count=self.size[0]).astype(bool)
+        return np.asarray(self.data, dtype=bool)
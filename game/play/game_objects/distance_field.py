@@ -0,0 +1,182 @@
+"""
+Module containing the DistanceField class, a signed distance field of the track boundary.
+
+The field is computed once per map from the collision mask on a grid of cells (cell_size px each), distances are
+positive on track and negative off track. Together with its gradient (which points away from the closest edge,
+towards the inside of the track) it answers "how far is the edge and in which direction" with one lookup.
+"""
+
+from __future__ import annotations
+import math
+import os
+
+import numpy as np
+
+from game.play.game_objects.collision_mask import get_tiles_signature
+
+
+def get_axis_distances(features: np.ndarray, limit: int) -> np.ndarray:
+    """
+    Function returns distance (in cells) of every cell to the closest feature cell in the same row.
+    :param features: np.ndarray[bool] of shape (rows, columns), True for feature cells
+    :param limit: int distances are clamped to this value
+    :return: np.ndarray float32 of shape (rows, columns)
+    """
+    rows, columns = features.shape
+    index = np.broadcast_to(np.arange(columns), features.shape)
+    # Index of the last feature on the left and the first feature on the right of every cell
+    left = np.maximum.accumulate(np.where(features, index, -limit - columns), axis=1)
+    right = np.minimum.accumulate(np.where(features, index, limit + 2 * columns)[:, ::-1], axis=1)[:, ::-1]
+    return np.minimum(np.minimum(index - left, right - index), limit).astype(np.float32)
+
+
+def get_distances(features: np.ndarray, limit: int) -> np.ndarray:
+    """
+    Function returns euclidean distance (in cells) of every cell to the closest feature cell, clamped to limit.
+    Row distances are combined over every vertical shift within limit, each shift is one array operation.
+    :param features: np.ndarray[bool] of shape (rows, columns), True for feature cells
+    :param limit: int distances are clamped to this value
+    :return: np.ndarray float32 of shape (rows, columns)
+    """
+    rows_squared = get_axis_distances(features, limit) ** 2
+    distances = rows_squared.copy()
+    padded = np.pad(rows_squared, ((limit, limit), (0, 0)), constant_values=limit ** 2)
+    rows = features.shape[0]
+    for shift in range(1, limit + 1):
+        shift_squared = shift ** 2
+        np.minimum(distances, padded[limit - shift:limit - shift + rows] + shift_squared, out=distances)
+        np.minimum(distances, padded[limit + shift:limit + shift + rows] + shift_squared, out=distances)
+    return np.minimum(np.sqrt(distances), limit)
+
+
+class DistanceField:
+    """
+    Signed distance field of a map. Distances and their gradient are stored per cell, queries take the cell the
+    position lies in (distances are interpolated between neighbouring cells).
+    """
+    def __init__(self, distances: np.ndarray, gradient: np.ndarray, cell_size: int, size: tuple[int, int]):
+        """
+        :param distances: np.ndarray float32 of shape (rows, columns), signed distance in px of every cell centre
+        :param gradient: np.ndarray float32 of shape (2, rows, columns), x and y derivative of distances
+        :param cell_size: int size of one cell in px
+        :param size: tuple[int, int] size of map in px (width, height)
+        """
+        self.distances = distances
+        self.gradient = gradient
+        self.cell_size = cell_size
+        self.size = size
+        self.shape = distances.shape
+
+    @classmethod
+    def compute(cls,
+                collision_mask: "CollisionMask",
+                cell_size: int = 4,
+                max_distance: int = 256,
+                mask_paths: list[list[str]] = None,
+                cache_folder: str = None) -> "DistanceField":
+        """
+        Method computes distance field of the collision mask, sampling the mask in the centre of every cell.
+        :param collision_mask: CollisionMask of map
+        :param cell_size: int size of one cell in px, bigger cells are faster to compute and use less memory
+        :param max_distance: int distances get clamped to this many px, the cost of computing grows with it
+        :param mask_paths: list[list[str]] grid of mask tile paths, used for keying the cache
+        :param cache_folder: str folder the field gets saved to and loaded from, needs mask_paths
+        :return: DistanceField
+        """
+        width, height = collision_mask.size
+        shape = (math.ceil(height / cell_size), math.ceil(width / cell_size))
+        cache_path = None
+        if cache_folder is not None and mask_paths is not None:
+            name = f"{get_tiles_signature(mask_paths)}_{cell_size}_{max_distance}"
+            cache_path = os.path.join(cache_folder, f".distance_field_{name}.npy")
+            if os.path.isfile(cache_path):
+                data = np.load(cache_path)
+                if data.shape == (3,) + shape:
+                    return cls(data[0], data[1:], cell_size, (width, height))
+        xs = np.arange(shape[1]) * cell_size + cell_size // 2
+        ys = np.arange(shape[0]) * cell_size + cell_size // 2
+        on_track = collision_mask.test_points(*np.meshgrid(xs, ys))
+        limit = max(1, math.ceil(max_distance / cell_size))
+        # Border of off track cells, so edges of map count as track edges as well
+        padded = np.pad(on_track, 1, constant_values=False)
+        # The edge lies half way between an on track cell and the neighbouring off track one
+        inside = get_distances(~padded, limit)[1:-1, 1:-1] - 0.5
+        outside = get_distances(padded, limit)[1:-1, 1:-1] - 0.5
+        distances = (np.where(on_track, inside, -outside) * cell_size).astype(np.float32)
+        gradient_y, gradient_x = np.gradient(distances, cell_size)
+        gradient = np.stack((gradient_x, gradient_y)).astype(np.float32)
+        if cache_path is not None:
+            # Fields of previous versions of the tiles are no longer needed
+            for name in os.listdir(cache_folder):
+                if name.startswith(".distance_field_"):
+                    try:
+                        os.remove(os.path.join(cache_folder, name))
+                    except OSError:
+                        pass  # Locked or already removed, it only takes up space
+            np.save(cache_path, np.concatenate((distances[None], gradient)))
+        return cls(distances, gradient, cell_size, (width, height))
+
+    def get_cell(self, x: float, y: float) -> tuple[int, int]:
+        """
+        Method returns (row, column) of cell containing position, positions outside of map get the closest cell.
+        """
+        return (min(max(int(y // self.cell_size), 0), self.shape[0] - 1),
+                min(max(int(x // self.cell_size), 0), self.shape[1] - 1))
+
+    def distance(self, x: float, y: float) -> float:
+        """
+        Method returns signed distance of position to the closest track edge, bilinearly interpolated.
+        :param x: float x coordinate in px
+        :param y: float y coordinate in px
+        :return: float distance in px, positive on track and negative off track
+        """
+        # Cell centres are the sample points, interpolate between the four surrounding ones
+        fx = min(max(x / self.cell_size - 0.5, 0), self.shape[1] - 1)
+        fy = min(max(y / self.cell_size - 0.5, 0), self.shape[0] - 1)
+        column, row = min(int(fx), self.shape[1] - 2), min(int(fy), self.shape[0] - 2)
+        if column < 0 or row < 0:  # Field a single cell wide or high
+            return float(self.distances[self.get_cell(x, y)])
+        tx, ty = fx - column, fy - row
+        d = self.distances
+        top = d[row, column] * (1 - tx) + d[row, column + 1] * tx
+        bottom = d[row + 1, column] * (1 - tx) + d[row + 1, column + 1] * tx
+        return float(top * (1 - ty) + bottom * ty)
+
+    def distances_at(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Method returns signed distances of many positions at once, taken from the cells they lie in.
+        :param xs: np.ndarray of x coordinates in px
+        :param ys: np.ndarray of y coordinates in px
+        :return: np.ndarray float32 distances in px
+        """
+        rows = np.clip(np.asarray(ys) // self.cell_size, 0, self.shape[0] - 1).astype(np.int64)
+        columns = np.clip(np.asarray(xs) // self.cell_size, 0, self.shape[1] - 1).astype(np.int64)
+        return self.distances[rows, columns]
+
+    def normals_at(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Method returns normals (see normal) of many positions at once.
+        :param xs: np.ndarray of x coordinates in px
+        :param ys: np.ndarray of y coordinates in px
+        :return: np.ndarray float64 of shape (n, 2), rows of zeros where the field is flat
+        """
+        rows = np.clip(np.asarray(ys) // self.cell_size, 0, self.shape[0] - 1).astype(np.int64)
+        columns = np.clip(np.asarray(xs) // self.cell_size, 0, self.shape[1] - 1).astype(np.int64)
+        gradient = self.gradient[:, rows, columns].T.astype(np.float64)
+        lengths = np.hypot(gradient[:, 0], gradient[:, 1])
+        return np.divide(gradient, lengths[:, None], out=np.zeros_like(gradient), where=lengths[:, None] > 0)
+
+    def normal(self, x: float, y: float) -> tuple[float, float]:
+        """
+        Method returns unit vector pointing away from the closest edge, on track that is towards the inside of the
+        track and off track back towards the track.
+        :param x: float x coordinate in px
+        :param y: float y coordinate in px
+        :return: tuple[float, float] normal, (0, 0) where the field is flat
+        """
+        row, column = self.get_cell(x, y)
+        gx, gy = float(self.gradient[0, row, column]), float(self.gradient[1, row, column])
+        length = math.hypot(gx, gy)
+        if length == 0:
+            return 0.0, 0.0
+        return gx / length, gy / length
@@ -0,0 +1,234 @@
+"""
+Module for recording and replaying ghost cars.
+
+A recording holds the pose (time, x, y, angle, image index) of a car on every tick as float32 samples. Samples are
+written in zlib compressed chunks, each chunk starts with absolute values so it is a keyframe, and an index of chunks
+(time range, offset and size in file) is written at the end of the file. Readers load only the index and decompress
+the chunk containing the requested time, so recordings can be streamed and seeked without loading all of them.
+
+File layout:
+    MAGIC | chunk 0 | chunk 1 | ... | index (INDEX_ENTRY per chunk) | FOOTER (index offset, number of chunks) | MAGIC
+"""
+
+from __future__ import annotations
+import bisect
+import os
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+import pygame
+
+from game.play.game_objects.rotation_cache import RotationCache
+
+
+MAGIC = b"DRUVERGHOST1"
+INDEX_ENTRY = struct.Struct("<ddQQI")  # start time, end time, offset, compressed size, number of samples
+FOOTER = struct.Struct("<QI")  # index offset, number of chunks
+SAMPLE_FIELDS = 5  # time, x, y, angle, image index
+
+
+class GhostWriter:
+    """
+    Writes samples into a temporary file chunk by chunk while recording, the file replaces path only on save.
+    """
+    def __init__(self, chunk_size: int = 600, folder: str = None):
+        """
+        :param chunk_size: int number of samples in one chunk, 600 is 10 s at 60 ticks per second
+        :param folder: str folder temporary recordings get created in, it has to be on the same file system as the
+                       paths recordings get saved to, so saving only renames the file
+        """
+        self.chunk_size = chunk_size
+        self.folder = folder
+        self.buffer = np.zeros((chunk_size, SAMPLE_FIELDS), dtype=np.float32)
+        self.count = 0  # Samples in buffer
+        self.index: list[tuple] = []
+        self._file = None
+        self._path = None
+        self.remove_stale_recordings()
+
+    def remove_stale_recordings(self) -> None:
+        """
+        Method removes temporary recordings left in folder by runs that never got to discard them (crashes).
+        """
+        if self.folder is None or not os.path.isdir(self.folder):
+            return
+        for name in os.listdir(self.folder):
+            if name.startswith(".recording_") and name.endswith(".ghost"):
+                try:
+                    os.remove(os.path.join(self.folder, name))
+                except OSError:
+                    pass  # Locked or already removed
+
+    def _open(self) -> None:
+        if self.folder is not None:
+            os.makedirs(self.folder, exist_ok=True)
+        descriptor, self._path = tempfile.mkstemp(prefix=".recording_", suffix=".ghost", dir=self.folder)
+        self._file = os.fdopen(descriptor, "wb")
+        self._file.write(MAGIC)
+
+    def record(self, time: float, x: float, y: float, angle: float, image_index: int) -> None:
+        """
+        Method adds one sample, full chunks get compressed and written right away.
+        """
+        if self._file is None:
+            self._open()
+        self.buffer[self.count] = (time, x, y, angle, image_index)
+        self.count += 1
+        if self.count == self.chunk_size:
+            self._write_chunk()
+
+    def _write_chunk(self) -> None:
+        if self.count == 0:
+            return
+        samples = self.buffer[:self.count]
+        data = zlib.compress(samples.tobytes(), 6)
+        self.index.append((float(samples[0, 0]), float(samples[-1, 0]), self._file.tell(), len(data), self.count))
+        self._file.write(data)
+        self.count = 0
+
+    def save(self, path: str) -> None:
+        """
+        Method writes remaining samples and the index, then moves recording to path. Writer can record again after.
+        :param path: str path of ghost file
+        """
+        if self._file is None:
+            return
+        self._write_chunk()
+        index_offset = self._file.tell()
+        for entry in self.index:
+            self._file.write(INDEX_ENTRY.pack(*entry))
+        self._file.write(FOOTER.pack(index_offset, len(self.index)))
+        self._file.write(MAGIC)
+        self._file.close()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self._path, path)
+        self._file, self._path = None, None
+        self.index = []
+
+    def discard(self) -> None:
+        """
+        Method drops current recording and removes its temporary file.
+        """
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+        self._file, self._path = None, None
+        self.count = 0
+        self.index = []
+
+
+class GhostReader:
+    """
+    Reads poses from a ghost file, keeping only the index and the last decompressed chunk in memory.
+    """
+    def __init__(self, path: str):
+        """
+        :param path: str path of ghost file
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._file.seek(-(FOOTER.size + len(MAGIC)), os.SEEK_END)
+        footer = self._file.read(FOOTER.size + len(MAGIC))
+        if footer[FOOTER.size:] != MAGIC:
+            self._file.close()
+            raise ValueError(f"GhostReader: {path} is not a ghost recording.")
+        index_offset, number_of_chunks = FOOTER.unpack(footer[:FOOTER.size])
+        self._file.seek(index_offset)
+        data = self._file.read(INDEX_ENTRY.size * number_of_chunks)
+        self.index = [INDEX_ENTRY.unpack_from(data, i * INDEX_ENTRY.size) for i in range(number_of_chunks)]
+        self.start_times = [entry[0] for entry in self.index]
+        self.duration = self.index[-1][1] if self.index else 0
+        self._chunk_number = None
+        self._chunk: np.ndarray = None
+
+    def load_chunk(self, number: int) -> np.ndarray:
+        """
+        Method returns samples of chunk, decompressing it only if it is not the current one.
+        """
+        if number != self._chunk_number:
+            _, _, offset, size, count = self.index[number]
+            self._file.seek(offset)
+            samples = np.frombuffer(zlib.decompress(self._file.read(size)), dtype=np.float32)
+            self._chunk = samples.reshape(count, SAMPLE_FIELDS)
+            self._chunk_number = number
+        return self._chunk
+
+    def get_pose(self, time: float) -> tuple[float, float, float, int]:
+        """
+        Method returns pose at time, interpolated between the two closest samples.
+        :param time: float seconds since start of recording
+        :return: tuple (x, y, angle, image index) or None if time is outside of recording
+        """
+        if not self.index or time < self.start_times[0] or time > self.duration:
+            return None
+        number = bisect.bisect_right(self.start_times, time) - 1
+        samples = self.load_chunk(number)
+        i = int(np.searchsorted(samples[:, 0], time, side="right"))
+        if i >= len(samples):
+            # Between last sample of this chunk and first of the next one
+            if number + 1 >= len(self.index):
+                return tuple(samples[-1, 1:4].tolist()) + (int(samples[-1, 4]),)
+            previous, following = samples[-1], self.load_chunk(number + 1)[0]
+        else:
+            previous, following = samples[max(i - 1, 0)], samples[i]
+        span = following[0] - previous[0]
+        t = 0.0 if span <= 0 else min(max((time - previous[0]) / span, 0), 1)
+        x = previous[1] + (following[1] - previous[1]) * t
+        y = previous[2] + (following[2] - previous[2]) * t
+        # Shortest way around the circle
+        turn = (following[3] - previous[3] + 180) % 360 - 180
+        angle = (previous[3] + turn * t) % 360
+        image_index = previous[4] if t < 0.5 else following[4]
+        return float(x), float(y), float(angle), int(image_index)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class GhostCar:
+    """
+    Translucent car drawn at poses read from a ghost recording.
+    """
+    def __init__(self, car: "Car", reader: GhostReader, alpha: int = 110):
+        """
+        :param car: Car the ghost uses images of and gets drawn relative to
+        :param reader: GhostReader of recording
+        :param alpha: int transparency of ghost, 0 - 255
+        """
+        self.car = car
+        self.reader = reader
+        self.screen = pygame.display.get_surface()
+        images = []
+        for image in car.images:
+            image = image.copy()
+            image.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+            images.append(image)
+        self.rotations = RotationCache(images)
+        self.pose = None
+
+    def update(self, time: float) -> None:
+        """
+        Method moves ghost to its pose at time.
+        :param time: float seconds since start of recorded lap
+        """
+        self.pose = self.reader.get_pose(time)
+
+    def draw(self) -> None:
+        if self.pose is None:
+            return
+        x, y, angle, image_index = self.pose
+        car = self.car
+        leftover = int((angle - 90) % car.angle_per_image)
+        image = self.rotations.get(image_index, leftover)
+        # Player car is drawn on car.screen_position, ghost is moved from it by the difference of positions
+        zoom = car.map.zoom
+        if zoom != 1:
+            image = pygame.transform.rotozoom(image, 0, zoom)
+        center = (car.center_of_screen[0] + (x - car.position[0]) * zoom,
+                  car.center_of_screen[1] + (y - car.position[1]) * zoom)
+        self.screen.blit(image, image.get_rect(center=center))
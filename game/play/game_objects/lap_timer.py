@@ -0,0 +1,247 @@
+"""
+Module containing checkpoints and the LapTimer class used for timing laps and sectors.
+
+Checkpoints of a map are saved in checkpoints.json in its folder:
+    {
+        "start": [[x1, y1], [x2, y2]],  // start / finish line
+        "checkpoints": [[[x1, y1], [x2, y2]], ...]  // lines in driving order, each one ends a sector
+    }
+Lines are crossed in driving direction from the left to the right side of [x1, y1] -> [x2, y2] as seen on screen (y-axis
+pointing down). Crossing a line backwards takes back its crossing, so driving back and forth over a line never counts.
+Best times are saved per car in lap_times.json in the map folder.
+"""
+
+from __future__ import annotations
+import os
+from typing import Callable
+
+from game.constants import join_paths
+from game.helpers.config_store import config_store
+
+
+def get_orientation(a: tuple[float, float], b: tuple[float, float], c: tuple[float, float]) -> float:
+    """
+    Function returns cross product of vectors ab and ac, positive if c lies left of ab, negative if right, 0 if
+    the points are collinear.
+    """
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def segments_intersect(p1: tuple[float, float],
+                       p2: tuple[float, float],
+                       q1: tuple[float, float],
+                       q2: tuple[float, float]) -> bool:
+    """
+    Function checks if segment p1p2 intersects segment q1q2. Touching the q segment with p2 counts as crossing, touching
+    it with p1 does not, so a point moving over a line in steps crosses it exactly once.
+    """
+    d1 = get_orientation(q1, q2, p1)
+    d2 = get_orientation(q1, q2, p2)
+    d3 = get_orientation(p1, p2, q1)
+    d4 = get_orientation(p1, p2, q2)
+    # p1 strictly on one side of q, p2 on the other side or on q, q1 and q2 not on the same side of p
+    if d1 == 0 or (d2 != 0 and (d1 > 0) == (d2 > 0)):
+        return False
+    return d3 * d4 <= 0
+
+
+class Checkpoint:
+    """
+    Line on map the cars have to cross, index 0 is the start / finish line.
+    """
+    def __init__(self, index: int, start: tuple[float, float], end: tuple[float, float]):
+        """
+        :param index: int position of checkpoint in driving order
+        :param start: tuple[float, float] first point of line on map
+        :param end: tuple[float, float] second point of line on map
+        """
+        self.index = index
+        self.start = tuple(start)
+        self.end = tuple(end)
+        left, top = min(start[0], end[0]), min(start[1], end[1])
+        self.rect = (left, top, max(start[0], end[0]) - left, max(start[1], end[1]) - top)
+
+    def get_crossing(self, previous: tuple[float, float], current: tuple[float, float]) -> int:
+        """
+        Method checks if movement from previous to current position crossed the checkpoint line.
+        :return: int 1 if crossed in driving direction (from left to right of start -> end on screen), -1 if crossed
+                 backwards, 0 if not crossed
+        """
+        if not segments_intersect(previous, current, self.start, self.end):
+            return 0
+        # Previous is strictly on one side, y-axis points down so negative orientation is left of the line on screen
+        return 1 if get_orientation(self.start, self.end, previous) < 0 else -1
+
+
+def load_checkpoints(folder_path: str) -> list[Checkpoint]:
+    """
+    Function loads checkpoints of map from checkpoints.json in its folder.
+    :param folder_path: str path to map folder
+    :return: list[Checkpoint] start / finish line followed by checkpoints, empty if the map has no checkpoints
+    """
+    path = join_paths(folder_path, "checkpoints.json")
+    if not os.path.isfile(path):
+        return []
+    start = config_store.get_list(path, "start")
+    if start is None:
+        print(f"load_checkpoints: Missing start line in:\n    {path}")
+        return []
+    lines = [start] + config_store.get_list(path, "checkpoints", [])
+    return [Checkpoint(index, line[0], line[1]) for index, line in enumerate(lines)]
+
+
+def format_time(seconds: float) -> str:
+    """
+    Function formats time as m:ss.mmm, None is formatted as dashes.
+    """
+    if seconds is None:
+        return "-:--.---"
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes)}:{seconds:06.3f}"
+
+
+class LapTimer:
+    """
+    Times laps of one car. The first lap starts when the car crosses the start line, checkpoints have to be crossed
+    in order, crossing the finish line after every checkpoint completes the lap. Each checkpoint ends a sector.
+    Crossing the last crossed checkpoint backwards takes it back.
+    Only checkpoints near the car get tested, they are found through the map objects index.
+    """
+    def __init__(self,
+                 checkpoints: list[Checkpoint],
+                 folder_path: str = None,
+                 car_name: str = None,
+                 on_lap: Callable = None,
+                 on_abandon: Callable = None):
+        """
+        :param checkpoints: list[Checkpoint] start / finish line followed by checkpoints
+        :param folder_path: str path to map folder where best times get saved, None to not save them
+        :param car_name: str name of car, times are saved per car
+        :param on_lap: Callable(lap_time) called every time a lap is completed
+        :param on_abandon: Callable() called when the car drives back over the start line, the lap gets abandoned
+        """
+        self.checkpoints = checkpoints
+        self.car_name = car_name
+        self.on_lap = on_lap
+        self.on_abandon = on_abandon
+        self.times_path = join_paths(folder_path, "lap_times.json") if folder_path is not None else None
+        self.running = False
+        self.lap_time = 0.0
+        self.sectors: list[float] = []  # Finished sector times of current lap
+        self.next_checkpoint = 0
+        self.laps = 0
+        self.last_lap: float = None
+        self.best_lap: float = None
+        self.best_sectors: list[float] = None
+        self.load_best_times()
+
+    @property
+    def sector_time(self) -> float:
+        return self.lap_time - sum(self.sectors)
+
+    def load_best_times(self) -> None:
+        """
+        Method loads saved best times of car on this map.
+        """
+        if self.times_path is None or not os.path.isfile(self.times_path):
+            return
+        times = config_store.get_dict(self.times_path, self.car_name, {})
+        self.best_lap = times.get("best_lap")
+        self.best_sectors = times.get("best_sectors")
+
+    def save_best_times(self) -> None:
+        """
+        Method saves best times of car, the write happens in the background.
+        """
+        if self.times_path is None:
+            return
+        data = config_store.load(self.times_path) if os.path.isfile(self.times_path) else {}
+        data[self.car_name] = {"best_lap": self.best_lap, "best_sectors": self.best_sectors}
+        config_store.save(self.times_path, data)
+
+    def cross(self, index: int, direction: int = 1) -> None:
+        """
+        Method handles car crossing checkpoint with index, checkpoints crossed out of order are ignored.
+        :param index: int index of crossed checkpoint
+        :param direction: int 1 if crossed in driving direction, -1 if crossed backwards
+        """
+        if direction < 0:
+            self.uncross(index)
+            return
+        if index != self.next_checkpoint:
+            return
+        if index != 0:
+            self.sectors.append(self.sector_time)
+        elif self.running:
+            self.complete_lap()
+        else:
+            self.running = True
+            self.lap_time = 0.0
+        self.next_checkpoint = (index + 1) % len(self.checkpoints)
+
+    def uncross(self, index: int) -> None:
+        """
+        Method takes back crossing of the last crossed checkpoint, when the car drives back over it. Driving back
+        over the start line abandons the lap, the next crossing in driving direction starts a new one.
+        :param index: int index of checkpoint crossed backwards
+        """
+        if not self.running or index != (self.next_checkpoint - 1) % len(self.checkpoints):
+            return
+        self.next_checkpoint = index
+        if index != 0:
+            self.sectors.pop()
+            return
+        self.running = False
+        self.lap_time = 0.0
+        self.sectors = []
+        if self.on_abandon is not None:
+            self.on_abandon()
+
+    def complete_lap(self) -> None:
+        self.sectors.append(self.sector_time)
+        self.last_lap = self.lap_time
+        self.laps += 1
+        if self.best_lap is None or self.lap_time < self.best_lap:
+            self.best_lap = self.lap_time
+            self.best_sectors = self.sectors
+            self.save_best_times()
+        if self.on_lap is not None:
+            self.on_lap(self.lap_time)
+        self.lap_time = 0.0
+        self.sectors = []
+
+    def update(self,
+               dt: float,
+               previous: tuple[float, float],
+               current: tuple[float, float],
+               objects: "SpatialHash") -> None:
+        """
+        Method advances lap time and tests checkpoints near the car for crossing.
+        :param dt: float seconds since last update
+        :param previous: tuple[float, float] position of car on previous update
+        :param current: tuple[float, float] current position of car
+        :param objects: SpatialHash index containing checkpoints
+        """
+        if not self.checkpoints:
+            return
+        if self.running:
+            self.lap_time += dt
+        left, top = min(previous[0], current[0]), min(previous[1], current[1])
+        movement = (left, top, max(previous[0], current[0]) - left, max(previous[1], current[1]) - top)
+        for obj in objects.query_rect(movement):
+            if isinstance(obj, Checkpoint):
+                direction = obj.get_crossing(previous, current)
+                if direction != 0:
+                    self.cross(obj.index, direction)
+
+    def get_hud_lines(self) -> list[str]:
+        """
+        Method returns lines of text describing current times, displayed by the HUD.
+        """
+        lines = [f"Lap {self.laps + 1}: {format_time(self.lap_time if self.running else None)}",
+                 f"Last: {format_time(self.last_lap)}",
+                 f"Best: {format_time(self.best_lap)}"]
+        sectors = " | ".join(format_time(sector) for sector in self.sectors)
+        if sectors:
+            lines.append(f"Sectors: {sectors}")
+        return lines
@@ -5,23 +5,48 @@ Module containing different maps.
 from __future__ import annotations
 from typing import Callable
 import math
+import os
 import time
 
 import pygame
 
-from game.constants import Paths, join_paths, SCREEN_SIZE
-from game.helpers.file_handling import DirectoryReader, ImageLoader
+from game.constants import Paths, join_paths, SCREEN_SIZE, MAP_STREAMING, MAP_STREAM_RADIUS, MAP_COMPRESSED_TILES
+from game.helpers.file_handling import DirectoryReader, ImageLoader, get_indexes_from_string
+from game.helpers.asset_index import get_image_size
+from game.play.game_objects.tile_cache import TileStreamer
+from game.play.game_objects.collision_mask import CollisionMask
+from game.play.game_objects.distance_field import DistanceField
+from game.play.game_objects.background_cache import BackgroundCache
+from game.play.game_objects.tile_pyramid import TilePyramid
+from game.play.game_objects.minimap_generator import load_or_generate_minimap
+from game.helpers.asset_watcher import asset_watcher
+from game.logic.spatial_hash import SpatialHash
+from game.play.game_objects.lap_timer import Checkpoint, load_checkpoints
 
 
-def get_indexes(position: list[int], divisor: list[int]) -> list[int, int]:
+ZOOM_STEPS_PER_LEVEL = 4  # Steps of zoom_by between two pyramid levels
+
+
+def get_tiles_in_rect(rect: tuple[float, float, float, float],
+                      tile_size: tuple[int, int],
+                      number_of_tiles: list[int, int]) -> list[list[int, int]]:
     """
-    Function calculates integer division of point and a divisor vector.
-    Ex. position = point, divisor = tile size => indexes [i, j] of tile in grid where the point lies.
-    :param position: list[int, int] position as list
-    :param divisor: list[int, int] divisor pair where [xd, yd] xd is divisor on x axis, yd on y axis
-    :return: list[int, int] indexes [i, j]
+    Function returns indexes of every tile intersecting rect, for any tile size. Indexes are clipped to the map so
+    rectangles reaching over map edges only return existing tiles, every tile is returned once.
+    :param rect: tuple[float, float, float, float] (left, top, width, height) of rectangle on map in px
+    :param tile_size: tuple[int, int] size of one tile
+    :param number_of_tiles: list[int, int] number of tile rows and columns
+    :return: list[list[int, int]] indexes [i, j] of tiles, row by row
     """
-    return [position[1] // divisor[1], position[0] // divisor[0]]
+    left, top, width, height = rect
+    if width <= 0 or height <= 0:
+        return []
+    # Right and bottom edges are exclusive, a rect ending exactly on a tile edge does not touch the next tile
+    first_column = max(0, int(math.floor(left / tile_size[0])))
+    last_column = min(number_of_tiles[1] - 1, int(math.ceil((left + width) / tile_size[0])) - 1)
+    first_row = max(0, int(math.floor(top / tile_size[1])))
+    last_row = min(number_of_tiles[0] - 1, int(math.ceil((top + height) / tile_size[1])) - 1)
+    return [[i, j] for i in range(first_row, last_row + 1) for j in range(first_column, last_column + 1)]
 
 
 class MiniMap:
@@ -33,17 +58,20 @@ class MiniMap:
     def __init__(self,
                  image,
                  position: list[int, int],
-                 map_size: list[int, int]):
+                 map_size: list[int, int],
+                 overlay=None):
         """
         :param image: Loaded Image of minimap
         :param position: Position of minimap on screen
         :param player_position: Players position on map
         :param map_size: Size of map in px
+        :param overlay: Loaded Image drawn over the minimap image (track boundaries), same size as image
         """
         self.screen = pygame.display.get_surface()
         # Grab images and size data
         # TODO: Add player image on minimap
         self.image = image
+        self.overlay = overlay
         self.image_size = image.get_size()
         self.map_size = map_size
         # Ratio of image_size to map_size, used with multiplication to get player minimap position
@@ -76,6 +104,8 @@ class MiniMap:
         """
         # Draw image
         self.screen.blit(self.image, self.position)
+        if self.overlay is not None:
+            self.screen.blit(self.overlay, self.position)
         # Draw player as circle, TODO: Draw player as passed image
         player_pos = [self.position[0] + self.player_minimap_position[0],
                       self.position[1] + self.player_minimap_position[1]]
@@ -128,10 +158,30 @@ class Map:
         map_size: Size of map in px
         offset: Offset to move map (based on player)
     """
-    def __init__(self, controller, folder_name: str):
+    def __init__(self,
+                 controller,
+                 folder_name: str,
+                 streaming: bool = MAP_STREAMING,
+                 stream_radius: int = MAP_STREAM_RADIUS,
+                 max_resident_tiles: int = None,
+                 cache_background: bool = True,
+                 pyramid_levels: int = 3,
+                 build_pyramid: bool = False,
+                 compressed_tiles: bool = MAP_COMPRESSED_TILES):
         """
         :param game: Current game object
         :param folder_name: Name of map folder saved in assets/maps/
+        :param streaming: bool if only tiles near the viewport are kept in memory, instead of loading every tile
+        :param stream_radius: int number of tiles around the visible ones kept resident when streaming
+        :param max_resident_tiles: int maximum number of tiles kept resident when streaming, tiles within the radius are
+                                   never evicted, defaults to the number of tiles within radius plus a prefetch margin
+        :param cache_background: bool if the ground is drawn through a scrolled background cache instead of blitting
+                                 every visible tile each frame
+        :param pyramid_levels: int number of downscaled tile levels (1/2, 1/4, ...) used when zoomed out
+        :param build_pyramid: bool if every level of every tile is generated at load instead of on first use, ignored
+                              when streaming
+        :param compressed_tiles: bool if ground tile files are kept compressed in memory and decoded only within the
+                                 stream radius, turns on streaming
         """
         self.controller = controller
         self.screen = pygame.display.get_surface()
@@ -148,8 +198,30 @@ class Map:
         self.number_of_tiles = None
         self.map_size = None
         self.offset = [0, 0]
+        self._zoom = 1.0  # Scale of map on screen, values under 1 zoom out, set through zoom or zoom_by
+        # Movement of the viewport in px per second (set by player), used for prefetching tiles when streaming
+        self.velocity = [0, 0]
+        self.prefetch_time = 1.0  # Seconds of movement ahead of viewport that get prefetched
         # Currently visible tiles
         self.visible_tiles = [[0, 0], [0, 1], [1, 0], [1, 1]]
+        # Streaming
+        self.streaming = streaming or compressed_tiles
+        self.compressed_tiles = compressed_tiles
+        self.stream_radius = stream_radius
+        self.max_resident_tiles = max_resident_tiles
+        self.ground_streamer: TileStreamer = None
+        self.mask_streamer: TileStreamer = None
+        # Whole map mask compiled into one array, used for collision tests
+        self.collision_mask: CollisionMask = None
+        self._mask_tiles = None  # Paths (when streaming) or surfaces of mask tiles the collision mask is compiled from
+        # Signed distance to the track edge, used for collision response and distance to edge queries
+        self.distance_field: DistanceField = None
+        self.background_cache = BackgroundCache(self.screen) if cache_background else None
+        self.pyramid = TilePyramid(pyramid_levels)
+        self.build_pyramid = build_pyramid
+        # Objects on map (cars, checkpoints, props, ...) indexed by their bounding rectangles
+        self.objects = SpatialHash()
+        self.checkpoints: list[Checkpoint] = []  # Start / finish line followed by checkpoints in driving order
         # Load minimap and create object, load after map loading so map size is set
         self.minimap = None
 
@@ -158,10 +230,16 @@ class Map:
         Method returns total number of times the update method will get called while loading map.
         :return: int Number of images
         """
+        if self.streaming:
+            # Only tile names get checked, once for each image + 2 times before
+            num = ImageLoader.get_number_of_files(self.ground_folder_path) + 2
+            num += ImageLoader.get_number_of_files(self.mask_folder_path) + 2
+            num += 5  # Calls in load method, including preloading of tiles around the viewport
+            return num
         # Multiply by 2 as ImageLoade.load_tiles_from_folder calls update method twice for each image + 3 times around
         num = ImageLoader.get_number_of_files(self.ground_folder_path) * 2 + 3
         num += ImageLoader.get_number_of_files(self.mask_folder_path) * 2 + 3
-        num += 2  # Calls in load method
+        num += 4  # Calls in load method
         return num
 
     def load(self, update_method: Callable) -> None:
@@ -171,27 +249,41 @@ class Map:
                               progress iteration
         """
         start_time = time.time()
-        # Loads every image in a grid
-        ground_images = ImageLoader.load_tiles_from_folder(
-            self.ground_folder_path,
-            update_method=update_method,
-            currently_loading="Map tiles"
-        )
-        mask_images = ImageLoader.load_tiles_from_folder(
-            self.mask_folder_path,
-            update_method=update_method,
-            currently_loading="Mask tiles"
-        )
+        if self.streaming:
+            ground_images = ImageLoader.get_tile_paths_from_folder(
+                self.ground_folder_path,
+                update_method=update_method,
+                currently_loading="Map tiles"
+            )
+            mask_images = ImageLoader.get_tile_paths_from_folder(
+                self.mask_folder_path,
+                update_method=update_method,
+                currently_loading="Mask tiles"
+            )
+            self.tile_size = tuple(get_image_size(ground_images[0][0]))
+        else:
+            # Loads every image in a grid
+            ground_images = ImageLoader.load_tiles_from_folder(
+                self.ground_folder_path,
+                update_method=update_method,
+                currently_loading="Map tiles"
+            )
+            mask_images = ImageLoader.load_tiles_from_folder(
+                self.mask_folder_path,
+                update_method=update_method,
+                currently_loading="Mask tiles"
+            )
+            self.tile_size = ground_images[0][0].get_size()  # Get size of one image
         self.tiles = []
-        self.tile_size = ground_images[0][0].get_size()  # Get size of one image
         update_method("Map setting tiles")
         current_position = [0, 0]
         for i in range(len(ground_images)):
             self.tiles.append([])
             current_position[0] = 0
             for j in range(len(ground_images[i])):
-                image = ground_images[i][j]
-                mask_image = mask_images[i][j]
+                # When streaming images get set once tiles are loaded
+                image = None if self.streaming else ground_images[i][j]
+                mask_image = None if self.streaming else mask_images[i][j]
                 # Initializing Tile position by passing current_position, does not work as the initialized position
                 # takes the last assigned value of current_position.
                 self.tiles[i].append(
@@ -207,75 +299,348 @@ class Map:
             current_position[1] += self.tile_size[1]
         self.map_size = (current_position[0], current_position[1])
         self.number_of_tiles = [len(self.tiles), len(self.tiles[0])]
+        if self.build_pyramid and not self.streaming:
+            update_method("Building zoom levels")
+            for i, row in enumerate(self.tiles):
+                for j, tile in enumerate(row):
+                    if tile.image is not None:
+                        self.pyramid.build((i, j), tile.image)
+        update_method("Compiling collision mask")
+        self._mask_tiles = mask_images
+        self.compile_collision_mask()
+        update_method("Computing distance field")
+        self.compute_distance_field()
+        if self.streaming:
+            update_method("Loading tiles around viewport")
+            self.start_streaming(ground_images, mask_images)
         update_method("Loading minimap")
         self.load_minimap()
+        self.checkpoints = load_checkpoints(self.folder_path)
+        for checkpoint in self.checkpoints:
+            self.objects.insert(checkpoint, checkpoint.rect)
+        asset_watcher.watch(self.ground_folder_path, self.reload_tile)
+        asset_watcher.watch(self.mask_folder_path, self.reload_tile)
         print(f"Map loading took: {time.time() - start_time}s")
 
     def load_minimap(self) -> None:
         """
-        Method loads minimap into self object.
+        Method loads minimap into self object. A hand made minimap.png in the map folder is used if it exists,
+        otherwise the minimap is generated from tiles (or loaded from the generated cache in the map folder).
         """
-        minimap_image = ImageLoader.load_transparent_image(join_paths(self.folder_path, "minimap.png"))
+        minimap_path = join_paths(self.folder_path, "minimap.png")
+        overlay = None
+        if os.path.isfile(minimap_path):
+            minimap_image = ImageLoader.load_transparent_image(minimap_path)
+        else:
+            ground_paths = ImageLoader.get_tile_paths_from_folder(self.ground_folder_path)
+            mask_paths = ImageLoader.get_tile_paths_from_folder(self.mask_folder_path)
+            # Loaded tiles get downsampled directly, streamed ones get decoded from their paths
+            ground_tiles = ground_paths if self.streaming else [[tile.image for tile in row] for row in self.tiles]
+            minimap_image, overlay = load_or_generate_minimap(
+                self.folder_path,
+                ground_paths,
+                mask_paths,
+                ground_tiles,
+                self.collision_mask,
+                self.tile_size
+            )
         self.minimap = MiniMap(
             image=minimap_image,
             position=[10, 575],
-            map_size=self.map_size
+            map_size=self.map_size,
+            overlay=overlay
         )
 
-    def update_visible_tiles_indexes(self) -> None:
+    def compile_collision_mask(self) -> None:
         """
-        Method updates all currently visible tiles.
+        Method compiles mask tiles into the map wide collision mask. When streaming, the compiled mask is cached in
+        the map folder and memory mapped, so it does not have to be resident.
         """
-        # Empty list, and create temporary list
-        self.visible_tiles, visible_tiles = [], []
-        # Corners
-        top_left = get_indexes(
-            [int(self.offset[0] - self.half_screen_width), int(self.offset[1] - self.half_screen_height)],
-            self.tile_size
-        )
-        top_right = get_indexes(
-            [int(self.offset[0] + self.half_screen_width), int(self.offset[1] - self.half_screen_height)],
-            self.tile_size
+        self.collision_mask = CollisionMask.compile(
+            self._mask_tiles,
+            self.tile_size,
+            packed=True,
+            cache_folder=self.folder_path if self.streaming else None,
+            memory_map=self.streaming
         )
-        bottom_right = get_indexes(
-            [int(self.offset[0] - self.half_screen_width), int(self.offset[1] + self.half_screen_height)],
-            self.tile_size
+
+    def compute_distance_field(self) -> None:
+        """
+        Method computes the distance field from the collision mask, it is cached in the map folder.
+        """
+        self.distance_field = DistanceField.compute(
+            self.collision_mask,
+            mask_paths=ImageLoader.get_tile_paths_from_folder(self.mask_folder_path),
+            cache_folder=self.folder_path
         )
-        bottom_left = get_indexes(
-            [int(self.offset[0] + self.half_screen_width), int(self.offset[1] + self.half_screen_height)],
-            self.tile_size
+
+    def start_streaming(self, ground_paths: list[list[str]], mask_paths: list[list[str]]) -> None:
+        """
+        Method creates tile streamers and synchronously loads tiles within stream radius of the current viewport.
+        :param ground_paths: list[list[str]] grid of ground tile paths
+        :param mask_paths: list[list[str]] grid of mask tile paths
+        """
+        if self.max_resident_tiles is None:
+            # Tiles covering the screen (+1 as the screen is rarely aligned with tiles) and the ring around them
+            columns = math.ceil(self.screen_size[0] / self.tile_size[0]) + 1 + 2 * self.stream_radius
+            rows = math.ceil(self.screen_size[1] / self.tile_size[1]) + 1 + 2 * self.stream_radius
+            self.max_resident_tiles = rows * columns + max(rows, columns)  # Margin for tiles prefetched ahead
+        self.ground_streamer = TileStreamer(
+            ground_paths,
+            capacity=self.max_resident_tiles,
+            in_memory=self.compressed_tiles
         )
-        # Create list
-        visible_tiles += [top_left, top_right, bottom_right, bottom_left]
-        for indexes in visible_tiles:
-            i, j = indexes[0], indexes[1]
-            if 0 <= i <= len(self.tiles) - 1:
-                if 0 <= j <= len(self.tiles[i]) - 1:
-                    self.visible_tiles.append(indexes)
+        self.mask_streamer = TileStreamer(mask_paths, capacity=self.max_resident_tiles)
+        self.update_visible_tiles_indexes()
+        for i, j in self.get_tiles_around(self.visible_tiles, self.stream_radius):
+            self.load_tile(i, j)
+
+    def get_tiles_around(self, indexes: list[list[int]], radius: int) -> list[tuple[int, int]]:
+        """
+        Method returns indexes of tiles in the bounding range of passed indexes, extended by radius tiles on each side
+        and clipped to map.
+        :param indexes: list[list[int, int]] indexes of tiles
+        :param radius: int number of tiles to extend range by
+        :return: list[tuple[int, int]] indexes of tiles
+        """
+        if not indexes:
+            return []
+        rows = [index[0] for index in indexes]
+        columns = [index[1] for index in indexes]
+        top, bottom = max(0, min(rows) - radius), min(self.number_of_tiles[0] - 1, max(rows) + radius)
+        left, right = max(0, min(columns) - radius), min(self.number_of_tiles[1] - 1, max(columns) + radius)
+        return [(i, j) for i in range(top, bottom + 1) for j in range(left, right + 1)]
+
+    def load_tile(self, i: int, j: int) -> "Tile":
+        """
+        Method makes sure tile on indexes has its ground image set, when streaming a missing image gets loaded
+        synchronously. Mask images are left to load_mask_tile, so drawing never decodes mask tiles.
+        :param i: int row index of tile
+        :param j: int column index of tile
+        :return: Tile
+        """
+        tile = self.tiles[i][j]
+        if self.streaming and tile.image is None:
+            tile.image = self.ground_streamer.get((i, j))
+        return tile
+
+    def load_mask_tile(self, i: int, j: int) -> "Tile":
+        """
+        Method makes sure tile on indexes has its mask image set, when streaming a missing image gets loaded
+        synchronously.
+        :param i: int row index of tile
+        :param j: int column index of tile
+        :return: Tile
+        """
+        tile = self.tiles[i][j]
+        if self.streaming and tile.mask_image is None:
+            tile.mask_image = self.mask_streamer.get((i, j))
+        return tile
+
+    def update_streaming(self) -> None:
+        """
+        Method collects prefetched tiles, loads visible ones, prefetches tiles around the viewport and ahead of it in
+        the direction of movement and evicts far tiles.
+        """
+        self.collect_streamed_tiles()
+        # Visible tiles have to be drawn this frame
+        for i, j in self.visible_tiles:
+            self.load_tile(i, j)
+        keep = self.get_tiles_around(self.visible_tiles, self.stream_radius)
+        # Tiles the viewport will cover in prefetch_time seconds are fetched first
+        ahead_offset = [self.offset[0] + self.velocity[0] * self.prefetch_time,
+                        self.offset[1] + self.velocity[1] * self.prefetch_time]
+        ahead = self.get_tiles_around(self.get_visible_tiles_indexes(ahead_offset), 0)
+        # Mask tiles are not prefetched, collisions use the collision mask, they only get loaded by load_mask_tile
+        for indexes in ahead + keep:
+            self.ground_streamer.prefetch(indexes)
+        self.collect_streamed_tiles()
+        keep = set(keep + ahead)
+        for i, j in self.ground_streamer.evict(keep):
+            self.tiles[i][j].image = None
+            self.pyramid.invalidate((i, j))
+        for i, j in self.mask_streamer.evict(keep):
+            self.tiles[i][j].mask_image = None
+
+    def collect_streamed_tiles(self) -> None:
+        """
+        Method attaches tiles finished by the background prefetch to their Tile objects.
+        """
+        for i, j in self.ground_streamer.collect():
+            self.tiles[i][j].image = self.ground_streamer.get((i, j))
+        for i, j in self.mask_streamer.collect():
+            self.tiles[i][j].mask_image = self.mask_streamer.get((i, j))
+
+    def close(self) -> None:
+        """
+        Method stops background threads of tile streamers, called when leaving the map.
+        """
+        if self.ground_streamer is not None:
+            self.ground_streamer.close()
+        if self.mask_streamer is not None:
+            self.mask_streamer.close()
+
+    def reload_tile(self, path: str) -> None:
+        """
+        Method reloads a single ground or mask tile image after its file changed (hot reloading in development).
+        :param path: str path to changed tile image, named ij.format
+        """
+        i, j = get_indexes_from_string(os.path.basename(path).split(".")[0])[:2]
+        if i is None or j is None or not os.path.isfile(path):
+            return
+        if not (0 <= i < len(self.tiles) and 0 <= j < len(self.tiles[i])):
+            return
+        self.pyramid.invalidate((i, j))
+        if self.streaming:
+            # Dropped tiles get loaded again with the changed image once they are needed
+            self.tiles[i][j].image, self.tiles[i][j].mask_image = None, None
+            self.ground_streamer.invalidate((i, j))
+            self.mask_streamer.invalidate((i, j))
+        elif os.path.dirname(path) == self.mask_folder_path:
+            self.tiles[i][j].mask_image = ImageLoader.load_image(path)
+            self._mask_tiles[i][j] = self.tiles[i][j].mask_image
+        else:
+            self.tiles[i][j].image = ImageLoader.load_image(path)
+        if os.path.dirname(path) == self.mask_folder_path:
+            self.compile_collision_mask()
+            self.compute_distance_field()
+        elif self.background_cache:
+            self.background_cache.invalidate()
+        self.load_minimap()
+
+    def update_visible_tiles_indexes(self) -> None:
+        """
+        Method updates all currently visible tiles.
+        """
+        self.visible_tiles = self.get_visible_tiles_indexes(self.offset)
+
+    @property
+    def zoom(self) -> float:
+        return self._zoom
+
+    @zoom.setter
+    def zoom(self, zoom: float) -> None:
+        """
+        Property setter clamps zoom between the scale of the smallest pyramid level and the native scale.
+        """
+        self._zoom = min(1.0, max(self.pyramid.get_scale(self.pyramid.levels), float(zoom)))
+
+    def zoom_by(self, steps: int) -> None:
+        """
+        Method zooms in (positive steps) or out (negative steps), four steps halve or double the zoom so every
+        pyramid level is hit exactly.
+        :param steps: int number of steps, ex. mouse wheel movement
+        """
+        self.zoom = 2 ** ((round(math.log2(self.zoom) * ZOOM_STEPS_PER_LEVEL) + steps) / ZOOM_STEPS_PER_LEVEL)
+
+    def get_visible_tiles_indexes(self, offset: list[int, int]) -> list[list[int, int]]:
+        """
+        Method returns indexes of tiles visible when the screen is centered on offset at the current zoom.
+        :param offset: list[int, int] position on map in the centre of screen
+        :return: list[list[int, int]] indexes [i, j] of visible tiles
+        """
+        return self.get_tiles_in_rect(self.get_view_rect(offset))
+
+    def get_tiles_in_rect(self, rect: tuple[float, float, float, float]) -> list[list[int, int]]:
+        """
+        Method returns indexes of tiles intersecting rect on map, see get_tiles_in_rect function.
+        :param rect: tuple[float, float, float, float] (left, top, width, height) in map px
+        :return: list[list[int, int]] indexes [i, j] of tiles
+        """
+        return get_tiles_in_rect(rect, self.tile_size, self.number_of_tiles)
+
+    def get_view_rect(self, offset: list[int, int]) -> tuple[float, float, float, float]:
+        """
+        Method returns the part of map covered by the screen centered on offset at the current zoom.
+        :param offset: list[int, int] position on map in the centre of screen
+        :return: tuple[float, float, float, float] (left, top, width, height) in map px
+        """
+        width, height = self.screen_size[0] / self.zoom, self.screen_size[1] / self.zoom
+        return offset[0] - width / 2, offset[1] - height / 2, width, height
+
+    def is_on_track(self, position: list[int, int]) -> bool:
+        """
+        Method checks if position on map is on track.
+        :param position: list[int, int] position on map in px
+        :return: bool
+        """
+        return self.collision_mask.test_point(position[0], position[1])
+
+    def are_on_track(self, xs: "ndarray", ys: "ndarray") -> "ndarray":
+        """
+        Method checks many positions on map at once, see CollisionMask.test_points.
+        :param xs: ndarray of x coordinates in px
+        :param ys: ndarray of y coordinates in px
+        :return: ndarray[bool] True for every position that is on track
+        """
+        return self.collision_mask.test_points(xs, ys)
+
+    def get_distance_to_edge(self, position: list[float, float]) -> float:
+        """
+        Method returns signed distance of position to the closest track edge, see DistanceField.distance.
+        :param position: list[float, float] position on map in px
+        :return: float distance in px, positive on track and negative off track
+        """
+        return self.distance_field.distance(position[0], position[1])
+
+    def get_edge_normal(self, position: list[float, float]) -> tuple[float, float]:
+        """
+        Method returns unit vector pointing from the closest track edge towards the inside of the track.
+        :param position: list[float, float] position on map in px
+        :return: tuple[float, float]
+        """
+        return self.distance_field.normal(position[0], position[1])
 
     def get_mask_value(self, position: list[int, int]) -> tuple:
         j = int(position[0] // self.tile_size[0])
         i = int(position[1] // self.tile_size[1])
         pos_x = int(position[0] % self.tile_size[0])
         pos_y = int(position[1] % self.tile_size[1])
-        return self.tiles[i][j].mask_image.get_at((pos_x, pos_y))
+        return self.load_mask_tile(i, j).mask_image.get_at((pos_x, pos_y))
 
     def update(self) -> None:
         """
         Method updates tiles. (And currently also the offset)
         """
         self.update_visible_tiles_indexes()
+        if self.streaming:
+            self.update_streaming()
         # Update minimap player map position
         self.minimap.update(self.offset)
 
+    def draw_zoomed(self) -> None:
+        """
+        Method draws currently visible tiles scaled by zoom, images are taken from the closest pyramid level.
+        Edges of tiles are rounded on the zoomed map, and the map is moved by whole px, so neighbouring tiles share
+        their edges and keep their sizes while the view moves.
+        """
+        left, top, _, _ = self.get_view_rect(self.offset)
+        zoom = self.zoom
+        origin_x, origin_y = round(-left * zoom), round(-top * zoom)  # Screen position of the map corner
+        for i, j in self.visible_tiles:
+            tile = self.load_tile(i, j)
+            if tile.image is None:
+                continue
+            x, y = tile.position
+            first_x, first_y = math.floor(x * zoom), math.floor(y * zoom)
+            size = (math.floor((x + tile.image.get_width()) * zoom) - first_x,
+                    math.floor((y + tile.image.get_height()) * zoom) - first_y)
+            image = self.pyramid.get_zoomed((i, j), zoom, tile.image, size)
+            self.screen.blit(image, (origin_x + first_x, origin_y + first_y))
+
     def draw(self) -> None:
         """
         Method draws currently visible tiles on screen based on offset.
         """
         # Draw tiles on calculated positions, move them by offset and half screen size
         offset = [self.offset[0] - self.half_screen_width, self.offset[1] - self.half_screen_height]
-        for indexes in self.visible_tiles:
-            i, j = indexes[0], indexes[1]
-            self.tiles[i][j].draw(offset)
+        if self.zoom != 1:
+            self.draw_zoomed()
+        elif self.background_cache:
+            self.background_cache.draw(self, offset)
+        else:
+            for indexes in self.visible_tiles:
+                i, j = indexes[0], indexes[1]
+                self.tiles[i][j].draw(offset)
         # Draw minimap
         self.minimap.draw()
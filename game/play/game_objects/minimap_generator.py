@@ -0,0 +1,133 @@
+"""
+Module for generating minimap images from map tiles.
+
+Ground tiles get downsampled with block averages (vectorized through surfarray), pixels off track get darkened and
+made translucent using the collision mask, and an overlay with the track boundaries gets pre-rendered. Both images
+are cached in the map folder, keyed by the paths, sizes and modification times of the tile files, so they are only
+generated when tiles change.
+"""
+
+from __future__ import annotations
+import hashlib
+import math
+import os
+
+import numpy as np
+import pygame
+
+from game.play.game_objects.collision_mask import get_tiles_signature
+
+
+MINIMAP_MAX_SIZE = (240, 135)  # Fits in the bottom left corner of screen, under the development display
+BOUNDARY_COLOR = (255, 255, 255)
+
+
+def get_tiles_hash(paths: list[list[str]], *extra) -> str:
+    """
+    Function creates a hash of the signatures (path, size, modification time) of every tile file and any extra values,
+    without reading the files.
+    :param paths: list[list[str]] grid of tile paths
+    :param extra: values (sizes, settings) that change the generated output
+    :return: str hex digest
+    """
+    return hashlib.sha1(f"{get_tiles_signature(paths)}{extra!r}".encode()).hexdigest()
+
+
+def downsample_tile(surface: "Surface", factor: int, cell: tuple[int, int]) -> np.ndarray:
+    """
+    Function averages factor x factor pixel blocks of surface, pixels not filling a whole block are cropped.
+    :param surface: Surface tile image
+    :param factor: int size of averaged block
+    :param cell: tuple[int, int] size of the downsampled tile (tile size // factor)
+    :return: np.ndarray uint8 of shape (cell[0], cell[1], 3), x-major as surfarray
+    """
+    pixels = pygame.surfarray.array3d(surface)[:cell[0] * factor, :cell[1] * factor]
+    blocks = pixels.reshape(cell[0], factor, cell[1], factor, 3)
+    return blocks.mean(axis=(1, 3)).astype(np.uint8)
+
+
+def generate_minimap(ground_tiles: list[list],
+                     collision_mask: "CollisionMask",
+                     tile_size: tuple[int, int],
+                     max_size: tuple[int, int] = MINIMAP_MAX_SIZE) -> tuple["Surface", "Surface"]:
+    """
+    Function generates minimap image and boundaries overlay from ground tiles.
+    :param ground_tiles: list[list] grid of ground tile paths or loaded surfaces
+    :param collision_mask: CollisionMask of map, None for no tinting and no overlay
+    :param tile_size: tuple[int, int] size of one tile
+    :param max_size: tuple[int, int] maximum size of minimap
+    :return: tuple[Surface, Surface] minimap image and overlay (transparent except the track boundaries)
+    """
+    rows, columns = len(ground_tiles), len(ground_tiles[0])
+    map_size = (columns * tile_size[0], rows * tile_size[1])
+    factor = max(1, math.ceil(max(map_size[0] / max_size[0], map_size[1] / max_size[1])))
+    cell = (max(1, tile_size[0] // factor), max(1, tile_size[1] // factor))
+    size = (columns * cell[0], rows * cell[1])
+    pixels = np.zeros((size[0], size[1], 3), dtype=np.uint8)
+    for i, row in enumerate(ground_tiles):
+        for j, tile in enumerate(row):
+            if tile is None:
+                continue
+            surface = pygame.image.load(tile) if isinstance(tile, str) else tile
+            pixels[j * cell[0]:(j + 1) * cell[0], i * cell[1]:(i + 1) * cell[1]] = downsample_tile(surface, factor, cell)
+    alpha = np.full(size, 255, dtype=np.uint8)
+    boundaries = np.zeros(size, dtype=bool)
+    if collision_mask is not None:
+        # Map position of the centre of every minimap pixel's block, same cropping as downsample_tile
+        x = np.arange(size[0])
+        y = np.arange(size[1])
+        map_x = (x // cell[0]) * tile_size[0] + (x % cell[0]) * factor + factor // 2
+        map_y = (y // cell[1]) * tile_size[1] + (y % cell[1]) * factor + factor // 2
+        xs, ys = np.meshgrid(map_x, map_y, indexing="ij")
+        on_track = collision_mask.test_points(xs, ys)
+        pixels[~on_track] = (pixels[~on_track] * 0.45).astype(np.uint8)
+        alpha[~on_track] = 160
+        # Boundary pixels are on track with at least one of their 4 neighbours off track
+        padded = np.pad(on_track, 1, mode="edge")
+        neighbours_on_track = padded[:-2, 1:-1] & padded[2:, 1:-1] & padded[1:-1, :-2] & padded[1:-1, 2:]
+        boundaries = on_track & ~neighbours_on_track
+    image = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.surfarray.blit_array(image, pixels)
+    pygame.surfarray.pixels_alpha(image)[:] = alpha
+    overlay = pygame.Surface(size, pygame.SRCALPHA)
+    overlay_pixels = np.zeros((size[0], size[1], 3), dtype=np.uint8)
+    overlay_pixels[boundaries] = BOUNDARY_COLOR
+    pygame.surfarray.blit_array(overlay, overlay_pixels)
+    pygame.surfarray.pixels_alpha(overlay)[:] = np.where(boundaries, 255, 0).astype(np.uint8)
+    return image, overlay
+
+
+def load_or_generate_minimap(folder_path: str,
+                             ground_paths: list[list[str]],
+                             mask_paths: list[list[str]],
+                             ground_tiles: list[list],
+                             collision_mask: "CollisionMask",
+                             tile_size: tuple[int, int],
+                             max_size: tuple[int, int] = MINIMAP_MAX_SIZE) -> tuple["Surface", "Surface"]:
+    """
+    Function loads cached minimap and overlay from map folder, generating (and caching) them if tiles changed.
+    :param folder_path: str path to map folder, the cache gets saved here
+    :param ground_paths: list[list[str]] grid of ground tile paths, used for the cache key
+    :param mask_paths: list[list[str]] grid of mask tile paths, used for the cache key
+    :param ground_tiles: list[list] grid of ground tile paths or loaded surfaces, used for generating
+    :param collision_mask: CollisionMask of map
+    :param tile_size: tuple[int, int] size of one tile
+    :param max_size: tuple[int, int] maximum size of minimap
+    :return: tuple[Surface, Surface] minimap image and boundaries overlay
+    """
+    key = get_tiles_hash(ground_paths + mask_paths, tuple(tile_size), tuple(max_size))
+    image_path = os.path.join(folder_path, f".minimap_{key}.png")
+    overlay_path = os.path.join(folder_path, f".minimap_overlay_{key}.png")
+    if os.path.isfile(image_path) and os.path.isfile(overlay_path):
+        return pygame.image.load(image_path).convert_alpha(), pygame.image.load(overlay_path).convert_alpha()
+    image, overlay = generate_minimap(ground_tiles, collision_mask, tile_size, max_size)
+    # Minimaps of previous versions of the tiles are no longer needed
+    for name in os.listdir(folder_path):
+        if name.startswith(".minimap_"):
+            try:
+                os.remove(os.path.join(folder_path, name))
+            except OSError:
+                pass  # Already removed or locked, it only takes up space
+    pygame.image.save(image, image_path)
+    pygame.image.save(overlay, overlay_path)
+    return image.convert_alpha(), overlay.convert_alpha()
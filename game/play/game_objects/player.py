@@ -41,20 +41,20 @@ class Player:
 
     def read_input(self):
         if self.controller.key_pressed["right"]:
-            self.car.steering_angle -= self.car.turning_velocity * self.car.dt
+            self.car.steering_angle -= self.car.spec.turning_velocity * self.car.dt
         elif self.controller.key_pressed["left"]:
-            self.car.steering_angle += self.car.turning_velocity * self.car.dt
+            self.car.steering_angle += self.car.spec.turning_velocity * self.car.dt
         else:
             self.car.steering_angle = 0
 
         if self.controller.key_pressed["up"]:
-            self.car.throttle += self.car.throttle_acceleration * self.car.dt
+            self.car.throttle += self.car.spec.throttle_acceleration * self.car.dt
         else:
             self.car.throttle = 0
         if self.controller.key_pressed["down"]:
-            self.car.break_throttle += self.car.throttle_acceleration * self.car.dt
+            self.car.brake_throttle += self.car.spec.throttle_acceleration * self.car.dt
         else:
-            self.car.break_throttle = 0
+            self.car.brake_throttle = 0
 
     def update(self):
         # Read input data
@@ -62,6 +62,7 @@ class Player:
         self.car.update()
         # Update map position at end
         self.map.offset = self.car.position
+        self.map.velocity = self.car.velocity_vector
 
     def draw(self):
         self.car.draw()
@@ -0,0 +1,75 @@
+"""
+Module containing the RotationCache class, rotated versions of car frames reused between draws.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+
+import pygame
+
+
+class RotationCache:
+    """
+    Lazily populated cache of frame images rotated by a leftover angle, keyed by (frame index, quantized angle).
+    Surfaces are kept in least recently used order, the oldest ones get dropped once their total size exceeds budget.
+    """
+    def __init__(self, images: list["Surface"], budget: int = 32 * 1024 * 1024, step: float = 1):
+        """
+        :param images: list[Surface] rotation frames of car
+        :param budget: int maximum number of bytes held by cached surfaces
+        :param step: float angles are rounded to multiples of step degrees, 1 matches the integer leftover angles
+        """
+        self.images = images
+        self.budget = budget
+        self.step = step
+        self.surfaces: OrderedDict[tuple[int, int], "Surface"] = OrderedDict()  # (frame, quantized angle): surface
+        self.size = 0  # Bytes held by cached surfaces
+        # Statistics, useful for development display
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_surface_size(surface: "Surface") -> int:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def get(self, frame: int, angle: float) -> "Surface":
+        """
+        Method returns frame image rotated by angle, rotating it only the first time the pose is needed.
+        :param frame: int index of frame image
+        :param angle: float leftover angle in degrees
+        :return: Surface
+        """
+        key = (frame, round(angle / self.step))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = pygame.transform.rotate(self.images[frame], key[1] * self.step)
+        self.surfaces[key] = surface
+        self.size += self.get_surface_size(surface)
+        while self.size > self.budget and len(self.surfaces) > 1:
+            _, dropped = self.surfaces.popitem(last=False)
+            self.size -= self.get_surface_size(dropped)
+        return surface
+
+    def prewarm(self, max_angle: float) -> None:
+        """
+        Method rotates every frame by every quantized angle in [0, max_angle), stops once the budget is full.
+        :param max_angle: float angle between two frames, leftover angles are always smaller
+        """
+        angles = int(max_angle / self.step + 0.5)
+        for frame in range(len(self.images)):
+            for i in range(angles):
+                if self.size + self.get_surface_size(self.images[frame]) * 2 > self.budget:
+                    return
+                self.get(frame, i * self.step)
+
+    def invalidate(self, frame: int = None) -> None:
+        """
+        Method drops cached rotations of frame (or of every frame if None), used when frame images change.
+        :param frame: int index of frame image
+        """
+        for key in [key for key in self.surfaces if frame is None or key[0] == frame]:
+            self.size -= self.get_surface_size(self.surfaces.pop(key))
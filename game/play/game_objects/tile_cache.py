@@ -0,0 +1,175 @@
+"""
+Module containing the TileStreamer class used by streaming maps, which keep only tiles near the viewport in memory.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor, Future
+
+import pygame
+
+
+def decode_tile(path: str) -> "Surface":
+    """
+    Function decodes tile image on path, safe to call from a worker thread as the surface does not get converted.
+    :param path: str path to tile image
+    :return: Surface in the files pixel format
+    """
+    return pygame.image.load(path)
+
+
+def read_blob(path: str) -> bytes:
+    """
+    Function reads the still compressed (encoded) contents of tile image file.
+    :param path: str path to tile image
+    :return: bytes
+    """
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def decode_blob(blob: bytes, path: str) -> "Surface":
+    """
+    Function decodes tile image from bytes read by read_blob, safe to call from a worker thread.
+    :param blob: bytes encoded image
+    :param path: str path the blob was read from, its extension tells the image format
+    :return: Surface in the files pixel format
+    """
+    return pygame.image.load(io.BytesIO(blob), os.path.basename(path))
+
+
+class TileStreamer:
+    """
+    Loads tile images on demand and keeps the most recently used ones resident. Prefetched tiles are decoded on a
+    background thread and converted to the display format on the main thread once they are collected.
+    Each loaded tile is stored in a least recently used order, tiles over capacity get evicted from the back.
+    With in_memory set, the encoded files of all tiles are read up front and kept as compressed blobs, so tiles get
+    decoded from memory instead of disk and only the small set of decoded tiles costs full 32-bit surfaces.
+    """
+    def __init__(self, paths: list[list[str]], capacity: int = 16, convert: bool = True, in_memory: bool = False):
+        """
+        :param paths: list[list[str]] grid of tile image paths
+        :param capacity: int maximum number of resident tiles, tiles requested as needed are never evicted
+        :param convert: bool if loaded surfaces get converted to the display pixel format
+        :param in_memory: bool if compressed tile files are kept in memory
+        """
+        self.paths = paths
+        self.capacity = capacity
+        self.convert = convert
+        self.blobs: dict[tuple[int, int], bytes] = {}  # (i, j): encoded file contents, when in_memory
+        if in_memory:
+            for i, row in enumerate(paths):
+                for j, path in enumerate(row):
+                    if path is not None:
+                        self.blobs[(i, j)] = read_blob(path)
+        self.tiles: OrderedDict[tuple[int, int], "Surface"] = OrderedDict()  # (i, j): surface, most recent at end
+        self._pending: dict[tuple[int, int], Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="TileStreamer")
+        self.loaded_synchronously = 0  # Number of tiles that had to be loaded on the main thread
+
+    def _finish(self, indexes: tuple[int, int], surface: "Surface") -> "Surface":
+        if self.convert:
+            surface = surface.convert()
+        self.tiles[indexes] = surface
+        self.tiles.move_to_end(indexes)
+        return surface
+
+    def is_loaded(self, indexes: tuple[int, int]) -> bool:
+        return indexes in self.tiles
+
+    def get_blobs_size(self) -> int:
+        """
+        Method returns number of bytes held by compressed tiles.
+        """
+        return sum(len(blob) for blob in self.blobs.values())
+
+    def _decode(self, indexes: tuple[int, int]) -> "Surface":
+        path = self.paths[indexes[0]][indexes[1]]
+        blob = self.blobs.get(indexes)
+        return decode_tile(path) if blob is None else decode_blob(blob, path)
+
+    def get(self, indexes: tuple[int, int]) -> "Surface":
+        """
+        Method returns tile surface, loading it synchronously as a last resort if it is neither resident nor
+        prefetched yet.
+        :param indexes: tuple[int, int] (i, j) indexes of tile in grid
+        :return: Surface or None if there is no tile on indexes
+        """
+        surface = self.tiles.get(indexes)
+        if surface is not None:
+            self.tiles.move_to_end(indexes)
+            return surface
+        path = self.paths[indexes[0]][indexes[1]]
+        if path is None:
+            return None
+        future = self._pending.pop(indexes, None)
+        if future is not None:
+            surface = future.result()  # Already decoding, waiting is cheaper than decoding again
+        else:
+            surface = self._decode(indexes)
+            self.loaded_synchronously += 1
+        return self._finish(indexes, surface)
+
+    def prefetch(self, indexes: tuple[int, int]) -> None:
+        """
+        Method schedules tile to be decoded on the background thread, if it is not resident or pending already.
+        :param indexes: tuple[int, int] (i, j) indexes of tile in grid
+        """
+        if indexes in self.tiles:
+            self.tiles.move_to_end(indexes)  # Still needed, so it is recently used
+            return
+        if indexes in self._pending:
+            return
+        path = self.paths[indexes[0]][indexes[1]]
+        if path is not None:
+            self._pending[indexes] = self._executor.submit(self._decode, indexes)
+
+    def collect(self) -> list[tuple[int, int]]:
+        """
+        Method moves finished prefetched tiles into the resident tiles, has to be called on the main thread.
+        :return: list[tuple[int, int]] indexes of collected tiles
+        """
+        collected = [indexes for indexes, future in self._pending.items() if future.done()]
+        for indexes in collected:
+            self._finish(indexes, self._pending.pop(indexes).result())
+        return collected
+
+    def evict(self, keep: set[tuple[int, int]]) -> list[tuple[int, int]]:
+        """
+        Method evicts least recently used tiles until there are at most capacity tiles resident, tiles in keep are
+        never evicted.
+        :param keep: set[tuple[int, int]] indexes of tiles that have to stay resident
+        :return: list[tuple[int, int]] indexes of evicted tiles
+        """
+        evicted = []
+        for indexes in list(self.tiles.keys()):
+            if len(self.tiles) <= self.capacity:
+                break
+            if indexes not in keep:
+                del self.tiles[indexes]
+                evicted.append(indexes)
+        # Pending tiles that are no longer needed do not have to be finished
+        for indexes in [indexes for indexes in self._pending if indexes not in keep]:
+            if self._pending[indexes].cancel():
+                del self._pending[indexes]
+        return evicted
+
+    def invalidate(self, indexes: tuple[int, int]) -> None:
+        """
+        Method drops tile so it gets loaded from disk again on next access.
+        :param indexes: tuple[int, int] (i, j) indexes of tile in grid
+        """
+        if indexes in self.blobs:
+            self.blobs[indexes] = read_blob(self.paths[indexes[0]][indexes[1]])
+        self.tiles.pop(indexes, None)
+        future = self._pending.pop(indexes, None)
+        if future is not None:
+            future.cancel()
+
+    def close(self) -> None:
+        """
+        Method stops the background thread, pending prefetches get cancelled.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
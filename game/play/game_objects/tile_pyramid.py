@@ -0,0 +1,100 @@
+"""
+Module containing the TilePyramid class, a cache of downscaled versions (mip levels) of map tiles.
+
+Level 0 is the tile itself, every next level is half the size of the previous one (1/2, 1/4, 1/8, ...). Levels are
+generated with smoothscale from the previous level, once, and reused for every frame drawn at a zoom out.
+"""
+
+from __future__ import annotations
+import math
+
+import pygame
+
+
+class TilePyramid:
+    """
+    Lazily built mip levels of tiles, keyed by tile indexes and level. Tiles drawn at a zoom between two levels are
+    scaled from the closest bigger level, those scaled tiles are cached for the current zoom only.
+    """
+    def __init__(self, levels: int = 3):
+        """
+        :param levels: int number of downscaled levels, 3 -> 1/2, 1/4 and 1/8
+        """
+        self.levels = levels
+        self._levels: dict[tuple[int, int, int], "Surface"] = {}  # (i, j, level): surface
+        self._zoomed: dict[tuple[int, int], "Surface"] = {}  # (i, j): surface scaled for _zoomed_zoom
+        self._zoomed_zoom: float = None
+
+    @staticmethod
+    def get_scale(level: int) -> float:
+        return 1 / (2 ** level)
+
+    def pick_level(self, zoom: float) -> int:
+        """
+        Method returns the level closest to zoom which is not smaller than zoom, so tiles only ever get scaled down.
+        :param zoom: float scale of map on screen
+        :return: int level in range [0, levels]
+        """
+        if zoom >= 1:
+            return 0
+        return max(0, min(self.levels, int(math.floor(math.log2(1 / zoom)))))
+
+    def get_level(self, indexes: tuple[int, int], level: int, image: "Surface") -> "Surface":
+        """
+        Method returns tile image on level, generating it (and every bigger level it needs) on first use.
+        :param indexes: tuple[int, int] (i, j) indexes of tile
+        :param level: int level of pyramid, 0 is the original image
+        :param image: Surface original tile image
+        :return: Surface
+        """
+        if level == 0:
+            return image
+        key = (indexes[0], indexes[1], level)
+        surface = self._levels.get(key)
+        if surface is None:
+            bigger = self.get_level(indexes, level - 1, image)
+            size = (max(1, bigger.get_width() // 2), max(1, bigger.get_height() // 2))
+            surface = pygame.transform.smoothscale(bigger, size)
+            self._levels[key] = surface
+        return surface
+
+    def build(self, indexes: tuple[int, int], image: "Surface") -> None:
+        """
+        Method generates every level of tile, used for building the pyramid at load time.
+        :param indexes: tuple[int, int] (i, j) indexes of tile
+        :param image: Surface original tile image
+        """
+        self.get_level(indexes, self.levels, image)
+
+    def get_zoomed(self, indexes: tuple[int, int], zoom: float, image: "Surface", size: tuple[int, int]) -> "Surface":
+        """
+        Method returns tile image scaled to size on screen at zoom. Images of levels that already have the size are
+        returned directly, others get scaled from the closest bigger level and cached until zoom changes.
+        :param indexes: tuple[int, int] (i, j) indexes of tile
+        :param zoom: float scale of map on screen, picks the level
+        :param image: Surface original tile image
+        :param size: tuple[int, int] size of tile on screen, about image size * zoom
+        :return: Surface
+        """
+        level = self.pick_level(zoom)
+        surface = self.get_level(indexes, level, image)
+        size = (max(1, size[0]), max(1, size[1]))
+        if surface.get_size() == size:
+            return surface
+        if zoom != self._zoomed_zoom:
+            self._zoomed.clear()
+            self._zoomed_zoom = zoom
+        zoomed = self._zoomed.get(indexes)
+        if zoomed is None or zoomed.get_size() != size:
+            zoomed = pygame.transform.scale(surface, size)
+            self._zoomed[indexes] = zoomed
+        return zoomed
+
+    def invalidate(self, indexes: tuple[int, int]) -> None:
+        """
+        Method drops every cached level of tile, used when the tile image changes or gets evicted.
+        :param indexes: tuple[int, int] (i, j) indexes of tile
+        """
+        for level in range(1, self.levels + 1):
+            self._levels.pop((indexes[0], indexes[1], level), None)
+        self._zoomed.pop(indexes, None)
@@ -2,16 +2,23 @@
 Time trial module, has TimeTrial class that is similar to Page classes but items can't be added to it.
 """
 
+import os
+
 import pygame
 
 from game.constants import SCREEN_SIZE, Paths, join_paths
 from game.play.game_objects.map import Map
 from game.play.game_objects.player import Player
 from game.play.game_objects.car import Car
+from game.play.game_objects.lap_timer import LapTimer
+from game.play.game_objects.car_states import CarStates
+from game.play.game_objects.ghost import GhostWriter, GhostReader, GhostCar
+from game.logic.sweep_and_prune import SweepAndPrune, get_bounding_rect
+from game.logic.separating_axis import get_polygon_overlap
 from game.helpers.helpers import create_callable
 from game.gui.menus import PauseMenu
 from game.gui.button import Button
-from game.gui.text import CustomText
+from game.gui.text import CustomText, Text
 from game.pages.loading_page import LoadingPage
 from game.pages.welcome_page import WelcomePage
 
@@ -35,7 +42,7 @@ class TimeTrial:
                 position=[SCREEN_SIZE[0] // 2 - 20, SCREEN_SIZE[1] // 2 - 75],
                 size=[150, 40],
                 text="Quit",
-                on_click=create_callable(self.controller.go_back_to, WelcomePage)
+                on_click=create_callable(self.quit)
             )
         )
         # Create temporary loading page
@@ -45,21 +52,158 @@ class TimeTrial:
             self.controller,
             folder_name=self.map_name
         )
+        # Physics state of every car in the race, player, AI and ghost cars get added here
+        self.car_states = CarStates()
         # Load player
         self.car = Car(
             self.controller,
             current_map=self.map,
             car_name=self.car_name,
-            initial_position=[2050, 1650]
+            initial_position=[2050, 1650],
+            states=self.car_states
         )
         self.player = Player(self.controller, self.map, self.car, "Testing")
         # Update number of total update calls to loading page
         self.loading_page.add_calls(self.map.get_number_of_loading_update_calls())
+        self.map.offset = self.car.position  # Streaming maps load tiles around the starting position first
         self.map.load(self.loading_page.update)  # Pass update method to update loading_page data and screen
+        self.map.objects.insert(self.car, self.car.get_rect())
+        # Cars colliding with each other, AI and other players get added here, ghosts pass through
+        self.cars = [self.car]
+        self.car_broadphase = SweepAndPrune()
+        for car in self.cars:
+            self.car_broadphase.insert(car, get_bounding_rect(car.get_polygon()))
+        # Lap timing, times are saved per map and car
+        self.lap_timer = LapTimer(
+            self.map.checkpoints,
+            folder_path=self.map.folder_path,
+            car_name=self.car_name,
+            on_lap=self.on_lap,
+            on_abandon=self.on_abandoned_lap
+        )
+        self.previous_car_center = self.car.get_center()
+        self.hud_texts = [Text(position=[SCREEN_SIZE[0] - 260, 20 + 25 * i], text="") for i in range(4)]
+        # Every lap gets recorded, the best one is saved and replayed as a ghost car
+        self.ghost_path = join_paths(self.map.folder_path, "ghosts", f"{self.car_name}.ghost")
+        self.ghost_writer = GhostWriter(folder=os.path.dirname(self.ghost_path))
+        self.ghost: GhostCar = None
+        self.load_ghost()
+
+    def load_ghost(self):
+        """
+        Method loads ghost of best lap of car on map, if it was recorded.
+        """
+        if self.ghost is not None:
+            self.ghost.reader.close()
+            self.ghost = None
+        if os.path.isfile(self.ghost_path):
+            self.ghost = GhostCar(self.car, GhostReader(self.ghost_path))
+
+    def on_lap(self, lap_time: float):
+        """
+        Method saves recording of the completed lap as the new ghost if it was the best lap, called by lap timer.
+        :param lap_time: float time of completed lap
+        """
+        if lap_time == self.lap_timer.best_lap:
+            if self.ghost is not None:
+                self.ghost.reader.close()  # File gets replaced
+            self.ghost_writer.save(self.ghost_path)
+            self.load_ghost()
+        else:
+            self.ghost_writer.discard()
+
+    def on_abandoned_lap(self):
+        """
+        Method discards recording of the lap abandoned by driving back over the start line, called by lap timer.
+        """
+        self.ghost_writer.discard()
+
+    def close(self):
+        """
+        Method releases resources of the run, the recording of an unfinished lap gets discarded and the map stops
+        streaming tiles.
+        """
+        self.map.close()
+        self.ghost_writer.discard()
+        if self.ghost is not None:
+            self.ghost.reader.close()
+            self.ghost = None
+
+    def quit(self):
+        """
+        Method abandons the run and goes back to the welcome page.
+        """
+        self.close()
+        self.controller.go_back_to(WelcomePage)
+
+    def update_ghost(self):
+        """
+        Method records pose of car on current tick and moves ghost to the same time of its lap.
+        """
+        if not self.lap_timer.running:
+            return
+        time = self.lap_timer.lap_time
+        position = self.car.position
+        self.ghost_writer.record(time, position[0], position[1], self.car.angle, self.car.image_index)
+        if self.ghost is not None:
+            self.ghost.update(time)
+
+    def update_zoom(self):
+        """
+        Method zooms the camera in or out with the mouse wheel.
+        """
+        if self.controller.mouse_scroll != 0:
+            self.map.zoom_by(self.controller.mouse_scroll)
+            self.controller.mouse_scroll = 0  # Has to be reset outside of the event loop, same as pages do
+
+    def update_lap_timer(self):
+        """
+        Method tests the movement of car since last frame against checkpoints and updates HUD texts.
+        """
+        current_center = self.car.get_center()
+        self.lap_timer.update(self.controller.dt, self.previous_car_center, current_center, self.map.objects)
+        self.previous_car_center = current_center
+        if not self.lap_timer.checkpoints:
+            return
+        lines = self.lap_timer.get_hud_lines()
+        for i, text in enumerate(self.hud_texts):
+            line = lines[i] if i < len(lines) else ""
+            if text.text != line:
+                text.text = line
+                text.update()
+
+    def update_interactions(self):
+        """
+        Method lets objects near the car interact with it, only objects whose rectangles touch the car get tested.
+        Objects interact by defining an interact(car) method.
+        """
+        for obj in self.map.objects.query_rect(self.car.get_rect()):
+            if obj is not self.car and hasattr(obj, "interact"):
+                obj.interact(self.car)
+
+    def update_car_collisions(self):
+        """
+        Method resolves collisions between cars. The broadphase gives pairs of cars with overlapping bounding
+        rectangles, only those get their boundary polygons tested.
+        """
+        polygons = {}
+        for car in self.cars:
+            polygons[car] = car.get_polygon()
+            self.car_broadphase.move(car, get_bounding_rect(polygons[car]))
+        for first, second in self.car_broadphase.get_pairs():
+            overlap = get_polygon_overlap(polygons[first], polygons[second])
+            if overlap is not None:
+                self.car_states.resolve_car_contact(first.row, second.row, *overlap)
 
     def update(self):
         if not self.controller.paused:
             self.player.update()
+            self.update_zoom()
+            self.update_car_collisions()
+            self.map.objects.move(self.car, self.car.get_rect())
+            self.update_interactions()
+            self.update_lap_timer()
+            self.update_ghost()
             self.map.update()
             self.pause_menu.visible = False
         else:
@@ -68,5 +212,9 @@ class TimeTrial:
 
     def draw(self):
         self.map.draw()
+        if self.ghost is not None:
+            self.ghost.draw()
         self.player.draw()
+        for text in self.hud_texts:
+            text.draw()
         self.pause_menu.draw()
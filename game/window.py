@@ -5,6 +5,8 @@ Game wide objects and settings should be set here.
 
 import pygame
 
+from game.helpers.asset_watcher import asset_watcher
+
 
 class Window:
     """
@@ -21,6 +23,7 @@ class Window:
         """
         Method loads the current page and everything else that should be drawn to the screen.
         """
+        asset_watcher.update()  # Apply hot-reloaded assets before the frame is drawn
         self.screen.fill((0, 0, 0))
         self.game.controller.current_page.update()
         self.game.controller.current_page.draw()
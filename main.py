@@ -9,6 +9,10 @@ from game.controller import Controller
 from game.window import Window
 from game.input import Input
 from game.development import Development
+from game.helpers.config_store import config_store
+from game.helpers.asset_index import asset_index
+from game.helpers.asset_watcher import asset_watcher
+from game.gui.text import invalidate_font
 
 
 class Game:
@@ -32,6 +36,24 @@ class Game:
         self.window = Window(self)
         self.input = Input(self)
 
+        if constants.HOT_RELOAD_ASSETS:
+            asset_watcher.start()
+            # Configs and the asset index only cache files of cars and maps, fonts have their own cache
+            for folder in (constants.Paths.cars, constants.Paths.maps):
+                asset_watcher.watch(folder, self.invalidate_asset_caches)
+            asset_watcher.watch(constants.Paths.fonts, invalidate_font)
+
+    @staticmethod
+    def invalidate_asset_caches(path: str) -> None:
+        """
+        Method drops game wide cached data of a changed asset file, objects holding loaded assets (maps, cars, fonts)
+        register their own watches.
+        :param path: str path to changed file
+        """
+        if path.endswith(".json"):
+            config_store.invalidate(path)
+        asset_index.invalidate(path)
+
     @property
     def dt(self) -> float:
         """
@@ -48,6 +70,8 @@ class Game:
             self.window.update()
             running = self.input.update()
             self._dt = self.clock.tick()
+        self.controller.close()  # Unfinished ghost recordings get discarded
+        config_store.flush()  # Write any pending configuration changes before exiting
 
 
 if __name__ == "__main__":